@@ -0,0 +1,85 @@
+"""
+Admission control for the upload endpoints: upload size limits and a bounded in-flight queue.
+
+Up to ADMISSION_MAX_IN_FLIGHT requests per process do PDF extraction / inference at a time; up to
+ADMISSION_QUEUE_SIZE more wait (at most ADMISSION_QUEUE_TIMEOUT seconds) for a slot. Anything
+beyond that is shed at once with 503 + Retry-After, so overload does not turn into an unbounded
+backlog with ever-growing latency.
+"""
+import os
+import threading
+
+# Uploads larger than this are refused with 413 before their body is read
+UPLOAD_MAX_BYTES = int(os.environ.get('UPLOAD_MAX_BYTES', 10 * 2 ** 20))
+# /batch_predict and /jobs take many PDFs or a zip per request
+BATCH_MAX_BYTES = int(os.environ.get('BATCH_MAX_BYTES', 200 * 2 ** 20))
+# Zip archives (/batch_predict, /jobs): entries, and decompressed bytes in total, read from one archive;
+# each PDF inside is also held to UPLOAD_MAX_BYTES
+ZIP_MAX_ENTRIES = int(os.environ.get('ZIP_MAX_ENTRIES', 2000))
+ZIP_MAX_TOTAL_BYTES = int(os.environ.get('ZIP_MAX_TOTAL_BYTES', 500 * 2 ** 20))
+# Uploaded files above this size are spooled to a temporary file instead of being held in memory
+UPLOAD_SPOOL_BYTES = int(os.environ.get('UPLOAD_SPOOL_BYTES', 512 * 1024))
+
+ADMISSION_MAX_IN_FLIGHT = int(os.environ.get('ADMISSION_MAX_IN_FLIGHT', 4))
+ADMISSION_QUEUE_SIZE = int(os.environ.get('ADMISSION_QUEUE_SIZE', 8))
+ADMISSION_QUEUE_TIMEOUT = float(os.environ.get('ADMISSION_QUEUE_TIMEOUT', 10))
+# Sent as Retry-After with every shed request
+ADMISSION_RETRY_AFTER = int(os.environ.get('ADMISSION_RETRY_AFTER', 5))
+
+
+class AdmissionController:
+    """Bounded in-flight work per process: admit, queue briefly, or shed"""
+
+    def __init__(self, max_in_flight=ADMISSION_MAX_IN_FLIGHT, queue_size=ADMISSION_QUEUE_SIZE,
+                 queue_timeout=ADMISSION_QUEUE_TIMEOUT, on_change=None):
+        self.max_in_flight = max_in_flight
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+        self.on_change = on_change  # on_change(in_flight, waiting), e.g. to update gauges
+        self._slots = threading.BoundedSemaphore(max_in_flight)
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.waiting = 0
+        self.shed = 0
+
+    def acquire(self):
+        """None when admitted (call release() when done), else why the request is shed
+        ('queue_full' or 'queue_timeout')"""
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                if self.waiting >= self.queue_size:
+                    self.shed += 1
+                    return 'queue_full'
+                self.waiting += 1
+            self._changed()
+            try:
+                admitted = self._slots.acquire(timeout=self.queue_timeout)
+            finally:
+                with self._lock:
+                    self.waiting -= 1
+            if not admitted:
+                with self._lock:
+                    self.shed += 1
+                self._changed()
+                return 'queue_timeout'
+        with self._lock:
+            self.in_flight += 1
+        self._changed()
+        return None
+
+    def release(self):
+        with self._lock:
+            self.in_flight -= 1
+        self._slots.release()
+        self._changed()
+
+    def _changed(self):
+        if self.on_change is not None:
+            with self._lock:
+                in_flight, waiting = self.in_flight, self.waiting
+            self.on_change(in_flight, waiting)
+
+    def stats(self):
+        with self._lock:
+            return {'in_flight': self.in_flight, 'waiting': self.waiting, 'shed': self.shed,
+                    'max_in_flight': self.max_in_flight, 'queue_size': self.queue_size}
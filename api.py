@@ -1,11 +1,20 @@
 import requests
 import os
 import json
+import argparse
+import csv
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+API_URL = os.environ.get('API_URL', 'http://127.0.0.1:5000')
+REQUEST_TIMEOUT = 60
 
 def check_server_health():
     """Check if the server is running and healthy"""
     try:
-        response = requests.get("http://127.0.0.1:5000/health", timeout=5)
+        response = requests.get(f"{API_URL}/health", timeout=5)
         if response.status_code == 200:
             data = response.json()
             print("✅ Server Health Check:")
@@ -35,7 +44,7 @@ def check_server_health():
 
 def send_pdf(file_path):
     """Send a PDF file to the API and print the enhanced prediction"""
-    url = "http://127.0.0.1:5000/upload_and_predict"
+    url = f"{API_URL}/upload_and_predict"
 
     if not os.path.exists(file_path):
         print(f"❌ Error: File not found at '{file_path}'")
@@ -50,7 +59,7 @@ def send_pdf(file_path):
     try:
         with open(file_path, "rb") as f:
             files = {"resume": (os.path.basename(file_path), f, "application/pdf")}
-            response = requests.post(url, files=files, timeout=60)
+            response = requests.post(url, files=files, timeout=REQUEST_TIMEOUT)
 
         print(f"📊 Status Code: {response.status_code}")
 
@@ -120,7 +129,142 @@ def test_with_sample_files():
     print("❌ No sample resumes found.")
     return None
 
+# ---------------------------
+# Bulk mode
+# ---------------------------
+RESULT_FIELDS = ['file', 'status', 'attempts', 'latency_ms', 'total_ms', 'predicted_internship',
+                 'confidence_level', 'cache', 'error']
+
+_local = threading.local()
+
+def find_pdfs(directory):
+    """All PDFs under a directory, recursively, in a stable order"""
+    found = []
+    for root, dirs, files in os.walk(directory):
+        dirs.sort()
+        found.extend(os.path.join(root, name) for name in sorted(files) if name.lower().endswith('.pdf'))
+    return found
+
+def _session():
+    """One keep-alive Session per worker thread (Session objects are not safe to share across threads)"""
+    if not hasattr(_local, 'session'):
+        _local.session = requests.Session()
+    return _local.session
+
+def _retry_delay(response, attempt, backoff):
+    """Server's Retry-After when it sent one (503 from admission control), else jittered exponential backoff"""
+    retry_after = response.headers.get('Retry-After') if response is not None else None
+    if retry_after and retry_after.isdigit():
+        return float(retry_after)
+    return min(backoff * 2 ** attempt, 30) * random.uniform(0.5, 1.5)
+
+def submit_pdf(file_path, url, retries=3, backoff=0.5):
+    """POST one PDF, retrying 5xx responses and connection errors; returns a results row"""
+    with open(file_path, 'rb') as f:
+        data = f.read()
+    row = {'file': file_path, 'status': None, 'error': ''}
+    started = time.perf_counter()
+    for attempt in range(retries + 1):
+        response = None
+        attempt_start = time.perf_counter()
+        try:
+            files = {"resume": (os.path.basename(file_path), data, "application/pdf")}
+            response = _session().post(url, files=files, timeout=REQUEST_TIMEOUT)
+            row['status'] = response.status_code
+            row['error'] = ''
+        except requests.exceptions.RequestException as e:
+            row['status'], row['error'] = None, f"{type(e).__name__}: {e}"
+        row['latency_ms'] = round((time.perf_counter() - attempt_start) * 1000, 1)
+        row['attempts'] = attempt + 1
+        if response is not None and response.status_code < 500:
+            break
+        if attempt < retries:
+            time.sleep(_retry_delay(response, attempt, backoff))
+    row['total_ms'] = round((time.perf_counter() - started) * 1000, 1)
+
+    if response is not None:
+        try:
+            body = response.json()
+        except ValueError:
+            body = {'error': response.text[:200]}
+        row['cache'] = response.headers.get('X-Cache', '')
+        if response.status_code == 200:
+            row['predicted_internship'] = body.get('predicted_internship', '')
+            row['confidence_level'] = body.get('confidence_level', '')
+        else:
+            row['error'] = body.get('error', 'Unknown error')
+    return row
+
+def _percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))] if ordered else 0
+
+def bulk_submit(directory, concurrency=8, retries=3, backoff=0.5, results_path='bulk_results.csv',
+                endpoint='/upload_and_predict'):
+    """Submit every PDF under a directory concurrently and write one results row per file"""
+    paths = find_pdfs(directory)
+    if not paths:
+        print(f"❌ No PDFs found under '{directory}'")
+        return None
+    url = f"{API_URL}{endpoint}"
+    print(f"📤 Submitting {len(paths)} PDFs to {url} ({concurrency} concurrent, {retries} retries)")
+
+    rows, total_bytes = [], 0
+    started = time.perf_counter()
+    with open(results_path, 'w', newline='') as out, ThreadPoolExecutor(max_workers=concurrency) as pool:
+        writer = csv.DictWriter(out, fieldnames=RESULT_FIELDS, extrasaction='ignore')
+        writer.writeheader()
+        futures = {pool.submit(submit_pdf, path, url, retries, backoff): path for path in paths}
+        for done, future in enumerate(as_completed(futures), 1):
+            try:
+                row = future.result()
+            except OSError as e:  # unreadable file
+                row = {'file': futures[future], 'status': None, 'attempts': 0, 'error': str(e)}
+            rows.append(row)
+            writer.writerow(row)
+            out.flush()  # rows survive an interrupted run
+            total_bytes += os.path.getsize(row['file']) if row.get('attempts') else 0
+            if done % 100 == 0 or done == len(paths):
+                print(f"   {done}/{len(paths)} done")
+    wall = time.perf_counter() - started
+
+    ok = [r for r in rows if r['status'] == 200]
+    latencies = [r['latency_ms'] for r in ok]
+    retried = sum(1 for r in rows if r.get('attempts', 0) > 1)
+    summary = {
+        'files': len(rows),
+        'succeeded': len(ok),
+        'failed': len(rows) - len(ok),
+        'retried': retried,
+        'seconds': round(wall, 2),
+        'files_per_second': round(len(rows) / wall, 2) if wall else None,
+        'mb_per_second': round(total_bytes / 2 ** 20 / wall, 2) if wall else None,
+        'latency_ms_p50': _percentile(latencies, 50),
+        'latency_ms_p95': _percentile(latencies, 95),
+        'latency_ms_p99': _percentile(latencies, 99)
+    }
+    print("\n📈 Throughput Summary")
+    print("=" * 60)
+    print(f"Files: {summary['files']} ({summary['succeeded']} ok, {summary['failed']} failed, {retried} retried)")
+    print(f"Wall time: {summary['seconds']}s -> {summary['files_per_second']} files/s, "
+          f"{summary['mb_per_second']} MB/s")
+    print(f"Latency (successful, last attempt): p50 {summary['latency_ms_p50']} ms, "
+          f"p95 {summary['latency_ms_p95']} ms, p99 {summary['latency_ms_p99']} ms")
+    print(f"📝 Per-file results written to {results_path}")
+    return summary
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Resume Internship Predictor client")
+    parser.add_argument('--bulk', metavar='DIR', help="Submit every PDF under DIR concurrently")
+    parser.add_argument('--concurrency', type=int, default=8, help="Requests in flight at once (bulk mode)")
+    parser.add_argument('--retries', type=int, default=3, help="Retries per file on 5xx / connection errors")
+    parser.add_argument('--backoff', type=float, default=0.5, help="Base backoff in seconds (doubles per retry)")
+    parser.add_argument('--results', default='bulk_results.csv', help="Per-file results CSV (bulk mode)")
+    parser.add_argument('--endpoint', default='/upload_and_predict', help="Endpoint to submit to (bulk mode)")
+    return parser.parse_args()
+
 if __name__ == "__main__":
+    args = parse_args()
     print("🚀 Resume Internship Predictor - Enhanced Client")
     print("=" * 60)
 
@@ -129,6 +273,11 @@ if __name__ == "__main__":
         print("❌ Server not ready. Please start app.py and try again.")
         exit()
 
+    if args.bulk:
+        bulk_submit(args.bulk, concurrency=args.concurrency, retries=args.retries, backoff=args.backoff,
+                    results_path=args.results, endpoint=args.endpoint)
+        exit()
+
     print("\n2. Choose a resume file to test:")
     user_path = input("👉 Enter path to PDF (or press Enter to auto-search): ").strip()
 
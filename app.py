@@ -1,13 +1,52 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Request, request, jsonify, g
 import pandas as pd
 import numpy as np
 import pickle
-import pdfplumber
-import re
 import os
+import hashlib
+import tempfile
+import threading
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from functools import wraps
 from flask_cors import CORS
+from werkzeug.exceptions import RequestEntityTooLarge
+from pdf_extract import PdfTimedOut, PdfTooLarge, extract_pdf
+from admission import (
+    AdmissionController, ADMISSION_RETRY_AFTER, BATCH_MAX_BYTES, UPLOAD_MAX_BYTES, UPLOAD_SPOOL_BYTES,
+    ZIP_MAX_ENTRIES, ZIP_MAX_TOTAL_BYTES
+)
+from result_cache import ResultCache
+from model_artifact import ARTIFACT_PATH, FAST_ARTIFACT_PATH, load_artifact
+from jobs import JobQueue
+import model_registry
+import profiler
+from metrics import (
+    registry, REQUESTS, ERRORS, REQUEST_SECONDS, STAGE_SECONDS, PDF_PAGES, MODEL_INFO, NEAR_DUPLICATES,
+    IN_FLIGHT, QUEUE_DEPTH, SHED
+)
+import minhash
+from recommender import COMPANY_TOP_K, CompanyIndex
+from similarity import SIMILAR_TOP_K, SimilarityIndex
+from features import (
+    FEATURE_SCHEMA_VERSION, INPUT_COLUMNS, BACKGROUND_COLUMN, DEFAULT_ACADEMIC_BACKGROUND,
+    clean_text, build_model_input, column_default, feature_arrays, feature_records
+)
+from sparse_inference import compile_pipeline
+from explain import build_explainer
+
+class SpooledRequest(Request):
+    """Uploaded files stay in memory up to UPLOAD_SPOOL_BYTES and go to a temporary file beyond that"""
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        return tempfile.SpooledTemporaryFile(max_size=UPLOAD_SPOOL_BYTES, mode='rb+')
+
 
 app = Flask(__name__)
+app.request_class = SpooledRequest
+# Upper bound for every request; admission_controlled routes set a tighter one
+app.config['MAX_CONTENT_LENGTH'] = BATCH_MAX_BYTES
 CORS(app)
 
 # Global variables
@@ -15,125 +54,149 @@ model = None
 model_data = None
 feature_info = None
 companies = None
+company_index = None
+similar_index = None
+model_version = None
+model_load_info = {'reloading': False, 'last_error': None, 'failed_version': None}
+reload_lock = threading.Lock()
+model_watcher_pid = None
+result_cache = ResultCache()
+# Near-identical resumes (MinHash of the cleaned text) -> result-cache key of the first one seen
+near_duplicate_index = minhash.NearDuplicateIndex()
+
+# Per-process cap on concurrent predict_proba calls; request threads only do I/O and extraction
+INFERENCE_THREADS = int(os.environ.get('INFERENCE_THREADS', 1))
+inference_pool = None
+inference_pool_pid = None
+
+# 'full' serves the voting ensemble, 'fast' the linear/distilled model from `train_model.py --fast-model`,
+# 'incremental' the registry's active model from train_incremental.py
+SERVING_MODEL = os.environ.get('SERVING_MODEL', 'full')
+if SERVING_MODEL not in model_registry.KINDS:
+    raise ValueError(f"SERVING_MODEL={SERVING_MODEL!r} is not one of {', '.join(model_registry.KINDS)}")
+
+# Seconds between checks of the model registry's active pointer (0 = only reload via /admin/reload)
+MODEL_WATCH_SECONDS = float(os.environ.get('MODEL_WATCH_SECONDS', 5))
+# Required in X-Admin-Token for /admin routes; when unset they only accept requests from localhost
+ADMIN_TOKEN = os.environ.get('ADMIN_TOKEN', '')
+
+# 'refuse' keeps a model trained on a different feature schema out of service; 'adapt' aligns its columns by name
+FEATURE_SCHEMA_POLICY = os.environ.get('FEATURE_SCHEMA_POLICY', 'refuse')
+
+# Serve supported pipelines through sparse_inference (no per-request DataFrame); 0 = always use pandas
+SPARSE_INFERENCE = os.environ.get('SPARSE_INFERENCE', '1') == '1'
 
 
 # ---------------------------
-# Text Cleaning
-# ---------------------------
-def clean_text(text):
-    if pd.isna(text):
-        return ""
-    text = str(text).lower()
-    text = re.sub(r'\S+@\S+', ' ', text)  # emails
-    text = re.sub(r'http\S+|www.\S+', ' ', text)  # urls
-    text = re.sub(r'[^a-z\s]', ' ', text)  # symbols/numbers
-    return " ".join(text.split())
-
-
-# ---------------------------
-# Feature Engineering (Improved with category signals)
+# Load Model + Companies
 # ---------------------------
-def extract_features(text):
-    features = {}
-    words = text.split()
-
-    # --- Basic counts ---
-    features['word_count'] = len(words)
-    features['unique_words'] = len(set(words))
-
-    # --- Skills detection ---
-    original_skills = [
-        'python', 'java', 'c++', 'sql', 'machine learning', 'deep learning',
-        'nlp', 'html', 'css', 'javascript', 'react', 'django', 'flask'
-    ]
-    for skill in original_skills:
-        features[f"skill_{skill}"] = 1 if skill in text else 0
-
-    # --- Education detection ---
-    features['has_btech'] = 1 if re.search(r'\bb\.?tech\b', text) else 0
-    features['has_mtech'] = 1 if re.search(r'\bm\.?tech\b', text) else 0
-    features['has_phd'] = 1 if re.search(r'\bph\.?d\b', text) else 0
-    features['has_mba'] = 1 if re.search(r'\bmba\b', text) else 0
-    features['has_bsc'] = 1 if re.search(r'\bb\.?sc\b', text) else 0
-    features['has_msc'] = 1 if re.search(r'\bm\.?sc\b', text) else 0
-
-    # --- Experience (years) ---
-    exp_patterns = [
-        r'(\d+)\s*(?:years?|yrs?)\s*(?:of\s*)?(?:experience|exp)',
-        r'(\d+)\s*(?:\+|plus)\s*(?:years?|yrs?)',
-        r'over\s+(\d+)\s*(?:years?|yrs?)',
-        r'since\s+(\d{4})'
-    ]
-    years = []
-    for p in exp_patterns:
-        for match in re.findall(p, text):
-            if isinstance(match, tuple):
-                match = match[0]
-            if match.isdigit():
-                if len(match) == 4:  # year
-                    current_year = 2025
-                    years.append(current_year - int(match))
-                else:
-                    years.append(int(match))
-    features['years_experience'] = max(years) if years else 0
-
-    # --- Project detection ---
-    project_keywords = [
-        'project', 'developed', 'built', 'implemented', 'designed',
-        'created', 'contributed', 'engineered'
-    ]
-    features['project_mentioned'] = int(any(kw in text for kw in project_keywords))
-
-    # --- Internship detection ---
-    internship_keywords = [
-        'internship', 'intern', 'trainee', 'apprentice', 'fellowship'
-    ]
-    features['internship_mentioned'] = int(any(kw in text for kw in internship_keywords))
-
-    # --- Category-specific signals ---
-    category_keywords = {
-        "Data Science": ['tensorflow', 'pytorch', 'pandas', 'numpy', 'scikit-learn', 'matplotlib', 'seaborn', 'jupyter'],
-        "Web Development": ['nodejs', 'angular', 'vue', 'bootstrap', 'express', 'typescript'],
-        "DevOps Engineer": ['docker', 'kubernetes', 'jenkins', 'terraform', 'ansible', 'aws', 'azure', 'gcp', 'ci/cd'],
-        "Automation Testing": ['selenium', 'pytest', 'junit', 'testng', 'cypress', 'automation framework'],
-        "Blockchain": ['blockchain', 'ethereum', 'solidity', 'smart contract', 'web3'],
-        "Mobile App Development": ['android', 'ios', 'flutter', 'react native', 'swift', 'kotlin'],
-        "Java Developer": ['spring boot', 'hibernate', 'jsp', 'servlets']
-    }
-
-    detected_category_keywords = {}
-
-    for category, keywords in category_keywords.items():
-        found = [kw for kw in keywords if kw in text]
-        features[f"{category.lower().replace(' ', '_')}_keywords"] = len(found)
-        if found:
-            detected_category_keywords[category] = found
-
-    # Attach detected category keywords for debugging/response
-    features['detected_category_keywords'] = detected_category_keywords
-
-    return features
+def file_digest(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()[:16]
+
+
+def _load_pickle(path):
+    with open(path, 'rb') as f:
+        return pickle.load(f)
+
+
+# (path, loader, message, variant it serves)
+MODEL_SOURCES = [
+    # Prefer the memory-mapped artifact: arrays are paged in lazily and shared between workers
+    (ARTIFACT_PATH, load_artifact, "✅ Enhanced model loaded (memory-mapped)", 'full'),
+    ('advanced_model.pkl', _load_pickle, "✅ Enhanced model loaded", 'full'),
+    ('model.pkl', lambda path: {'model': _load_pickle(path), 'model_type': 'standard'}, "✅ Standard model loaded", 'full'),
+]
+FAST_MODEL_SOURCES = [
+    (FAST_ARTIFACT_PATH, load_artifact, "✅ Fast serving model loaded (memory-mapped)", 'fast'),
+]
+
+
+def model_sources():
+    if SERVING_MODEL == 'fast':
+        if not os.path.exists(FAST_ARTIFACT_PATH) and model_registry.active_version('fast') is None:
+            print(f"⚠️ SERVING_MODEL=fast but {FAST_ARTIFACT_PATH} is missing; run train_model.py --fast-model linear")
+        return FAST_MODEL_SOURCES + MODEL_SOURCES
+    if SERVING_MODEL == 'incremental':
+        # Only the registry holds incremental models; the registry watcher switches over once one is registered
+        print("⚠️ SERVING_MODEL=incremental but no incremental version is registered; "
+              "run train_incremental.py init")
+    return MODEL_SOURCES
+
+
+def read_model(version=None):
+    """(model_data, path, message) for a registry version, else the registry's active version, else the
+    first flat file in model_sources(); None when nothing is found. model_data['served_model'] is the
+    variant actually loaded, which differs from SERVING_MODEL after a fallback"""
+    version = version or model_registry.active_version(SERVING_MODEL)
+    if version:
+        model_data, path = model_registry.load_version(version)
+        model_data['served_model'] = model_registry.version_kind(version)
+        return model_data, path, f"✅ Model {version} loaded from registry (memory-mapped)"
+    for model_path, loader, message, variant in model_sources():
+        if os.path.exists(model_path):
+            model_data = loader(model_path)
+            model_data['served_model'] = variant
+            return model_data, model_path, message
+    return None
+
+
+def check_schema(candidate):
+    """None if the model can be served, else the reason it is refused"""
+    schema_version = candidate.get('feature_schema_version')
+    if schema_version != FEATURE_SCHEMA_VERSION:
+        message = f"model feature schema v{schema_version} does not match serving v{FEATURE_SCHEMA_VERSION}"
+        if FEATURE_SCHEMA_POLICY != 'adapt':
+            return f"{message}. Retrain with train_model.py or set FEATURE_SCHEMA_POLICY=adapt"
+        print(f"⚠️ {message}; adapting columns by name")
+    return None
+
+
+def activate_model(candidate, model_path, load_seconds):
+    """Swap the serving model. Predictions take one snapshot of model_data, so requests already running
+    finish on the previous model while new ones see the new one"""
+    global model, model_data, model_version
+    # Models saved before train_model.py stamped a version are identified by their file contents
+    version = candidate.get('model_version') or file_digest(model_path)
+    candidate['serving_plan'] = compile_pipeline(candidate['model']) if SPARSE_INFERENCE else None
+    candidate['explainer'] = build_explainer(candidate['model'])
+    served = candidate.get('served_model', SERVING_MODEL)
+    if served != SERVING_MODEL:
+        print(f"⚠️ SERVING_MODEL={SERVING_MODEL} but no {SERVING_MODEL} model is available; serving the {served} model "
+              f"{version} instead (reported as served_model in /health)")
+    model_data = candidate
+    model = candidate['model']
+    model_version = version
+    result_cache.set_model_version(version)
+    registry.clear(MODEL_INFO)
+    registry.set(MODEL_INFO, 1, version=version, model_type=candidate.get('model_type', 'unknown'),
+                 serving_model=SERVING_MODEL, served_model=served)
+    model_load_info.update({
+        'source': model_path,
+        'load_seconds': round(load_seconds, 3),
+        'loaded_at': time.time()
+    })
 
 
-# ---------------------------
-# Load Model + Companies
-# ---------------------------
-def load_model():
+def load_model(version=None):
     global model, model_data, feature_info
-    try:
-        with open('advanced_model.pkl', 'rb') as f:
-            model_data = pickle.load(f)
-        model = model_data['model']
-        print("✅ Enhanced model loaded")
-    except FileNotFoundError:
-        try:
-            with open('model.pkl', 'rb') as f:
-                model = pickle.load(f)
-            model_data = {'model_type': 'standard'}
-            print("✅ Standard model loaded")
-        except FileNotFoundError:
-            print("❌ No model found")
-            return False
+    start = time.perf_counter()
+    found = read_model(version)
+    if found is None:
+        print("❌ No model found")
+        return False
+    candidate, model_path, message = found
+    print(message)
+
+    refused = check_schema(candidate)
+    if refused:
+        print(f"❌ Refusing model: {refused}")
+        model, model_data = None, None
+        return False
+    activate_model(candidate, model_path, time.perf_counter() - start)
 
     try:
         with open('feature_info.pkl', 'rb') as f:
@@ -143,8 +206,63 @@ def load_model():
     return True
 
 
+def _reload_worker(version):
+    start = time.perf_counter()
+    try:
+        found = read_model(version)
+        if found is None:
+            raise RuntimeError("No model found")
+        candidate, model_path, message = found
+        refused = check_schema(candidate)
+        if refused:
+            raise RuntimeError(refused)
+        # Warm up before the swap so the first real request does not pay for page faults / lazy init
+        warm = build_model_input([""])
+        candidate['model'].predict_proba(align_feature_frame(warm, candidate))
+        activate_model(candidate, model_path, time.perf_counter() - start)
+        model_load_info['last_error'] = model_load_info['failed_version'] = None
+        print(f"{message} and swapped in after {time.perf_counter() - start:.2f}s")
+    except Exception as e:
+        model_load_info['last_error'] = str(e)
+        model_load_info['failed_version'] = version
+        print(f"❌ Model reload failed, still serving {model_version}: {e}")
+    finally:
+        model_load_info['reloading'] = False
+        reload_lock.release()
+
+
+def reload_model(version=None):
+    """Load a model in the background and swap it in; returns False if a reload is already running"""
+    if not reload_lock.acquire(blocking=False):
+        return False
+    model_load_info['reloading'] = True
+    threading.Thread(target=_reload_worker, args=(version,), name='model-reload', daemon=True).start()
+    return True
+
+
+def _watch_registry():
+    while True:
+        time.sleep(MODEL_WATCH_SECONDS)
+        try:
+            wanted = model_registry.active_version(SERVING_MODEL)
+            if wanted and wanted not in (model_version, model_load_info.get('failed_version')):
+                print(f"🔄 Registry points at {wanted}; reloading")
+                reload_model(wanted)
+        except Exception as e:
+            print(f"⚠️ Registry watch error: {e}")
+
+
+def start_model_watcher():
+    """Follow the registry's active pointer (one thread per worker process; call after the fork)"""
+    global model_watcher_pid
+    if MODEL_WATCH_SECONDS <= 0 or model_watcher_pid == os.getpid():
+        return
+    model_watcher_pid = os.getpid()
+    threading.Thread(target=_watch_registry, name='model-watcher', daemon=True).start()
+
+
 def load_companies():
-    global companies
+    global companies, company_index
     for file in ["tech_companies_skills_list.xlsx", "companies.csv", "companies.xlsx"]:
         if os.path.exists(file):
             try:
@@ -152,7 +270,8 @@ def load_companies():
                     companies = pd.read_excel(file)
                 else:
                     companies = pd.read_csv(file)
-                print(f"✅ Companies loaded from {file}")
+                company_index = CompanyIndex(companies)
+                print(f"✅ Companies loaded from {file} ({len(company_index)} indexed)")
                 return True
             except Exception as e:
                 print(f"⚠️ Error loading {file}: {e}")
@@ -160,64 +279,388 @@ def load_companies():
     return False
 
 
+def load_similar_index():
+    global similar_index
+    try:
+        similar_index = SimilarityIndex.open()
+    except Exception as e:
+        print(f"⚠️ Error loading similarity index: {e}")
+        return False
+    if similar_index is None:
+        print("⚠️ No similarity index found (run `python similarity.py build` to enable /similar)")
+        return False
+    info = similar_index.info()
+    print(f"✅ Similarity index {info['build']} loaded ({info['rows']} resumes, {info['method']})")
+    return True
+
+
 # ---------------------------
 # PDF Text Extraction
 # ---------------------------
-def extract_text_from_pdf(file_stream):
+def extract_text_from_pdf(file_stream, with_report=False):
     try:
-        text = ""
-        with pdfplumber.open(file_stream) as pdf:
-            for page in pdf.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text += page_text + "\n"
-        return text.strip()
+        with registry.timer(STAGE_SECONDS, stage='pdf_parse'):
+            text, report = extract_pdf(file_stream)
+        if 'page_count' in report:
+            registry.observe(PDF_PAGES, report['page_count'])
+    except PdfTimedOut as e:
+        registry.inc(ERRORS, type='pdf_timed_out')
+        text, report = "", {'error': f"PDF rejected: {e}", 'rejected': True, 'status': 422}
+    except PdfTooLarge as e:
+        registry.inc(ERRORS, type='pdf_too_large')
+        text, report = "", {'error': f"PDF rejected: {e}", 'rejected': True, 'status': 413}
     except Exception as e:
         print(f"❌ PDF extraction error: {e}")
-        return ""
+        registry.inc(ERRORS, type=f"pdf_{type(e).__name__}")
+        text, report = "", {'error': str(e)}
+    return (text, report) if with_report else text
+
+
+def debug_requested():
+    return request.args.get('debug', '').lower() in ('1', 'true', 'yes')
 
 
 # ---------------------------
 # Enhanced Prediction
 # ---------------------------
-def make_enhanced_prediction(resume_text):
-    cleaned = clean_text(resume_text)
-    features = extract_features(cleaned)
-    features['resume_text'] = cleaned
-    features['academic_background'] = "Computer Science"
-
-    if model_data and 'feature_columns' in model_data:
-        expected = model_data['feature_columns']
-        for col in expected:
-            if col not in features:
-                if col in ['resume_text', 'academic_background']:
-                    features[col] = "" if col == 'resume_text' else "Computer Science"
-                elif col.startswith(('skill_', 'has_')) or col.endswith(('_count', '_keywords', '_experience', '_mentioned')):
-                    features[col] = 0
-                elif col in ['word_count', 'unique_words', 'avg_word_length', 'sentence_count', 'years_experience']:
-                    features[col] = 0
-                else:
-                    features[col] = 0
-        feature_df = pd.DataFrame([{col: features.get(col, 0) for col in expected}])
-    else:
-        feature_df = pd.DataFrame([features])
-
-    prediction = model.predict(feature_df)
-    probs = model.predict_proba(feature_df)
-
-    top_prob = max(probs[0])
-    confidence = round(top_prob * 100, 2)
-    classes = model.classes_ if hasattr(model, 'classes_') else model_data.get('class_names', [prediction[0]])
-    top_idx = np.argsort(probs[0])[-3:][::-1]
-
+def align_feature_frame(frame, data):
+    """Reorder to the columns the model was trained on; only an adapted (older schema) model has gaps to fill"""
+    expected = data.get('feature_columns', INPUT_COLUMNS) if data else INPUT_COLUMNS
+    if list(frame.columns) == list(expected):
+        return frame
+    missing = [col for col in expected if col not in frame.columns]
+    frame = frame.reindex(columns=expected)
+    for col in missing:
+        frame[col] = column_default(col)
+    return frame
+
+
+def summarize_probabilities(probs, classes):
+    top_idx = np.argsort(probs)[-3:][::-1]
+    confidence = round(probs[top_idx[0]] * 100, 2)
     return {
-        'primary_prediction': prediction[0],
+        'primary_prediction': classes[top_idx[0]],
         'confidence': confidence,
         'top_3_predictions': [
-            {'category': classes[i], 'probability': round(probs[0][i] * 100, 2)} for i in top_idx
+            {'category': classes[i], 'probability': round(probs[i] * 100, 2)} for i in top_idx
         ],
         'prediction_quality': 'High' if confidence > 70 else 'Medium' if confidence > 50 else 'Low'
-    }, features
+    }
+
+
+def make_batch_predictions(resume_texts, explain=False):
+    """Predict many resumes with a single predict_proba call (labels come from the argmax);
+    explain=True adds each prediction's top terms / features from the model's linear member"""
+    with registry.timer(STAGE_SECONDS, stage='clean_text'):
+        cleaned = [clean_text(text) for text in resume_texts]
+
+    data = model_data  # one snapshot: a hot reload mid-request cannot mix two models
+    active = data['model']
+    plan = data.get('serving_plan')
+    if plan is not None:
+        with registry.timer(STAGE_SECONDS, stage='extract_features'):
+            columns, keyword_hits = feature_arrays(cleaned, return_keyword_hits=True)
+        columns[BACKGROUND_COLUMN] = DEFAULT_ACADEMIC_BACKGROUND
+        with registry.timer(STAGE_SECONDS, stage='feature_matrix'):
+            X = plan.transform(cleaned, columns)
+        with registry.timer(STAGE_SECONDS, stage='predict_proba'):
+            probs = plan.predict_proba(X)
+        feature_list = feature_records(cleaned, columns)
+    else:
+        timings = {}
+        frame, keyword_hits = build_model_input(cleaned, return_keyword_hits=True, timings=timings)
+        for stage, seconds in timings.items():
+            registry.observe(STAGE_SECONDS, seconds, stage=stage)
+        with registry.timer(STAGE_SECONDS, stage='predict_proba'):
+            probs = active.predict_proba(align_feature_frame(frame, data))
+        feature_list = frame.to_dict(orient='records')
+    classes = active.classes_ if hasattr(active, 'classes_') else data.get('class_names', [])
+
+    for features, hits, text in zip(feature_list, keyword_hits, resume_texts):
+        features['detected_category_keywords'] = hits
+        features['company_skills'] = company_index.skills_in(text) if company_index is not None else []
+    analyses = [summarize_probabilities(row, classes) for row in probs]
+    explainer = data.get('explainer') if explain else None
+    if explainer is not None:
+        with registry.timer(STAGE_SECONDS, stage='explain'):
+            if plan is None:
+                X = active.steps[0][1].transform(align_feature_frame(frame, data))
+            predicted = np.argsort(probs, axis=1)[:, -1]  # same pick as summarize_probabilities
+            for analysis, explanation in zip(analyses, explainer.explain(X, predicted, cleaned)):
+                analysis['explanation'] = explanation
+    return analyses, feature_list
+
+
+def _inference_pool():
+    global inference_pool, inference_pool_pid
+    # Threads do not survive a fork, so each preforked worker builds its own pool on first use
+    if inference_pool is None or inference_pool_pid != os.getpid():
+        inference_pool = ThreadPoolExecutor(max_workers=INFERENCE_THREADS, thread_name_prefix='inference')
+        inference_pool_pid = os.getpid()
+    return inference_pool
+
+
+def run_inference(fn, *args):
+    """Run CPU-bound model work on the bounded inference pool instead of the request thread"""
+    profile = profiler.current()  # keep sampling the request's work on the pool thread
+    return _inference_pool().submit(_profiled, profile, fn, *args).result()
+
+
+def _profiled(profile, fn, *args):
+    with profiler.attach(profile):
+        return fn(*args)
+
+
+def make_enhanced_prediction(resume_text, explain=False):
+    analyses, feature_list = make_batch_predictions([resume_text], explain=explain)
+    return analyses[0], feature_list[0]
+
+
+def build_prediction_response(analysis, features):
+    return {
+        "predicted_internship": analysis['primary_prediction'],
+        "confidence_level": f"{analysis['confidence']}%",
+        "prediction_quality": analysis['prediction_quality'],
+        "top_predictions": analysis['top_3_predictions'],
+        "extracted_features": {
+            "word_count": features.get('word_count', 0),
+            "unique_words": features.get('unique_words', 0),
+            "detected_skills": [k.replace('skill_', '').replace('_', ' ') for k, v in features.items() if k.startswith('skill_') and v == 1],
+            "education": [k.replace('has_', '').upper() for k, v in features.items() if k.startswith('has_') and v == 1],
+            "years_experience": features.get('years_experience', 0),
+            "has_projects": bool(features.get('project_mentioned', 0)),
+            "has_internship_experience": bool(features.get('internship_mentioned', 0)),
+            "category_keyword_hits": features.get('detected_category_keywords', {}),
+            "company_skills": features.get('company_skills', [])
+        }
+    }
+
+
+def recommendation_options():
+    """Company filters from the form or query string: location (comma-separated) and top_k"""
+    location = request.values.get('location') or None
+    try:
+        top_k = max(1, min(int(request.values.get('top_k', COMPANY_TOP_K)), 50))
+    except ValueError:
+        top_k = COMPANY_TOP_K
+    return {'location': location, 'top_k': top_k}
+
+
+def with_recommendations(response, location=None, top_k=COMPANY_TOP_K):
+    """Copy of a (possibly cached) prediction response with recommended_companies for these filters"""
+    recommended = []
+    if company_index is not None:
+        recommended = company_index.recommend(
+            response["extracted_features"].get("company_skills", []),
+            category=response["predicted_internship"], location=location, top_k=top_k
+        )
+    return {**response, "recommended_companies": recommended}
+
+
+def iter_zip_pdfs(name, stream):
+    """Yield (filename, data, error) for the PDFs in a zip archive, within the entry / size limits
+    (a declared file_size can lie, so every entry is read with a byte cap)"""
+    with zipfile.ZipFile(stream) as archive:
+        entries = [entry for entry in archive.infolist() if not entry.is_dir()]
+        if len(entries) > ZIP_MAX_ENTRIES:
+            registry.inc(ERRORS, type='zip_too_many_entries')
+            yield name, None, f"Zip archive has {len(entries)} files (limit {ZIP_MAX_ENTRIES})"
+            return
+        total = 0
+        for entry in entries:
+            if not entry.filename.lower().endswith('.pdf'):
+                yield entry.filename, None, "Only PDF files allowed"
+                continue
+            if entry.file_size > UPLOAD_MAX_BYTES:
+                yield entry.filename, None, f"PDF larger than the {UPLOAD_MAX_BYTES} byte limit"
+                continue
+            with archive.open(entry) as f:
+                data = f.read(min(UPLOAD_MAX_BYTES, ZIP_MAX_TOTAL_BYTES - total) + 1)
+            total += len(data)
+            if total > ZIP_MAX_TOTAL_BYTES:
+                registry.inc(ERRORS, type='zip_too_large')
+                yield name, None, f"Zip archive decompresses to more than {ZIP_MAX_TOTAL_BYTES} bytes; rest skipped"
+                return
+            if len(data) > UPLOAD_MAX_BYTES:
+                yield entry.filename, None, f"PDF larger than the {UPLOAD_MAX_BYTES} byte limit"
+                continue
+            yield entry.filename, data, None
+
+
+def iter_uploaded_pdfs(uploads):
+    """Yield (filename, data, error) for every PDF upload, expanding .zip archives"""
+    for upload in uploads:
+        name = upload.filename or ""
+        lower = name.lower()
+        if lower.endswith('.zip'):
+            try:
+                yield from iter_zip_pdfs(name, upload.stream)
+            except zipfile.BadZipFile:
+                yield name, None, "Invalid zip archive"
+        elif lower.endswith('.pdf'):
+            yield name, upload.read(), None
+        else:
+            yield name, None, "Only PDF files allowed"
+
+
+def find_near_duplicate(resume_text):
+    """(signature, cached response of an earlier near-identical resume or None)"""
+    if not minhash.NEAR_DUPLICATE_THRESHOLD:
+        return None, None
+    signature = minhash.signature(clean_text(resume_text))
+    match = near_duplicate_index.query(signature)
+    if match is None:
+        return signature, None
+    original_key, similarity = match
+    cached = result_cache.get(original_key)  # None once evicted or after a model change
+    if cached is None:
+        return signature, None
+    registry.inc(NEAR_DUPLICATES)
+    return signature, {**cached, "near_duplicate": {"of": original_key.split(':')[0][:16],
+                                                    "similarity": round(similarity, 3)}}
+
+
+def remember_prediction(cache_key, response, signature):
+    result_cache.put(cache_key, response)
+    if signature is not None:
+        near_duplicate_index.add(cache_key, signature)
+
+
+def predict_pdf_items(items, debug=False, location=None, top_k=COMPANY_TOP_K):
+    """Batch response for (filename, data, error) items: cache lookups, extraction, one predict_proba call"""
+    results, errors = [], []
+    pending = []  # (slot in results, cache key, extraction report) for cache misses
+    texts = []
+    for filename, data, error in items:
+        if error:
+            errors.append({"filename": filename, "error": error})
+            continue
+        cache_key = result_cache.key_for(data)
+        cached = result_cache.get(cache_key)
+        if cached is not None:
+            results.append({"filename": filename, **with_recommendations(cached, location, top_k)})
+            continue
+        resume_text, extraction = extract_text_from_pdf(data, with_report=True)
+        if not resume_text:
+            errors.append({"filename": filename,
+                           "error": extraction['error'] if extraction.get('rejected') else "Failed to extract text"})
+            continue
+        signature, duplicate = find_near_duplicate(resume_text)
+        if duplicate is not None:
+            result_cache.put(cache_key, duplicate)
+            results.append({"filename": filename, **with_recommendations(duplicate, location, top_k)})
+            continue
+        results.append({"filename": filename})
+        pending.append((len(results) - 1, cache_key, extraction, signature))
+        texts.append(resume_text)
+
+    if texts:
+        analyses, feature_list = run_inference(make_batch_predictions, texts)
+        for (slot, cache_key, extraction, signature), analysis, features in zip(pending, analyses, feature_list):
+            response = build_prediction_response(analysis, features)
+            remember_prediction(cache_key, response, signature)
+            results[slot].update(with_recommendations(response, location, top_k))
+            if debug:
+                results[slot]["extraction_debug"] = extraction
+
+    return {
+        "results": results,
+        "errors": errors,
+        "total_files": len(results) + len(errors),
+        "processed": len(results),
+        "failed": len(errors)
+    }
+
+
+def run_job(items):
+    if model is None:
+        raise RuntimeError("Model not loaded")
+    return predict_pdf_items(items)
+
+
+job_queue = JobQueue(run_job)
+
+
+# ---------------------------
+# Request metrics
+# ---------------------------
+def _endpoint_label():
+    # The URL rule ('/jobs/<job_id>'), not the path, so label values stay bounded
+    return request.url_rule.rule if request.url_rule else 'unmatched'
+
+
+@app.before_request
+def start_request_timer():
+    g.request_start = time.perf_counter()
+    g.profile = profiler.begin()
+
+
+@app.after_request
+def record_request(response):
+    seconds = time.perf_counter() - g.get('request_start', time.perf_counter())
+    endpoint = _endpoint_label()
+    registry.inc(REQUESTS, endpoint=endpoint, status=response.status_code)
+    registry.observe(REQUEST_SECONDS, seconds, endpoint=endpoint)
+    registry.flush()
+    return response
+
+
+@app.teardown_request
+def finish_profile(exc):
+    # Teardown runs even when a view raised (after_request does not), so no profile is left registered
+    seconds = time.perf_counter() - g.get('request_start', time.perf_counter())
+    profiler.end(g.pop('profile', None), seconds, _endpoint_label())
+
+
+def count_error(e):
+    registry.inc(ERRORS, type=type(e).__name__)
+
+
+def serialize(payload):
+    with registry.timer(STAGE_SECONDS, stage='serialize'):
+        return jsonify(payload)
+
+
+# ---------------------------
+# Admission control
+# ---------------------------
+def _admission_gauges(in_flight, waiting):
+    registry.set(IN_FLIGHT, in_flight)
+    registry.set(QUEUE_DEPTH, waiting)
+
+
+admission_controller = AdmissionController(on_change=_admission_gauges)
+
+
+def too_large(max_bytes):
+    registry.inc(ERRORS, type='upload_too_large')
+    return jsonify({"error": f"Upload larger than the {max_bytes} byte limit"}), 413
+
+
+def admission_controlled(max_bytes):
+    """Upload routes: refuse oversized bodies (413) and shed load beyond the in-flight queue (503 +
+    Retry-After) before the body is read; the body is parsed (and spooled) only once admitted"""
+    def decorator(route):
+        @wraps(route)
+        def admitted_route(*args, **kwargs):
+            if request.content_length is not None and request.content_length > max_bytes:
+                return too_large(max_bytes)
+            reason = admission_controller.acquire()
+            if reason is not None:
+                registry.inc(SHED, endpoint=_endpoint_label(), reason=reason)
+                return (jsonify({"error": "Server busy, retry later"}), 503,
+                        {'Retry-After': str(ADMISSION_RETRY_AFTER)})
+            try:
+                request.max_content_length = max_bytes
+                try:
+                    request.files  # chunked bodies carry no Content-Length: the limit is enforced while parsing
+                except RequestEntityTooLarge:
+                    return too_large(max_bytes)
+                return route(*args, **kwargs)
+            finally:
+                admission_controller.release()
+        return admitted_route
+    return decorator
 
 
 # ---------------------------
@@ -229,8 +672,18 @@ def health_check():
         info = {}
         if model_data:
             info['model_type'] = model_data.get('model_type', 'unknown')
+            info['serving_model'] = SERVING_MODEL
+            info['served_model'] = model_data.get('served_model', SERVING_MODEL)
+            info['serving_model_fallback'] = info['served_model'] != SERVING_MODEL
+            info['model_version'] = model_version
+            info['model_source'] = model_load_info.get('source')
+            info['load_seconds'] = model_load_info.get('load_seconds')
+            info['loaded_at'] = model_load_info.get('loaded_at')
+            info['feature_schema_version'] = model_data.get('feature_schema_version')
             info['class_names'] = model_data.get('class_names', [])
             info['features_count'] = len(model_data.get('feature_columns', [])) if 'feature_columns' in model_data else None
+            info['inference_path'] = 'sparse' if model_data.get('serving_plan') is not None else 'dataframe'
+            info['explained_by'] = model_data['explainer'].member if model_data.get('explainer') is not None else None
             if 'metrics' in model_data:
                 info['f1_weighted'] = model_data['metrics'].get('f1_weighted')
                 info['precision_weighted'] = model_data['metrics'].get('precision_weighted')
@@ -239,8 +692,20 @@ def health_check():
             'status': 'healthy',
             'model_loaded': model is not None,
             'companies_loaded': companies is not None,
+            'companies_indexed': len(company_index) if company_index is not None else 0,
+            'similar_index': similar_index.info() if similar_index is not None else None,
             'feature_info_loaded': feature_info is not None,
-            'model_info': info
+            'feature_schema_version': FEATURE_SCHEMA_VERSION,
+            'cache': result_cache.stats(),
+            'near_duplicates': {'indexed': len(near_duplicate_index), 'threshold': minhash.NEAR_DUPLICATE_THRESHOLD},
+            'jobs': job_queue.counts(),
+            'admission': admission_controller.stats(),
+            'model_info': info,
+            'model_reload': {
+                'reloading': model_load_info['reloading'],
+                'last_error': model_load_info['last_error'],
+                'registry_active_version': model_registry.active_version(SERVING_MODEL)
+            }
         })
     except Exception as e:
         return jsonify({
@@ -256,13 +721,22 @@ def home():
         'message': 'Enhanced Resume Internship Predictor API',
         'version': '2.0',
         'endpoints': {
-            '/upload_and_predict': 'POST - Upload resume PDF',
-            '/health': 'GET - API health'
+            '/upload_and_predict': 'POST - Upload resume PDF (optional location, top_k for recommended_companies)',
+            '/batch_predict': 'POST - Upload many resume PDFs or a zip archive',
+            '/similar': 'POST - Most similar past resumes to an uploaded PDF or text (top_k; add=1 indexes it)',
+            '/explain': 'POST - Prediction for a resume PDF or text with the terms and features behind it',
+            '/jobs': 'POST - Queue resume PDFs / zip for background prediction',
+            '/jobs/<job_id>': 'GET - Job status and result',
+            '/health': 'GET - API health',
+            '/metrics': 'GET - Prometheus metrics (request counts, stage latency histograms, errors, model version)',
+            '/admin/models': 'GET - Registered model versions (admin)',
+            '/admin/reload': 'POST - Activate a registered version (or re-read the active one) without downtime (admin)'
         }
     })
 
 
 @app.route('/upload_and_predict', methods=['POST'])
+@admission_controlled(UPLOAD_MAX_BYTES)
 def upload_and_predict():
     try:
         if model is None:
@@ -275,32 +749,202 @@ def upload_and_predict():
         if not file.filename.lower().endswith('.pdf'):
             return jsonify({"error": "Only PDF files allowed"}), 400
 
-        resume_text = extract_text_from_pdf(file.stream)
+        data = file.read()
+        cache_key = result_cache.key_for(data)
+        cached = result_cache.get(cache_key)
+        if cached is not None:
+            return serialize(with_recommendations(cached, **recommendation_options())), 200, {'X-Cache': 'HIT'}
+
+        resume_text, extraction = extract_text_from_pdf(data, with_report=True)
+        if extraction.get('rejected'):
+            return jsonify({"error": extraction['error']}), extraction['status']
         if not resume_text:
+            registry.inc(ERRORS, type='empty_text')
             return jsonify({"error": "Failed to extract text"}), 400
 
-        analysis, features = make_enhanced_prediction(resume_text)
+        signature, duplicate = find_near_duplicate(resume_text)
+        if duplicate is not None:
+            # Re-uploads of this exact file then hit the cache directly
+            result_cache.put(cache_key, duplicate)
+            response = with_recommendations(duplicate, **recommendation_options())
+            if debug_requested():
+                response = {**response, "extraction_debug": extraction}
+            return serialize(response), 200, {'X-Cache': 'NEAR-DUPLICATE'}
+
+        analysis, features = run_inference(make_enhanced_prediction, resume_text)
+        response = build_prediction_response(analysis, features)
+        remember_prediction(cache_key, response, signature)
+        response = with_recommendations(response, **recommendation_options())
+        if debug_requested():
+            response = {**response, "extraction_debug": extraction}
+        return serialize(response), 200, {'X-Cache': 'MISS'}
+    except Exception as e:
+        count_error(e)
+        return jsonify({"error": f"Enhanced prediction failed: {str(e)}"}), 500
+
+
+@app.route('/batch_predict', methods=['POST'])
+@admission_controlled(BATCH_MAX_BYTES)
+def batch_predict():
+    try:
+        if model is None:
+            return jsonify({"error": "Model not loaded"}), 500
+
+        uploads = request.files.getlist('resumes') or request.files.getlist('resume')
+        if not uploads:
+            return jsonify({"error": "No resumes uploaded"}), 400
 
-        # Response with highlights
+        return serialize(predict_pdf_items(
+            iter_uploaded_pdfs(uploads), debug=debug_requested(), **recommendation_options()
+        ))
+    except Exception as e:
+        count_error(e)
+        return jsonify({"error": f"Batch prediction failed: {str(e)}"}), 500
+
+
+@app.route('/similar', methods=['POST'])
+@admission_controlled(UPLOAD_MAX_BYTES)
+def similar_resumes():
+    try:
+        if similar_index is None:
+            return jsonify({"error": "Similarity index not built"}), 503
+
+        if 'resume' in request.files:
+            file = request.files['resume']
+            if not file.filename.lower().endswith('.pdf'):
+                return jsonify({"error": "Only PDF files allowed"}), 400
+            data = file.read()
+            resume_text, extraction = extract_text_from_pdf(data, with_report=True)
+            if extraction.get('rejected'):
+                return jsonify({"error": extraction['error']}), extraction['status']
+        else:
+            resume_text = request.values.get('text', '')
+            data = resume_text.encode()
+        if not resume_text.strip():
+            return jsonify({"error": "No resume text"}), 400
+        try:
+            top_k = min(max(int(request.values.get('top_k', SIMILAR_TOP_K)), 1), 50)
+        except ValueError:
+            return jsonify({"error": "top_k must be an integer"}), 400
+
+        query_id = f"upload:{hashlib.sha256(data).hexdigest()[:24]}"
+        start = time.perf_counter()
+        vector = similar_index.vectorize([resume_text])
+        results, search = run_inference(similar_index.search, vector, top_k, 'auto', query_id)
         response = {
-            "predicted_internship": analysis['primary_prediction'],
-            "confidence_level": f"{analysis['confidence']}%",
-            "prediction_quality": analysis['prediction_quality'],
-            "top_predictions": analysis['top_3_predictions'],
-            "extracted_features": {
-                "word_count": features.get('word_count', 0),
-                "unique_words": features.get('unique_words', 0),
-                "detected_skills": [k.replace('skill_', '').replace('_', ' ') for k, v in features.items() if k.startswith('skill_') and v == 1],
-                "education": [k.replace('has_', '').upper() for k, v in features.items() if k.startswith('has_') and v == 1],
-                "years_experience": features.get('years_experience', 0),
-                "has_projects": bool(features.get('project_mentioned', 0)),
-                "has_internship_experience": bool(features.get('internship_mentioned', 0)),
-                "category_keyword_hits": features.get('detected_category_keywords', {})
-            }
+            "query_id": query_id,
+            "similar": results,
+            "search": {**search, "ms": round((time.perf_counter() - start) * 1000, 2)},
+            "index": similar_index.info()
         }
-        return jsonify(response)
+        if request.values.get('add', '').lower() in ('1', 'true', 'yes'):
+            category = request.values.get('category')
+            if not category:
+                if model is None:
+                    return jsonify({"error": "Model not loaded; pass category to add this resume"}), 500
+                category = run_inference(make_enhanced_prediction, resume_text)[0]['primary_prediction']
+            response["added"] = similar_index.add(query_id, category, vector)
+            response["category"] = category
+        return serialize(response)
     except Exception as e:
-        return jsonify({"error": f"Enhanced prediction failed: {str(e)}"}), 500
+        count_error(e)
+        return jsonify({"error": f"Similarity search failed: {str(e)}"}), 500
+
+
+@app.route('/explain', methods=['POST'])
+@admission_controlled(UPLOAD_MAX_BYTES)
+def explain_prediction():
+    try:
+        if model is None:
+            return jsonify({"error": "Model not loaded"}), 500
+        if model_data.get('explainer') is None:
+            return jsonify({"error": "The active model has no linear member to explain predictions with"}), 501
+
+        if 'resume' in request.files:
+            file = request.files['resume']
+            if not file.filename.lower().endswith('.pdf'):
+                return jsonify({"error": "Only PDF files allowed"}), 400
+            resume_text, extraction = extract_text_from_pdf(file.read(), with_report=True)
+            if extraction.get('rejected'):
+                return jsonify({"error": extraction['error']}), extraction['status']
+        else:
+            resume_text = request.values.get('text', '')
+        if not resume_text.strip():
+            return jsonify({"error": "No resume text"}), 400
+
+        analysis, features = run_inference(make_enhanced_prediction, resume_text, True)
+        response = build_prediction_response(analysis, features)
+        response['explanation'] = analysis.get('explanation')
+        return serialize(response)
+    except Exception as e:
+        count_error(e)
+        return jsonify({"error": f"Explanation failed: {str(e)}"}), 500
+
+
+@app.route('/jobs', methods=['POST'])
+@admission_controlled(BATCH_MAX_BYTES)
+def submit_job():
+    try:
+        uploads = request.files.getlist('resumes') or request.files.getlist('resume')
+        if not uploads:
+            return jsonify({"error": "No resumes uploaded"}), 400
+
+        try:
+            job_id = job_queue.submit(iter_uploaded_pdfs(uploads), webhook=request.form.get('webhook') or None)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        status_url = f"/jobs/{job_id}"
+        return jsonify({"job_id": job_id, "status": "queued", "status_url": status_url}), 202, {'Location': status_url}
+    except Exception as e:
+        count_error(e)
+        return jsonify({"error": f"Job submission failed: {str(e)}"}), 500
+
+
+@app.route('/jobs/<job_id>', methods=['GET'])
+def job_status(job_id):
+    job = job_queue.get(job_id)
+    if job is None:
+        return jsonify({"error": "Job not found"}), 404
+    return jsonify(job)
+
+
+@app.route('/metrics', methods=['GET'])
+def metrics_endpoint():
+    return registry.render(), 200, {'Content-Type': 'text/plain; version=0.0.4; charset=utf-8'}
+
+
+def admin_allowed():
+    if ADMIN_TOKEN:
+        return request.headers.get('X-Admin-Token') == ADMIN_TOKEN
+    return request.remote_addr in ('127.0.0.1', '::1')
+
+
+@app.route('/admin/models', methods=['GET'])
+def admin_models():
+    if not admin_allowed():
+        return jsonify({"error": "Forbidden"}), 403
+    return jsonify({'active_version': model_version, 'versions': model_registry.list_versions()})
+
+
+@app.route('/admin/reload', methods=['POST'])
+def admin_reload():
+    if not admin_allowed():
+        return jsonify({"error": "Forbidden"}), 403
+    payload = request.get_json(silent=True) or {}
+    version = payload.get('version') or request.values.get('version')
+    if version:
+        try:
+            # Moving the pointer makes every other worker's watcher follow this one
+            model_registry.set_active(version, SERVING_MODEL)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 404
+    if not reload_model(version):
+        return jsonify({"error": "A reload is already in progress"}), 409
+    return jsonify({
+        "status": "loading",
+        "version": version or model_registry.active_version(SERVING_MODEL),
+        "serving_version": model_version
+    }), 202
 
 
 # ---------------------------
@@ -309,4 +953,7 @@ def upload_and_predict():
 if __name__ == '__main__':
     load_model()
     load_companies()
+    load_similar_index()
+    job_queue.start()
+    start_model_watcher()
     app.run(host='0.0.0.0', port=5000, debug=True)
@@ -0,0 +1,74 @@
+"""
+Exactness check + overhead of explanations (explain.py).
+
+For every model in the registry with an active version, the weight table must reproduce the linear
+member's decision_function over the whole dataset, and each explanation's contributions (all of
+them, not just the top ones) plus the intercept must add up to the member's score for the class.
+Overhead is Explainer.explain on one resume, on top of building the model input.
+
+    python benchmarks/bench_explain.py
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import model_registry  # noqa: E402
+from explain import build_explainer  # noqa: E402
+from features import BACKGROUND_COLUMN, DEFAULT_ACADEMIC_BACKGROUND, clean_text_series, feature_arrays  # noqa: E402
+from sparse_inference import compile_pipeline  # noqa: E402
+
+
+def model_input(plan, texts):
+    columns = feature_arrays(texts)
+    columns[BACKGROUND_COLUMN] = DEFAULT_ACADEMIC_BACKGROUND
+    return plan.transform(texts, columns)
+
+
+def main():
+    os.chdir(ROOT)
+    texts = list(clean_text_series(pd.read_csv('UpdatedResumeDataSet.csv')['Resume']))
+    failed = False
+    for kind in model_registry.KINDS:
+        version = model_registry.active_version(kind)
+        if version is None:
+            continue
+        pipeline = model_registry.load_version(version)[0]['model']
+        plan, explainer = compile_pipeline(pipeline), build_explainer(pipeline)
+        if plan is None or explainer is None:
+            print(f"⚠️ {kind} ({version}): skipped")
+            continue
+
+        X = model_input(plan, texts)
+        classifier = pipeline.steps[-1][1]
+        member = classifier.named_estimators_[explainer.member] if hasattr(classifier, 'named_estimators_') else classifier
+        scores = np.asarray(X @ explainer.weights) + explainer.intercept
+        scores_match = np.allclose(scores, member.decision_function(X))
+        predicted = np.argmax(scores, axis=1)
+        rows = X.multiply(explainer.weights[:, predicted].T).tocsr()
+        sums_match = np.allclose(np.asarray(rows.sum(axis=1)).ravel() + explainer.intercept[predicted],
+                                 scores[np.arange(len(texts)), predicted])
+        ok = scores_match and sums_match
+        failed |= not ok
+        print(f"{'✅' if ok else '❌'} {kind} ({version}), member {explainer.member}, {len(texts)} resumes: "
+              f"scores {scores_match}, contributions {sums_match}")
+
+        timings = []
+        for row, text in enumerate(texts):
+            x = X[row]
+            start = time.perf_counter()
+            explainer.explain(x, [predicted[row]], [text])
+            timings.append(time.perf_counter() - start)
+        print(f"   explain p50 {np.percentile(timings, 50) * 1000:.3f} ms, "
+              f"p95 {np.percentile(timings, 95) * 1000:.3f} ms")
+    if failed:
+        sys.exit("❌ Explanations do not match the linear member")
+
+
+if __name__ == '__main__':
+    main()
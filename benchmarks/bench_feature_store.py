@@ -0,0 +1,60 @@
+"""
+Parity check + timing for feature_store.py (training data preparation).
+
+The corpus is the dataset repeated --copies times, each copy made unique with a token, so every
+row is a distinct key. The script times building the model input with no store, with an empty
+store (cold), with a full store (warm), and with 10% of the rows changed (partial). Every store
+frame is checked against build_model_input(clean_text_series(...)).
+
+    python benchmarks/bench_feature_store.py [--copies 20]
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from feature_store import FeatureStore  # noqa: E402
+from features import build_model_input, clean_text_series  # noqa: E402
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--copies', type=int, default=20)
+    args = parser.parse_args()
+
+    resumes = pd.read_csv(os.path.join(ROOT, 'UpdatedResumeDataSet.csv'))['Resume']
+    corpus = pd.concat([resumes + f" copy{i}" for i in range(args.copies)], ignore_index=True)
+    changed = corpus.copy()
+    changed.iloc[::10] = changed.iloc[::10] + " changed"
+
+    store_dir = tempfile.mkdtemp(prefix='bench-feature-store-')
+    try:
+        expected, no_store_s = timed(lambda texts: build_model_input(clean_text_series(texts)), corpus)
+        print(f"🗄️ {len(corpus)} rows")
+        print(f"   no store  {no_store_s:7.2f}s")
+        for label, texts in (('cold', corpus), ('warm', corpus), ('partial', changed)):
+            store = FeatureStore(store_dir)
+            frame, seconds = timed(store.model_input, texts)
+            reference = expected if texts is corpus else build_model_input(clean_text_series(texts))
+            pd.testing.assert_frame_equal(frame, reference)
+            print(f"   {label:<9} {seconds:7.2f}s  ({store.last_stats['computed']} rows computed, "
+                  f"{store.last_stats['segments']} segments)  ✅ identical frame")
+    finally:
+        shutil.rmtree(store_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+"""
+Micro-benchmark for features.py.
+
+Times the original per-keyword `extract_features` loops from app.py (the reference in
+tests/test_features.py, which also checks parity) against features.extract_features and
+features.extract_features_batch over every row of UpdatedResumeDataSet.csv.
+
+    python benchmarks/bench_features.py [--repeat 3]
+"""
+import argparse
+import os
+import sys
+import time
+
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import features  # noqa: E402
+from tests.test_features import reference_features  # noqa: E402
+
+
+# ---------------------------
+# Timing
+# ---------------------------
+def time_per_resume(fn, texts, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for text in texts:
+            fn(text)
+        best = min(best, time.perf_counter() - start)
+    return best / len(texts) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--csv", default=os.path.join(ROOT, "UpdatedResumeDataSet.csv"))
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    raw = pd.read_csv(args.csv)['Resume']
+    cleaned = [features.clean_text(t) for t in raw]
+
+    print("⏱️ Per-resume feature extraction time (best of %d, cleaned text)" % args.repeat)
+    before = time_per_resume(reference_features, cleaned, args.repeat)
+    after = time_per_resume(features.extract_features, cleaned, args.repeat)
+    best_batch = float('inf')
+    series = pd.Series(cleaned)
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        features.extract_features_batch(series)
+        best_batch = min(best_batch, time.perf_counter() - start)
+    batch = best_batch / len(cleaned) * 1e6
+    print(f"   loops: {before:8.1f} µs   matcher: {after:8.1f} µs ({before / after:.2f}x)   batch: {batch:8.1f} µs ({before / batch:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Parity check + throughput benchmark for minhash.py.
+
+Batched signatures are checked against a per-shingle pure-Python MinHash on a sample of the
+dataset. The corpus is then scaled up with edited copies (a share of words replaced, plus a
+unique token so no two texts are identical). The script times signing and corpus dedupe and
+reports how many edited copies are flagged.
+
+    python benchmarks/bench_minhash.py [--copies 100]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+import zlib
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import minhash  # noqa: E402
+from features import clean_text_series  # noqa: E402
+
+
+def reference_signature(text):
+    tokens = text.split()
+    hashes = [zlib.crc32(token.encode()) for token in tokens]
+    w = minhash.SHINGLE_WORDS
+    if len(tokens) >= w:
+        mix = [int(m) for m in minhash.SHINGLE_MIX]
+        shingles = [sum(hashes[i + j] * mix[j] for j in range(w)) % 2 ** 64 for i in range(len(tokens) - w + 1)]
+    else:
+        shingles = hashes
+    if not shingles:
+        return np.full(minhash.MINHASH_PERMUTATIONS, minhash.EMPTY, dtype=np.uint32)
+    return np.array([min(((int(a) * s + int(b)) % 2 ** 64) >> 32 for s in shingles)
+                     for a, b in zip(minhash.PERM_A, minhash.PERM_B)], dtype=np.uint32)
+
+
+def edited(text, share, rng):
+    words = text.split()
+    for _ in range(int(len(words) * share)):
+        words[rng.randrange(len(words))] = 'zzzedit'
+    return " ".join(words)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--copies', type=int, default=100, help="edited copies of every distinct resume")
+    args = parser.parse_args()
+
+    texts = clean_text_series(pd.read_csv(os.path.join(ROOT, 'UpdatedResumeDataSet.csv'))['Resume'])
+    distinct = list(dict.fromkeys(texts))
+
+    sample = distinct[:30] + ["", "one", "two words"]
+    mismatches = sum(not np.array_equal(sig, reference_signature(text))
+                     for sig, text in zip(minhash.signatures(sample), sample))
+    if mismatches:
+        sys.exit(f"❌ {mismatches} signatures differ from the reference")
+    print(f"✅ Parity: {len(sample)} signatures match the pure-Python reference")
+
+    rng = random.Random(0)
+    for share in (0.01, 0.05, 0.2):
+        copies = [edited(text, share, rng) for text in distinct]
+        flagged = (minhash.near_duplicates(distinct + copies)[len(distinct):] >= 0).mean()
+        print(f"   {share:.0%} of words edited: {flagged:.1%} of copies flagged (threshold {minhash.NEAR_DUPLICATE_THRESHOLD})")
+
+    corpus = [f"{edited(text, 0.02, rng)} copy{i}" for i in range(args.copies) for text in distinct]
+    start = time.perf_counter()
+    minhash.signatures(corpus)
+    sign_s = time.perf_counter() - start
+    start = time.perf_counter()
+    kept = (minhash.near_duplicates(corpus) < 0).sum()
+    dedupe_s = time.perf_counter() - start
+    print(f"⏱️ {len(corpus)} texts: signatures {sign_s:.2f}s ({len(corpus) / sign_s:.0f}/s), "
+          f"dedupe {dedupe_s:.2f}s -> {kept} kept")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+"""
+Startup-time benchmark: pickle.load(advanced_model.pkl) vs the memory-mapped joblib artifact.
+
+Each loader runs in a fresh interpreter (sklearn/joblib imported before the clock starts), so
+the numbers are what a newly started worker pays. RSS is split into anonymous memory (private
+to the worker) and file-backed memory (memory-mapped pages shared through the OS page cache).
+
+    python train_model.py                       # writes both formats
+    python benchmarks/bench_model_load.py [--runs 5]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = r'''
+import json, os, pickle, sys, time
+sys.path.insert(0, {root!r})
+os.chdir({root!r})
+import joblib, sklearn.pipeline, sklearn.ensemble, sklearn.svm, sklearn.linear_model, sklearn.compose  # noqa
+from model_artifact import load_artifact
+from features import build_model_input, clean_text
+
+
+def rss():
+    fields = {{}}
+    with open('/proc/self/status') as f:
+        for line in f:
+            key, _, value = line.partition(':')
+            if key in ('VmRSS', 'RssAnon', 'RssFile'):
+                fields[key] = int(value.split()[0]) / 1024
+    return fields
+
+
+before = rss()
+start = time.perf_counter()
+if {mode!r} == 'pickle':
+    with open('advanced_model.pkl', 'rb') as f:
+        model_data = pickle.load(f)
+else:
+    model_data = load_artifact('advanced_model.joblib', mmap_mode={mmap!r})
+load_s = time.perf_counter() - start
+
+frame = build_model_input([clean_text("python developer with django flask sql and machine learning projects")])
+start = time.perf_counter()
+model_data['model'].predict_proba(frame)
+first_predict_s = time.perf_counter() - start
+after = rss()
+print(json.dumps({{
+    'load_s': load_s,
+    'first_predict_s': first_predict_s,
+    'rss_mb': after.get('VmRSS', 0) - before.get('VmRSS', 0),
+    'anon_mb': after.get('RssAnon', 0) - before.get('RssAnon', 0),
+    'file_mb': after.get('RssFile', 0) - before.get('RssFile', 0),
+}}))
+'''
+
+
+def run(mode, mmap, runs):
+    samples = []
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, '-c', CHILD.format(root=ROOT, mode=mode, mmap=mmap)],
+                             capture_output=True, text=True, check=True)
+        samples.append(json.loads(out.stdout.strip().splitlines()[-1]))
+    return {key: statistics.median(s[key] for s in samples) for key in samples[0]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    for path in ('advanced_model.pkl', 'advanced_model.joblib'):
+        if not os.path.exists(os.path.join(ROOT, path)):
+            sys.exit(f"❌ {path} not found - run train_model.py first")
+
+    cases = [
+        ('pickle', 'pickle', None),
+        ('joblib (no mmap)', 'artifact', None),
+        ('joblib mmap_mode=r', 'artifact', 'r'),
+    ]
+    print(f"⏱️ Model load, median of {args.runs} fresh processes")
+    print(f"   {'loader':<20} {'load ms':>9} {'1st predict ms':>15} {'RSS MB':>8} {'private MB':>11} {'shared MB':>10}")
+    for label, mode, mmap in cases:
+        r = run(mode, mmap, args.runs)
+        print(f"   {label:<20} {r['load_s'] * 1000:9.1f} {r['first_predict_s'] * 1000:15.1f} "
+              f"{r['rss_mb']:8.1f} {r['anon_mb']:11.1f} {r['file_mb']:10.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,247 @@
+"""
+Reproducible end-to-end benchmark of the serving pipeline, with a JSON record and regression check.
+
+Synthetic PDFs are built from a fixed sample of UpdatedResumeDataSet.csv rows at each --pages
+count. For batch sizes 1, 32 and 1024 the suite times:
+
+    extract_text_from_pdf      one call per PDF in the batch
+    clean_text                 one call per resume text
+    extract_features           features.build_model_input over the cleaned batch
+    predict                    make_enhanced_prediction (batch of 1) / make_batch_predictions
+    route                      Flask test client: /upload_and_predict (1) / /batch_predict (32; 1024 as a zip)
+
+and reports per-batch latency percentiles and documents/second, plus the model load time and
+RSS. Every upload carries unique bytes so the result cache never answers, and the near-duplicate
+lookup is switched off (the sample repeats resumes, whose text make_unique does not change), so
+every route call runs extraction and inference. Results go to a JSON
+file; pass --baseline to compare against an earlier run and exit 1 when any case's p50 is more
+than --threshold slower.
+
+    python benchmarks/bench_pipeline.py --output bench_before.json
+    python benchmarks/bench_pipeline.py --baseline bench_before.json --threshold 0.15
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import zipfile
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from pdf_fixtures import resume_pdf, make_unique  # noqa: E402
+
+BATCH_SIZES = (1, 32, 1024)
+PAGE_COUNTS = (1, 3)
+# Werkzeug rejects forms with more than 1000 parts, so large batches are uploaded as one zip archive
+ZIP_ABOVE = 256
+
+
+def percentile(values, q):
+    return float(np.percentile(values, q)) if len(values) else float('nan')
+
+
+def memory_mb():
+    fields = {}
+    with open('/proc/self/status') as f:
+        for line in f:
+            key, _, value = line.partition(':')
+            if key in ('VmRSS', 'VmHWM'):
+                fields[key] = int(value.split()[0]) / 1024
+    return fields
+
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def time_batches(fn, batches):
+    """Run fn on each batch; returns per-batch seconds"""
+    fn(batches[0])  # warm-up (imports, caches, lazily built pools)
+    seconds = []
+    for batch in batches:
+        start = time.perf_counter()
+        fn(batch)
+        seconds.append(time.perf_counter() - start)
+    return seconds
+
+
+def summarize(seconds, batch_size):
+    ms = [s * 1000 for s in seconds]
+    return {
+        'batches': len(ms),
+        'p50_ms': round(percentile(ms, 50), 3),
+        'p95_ms': round(percentile(ms, 95), 3),
+        'p99_ms': round(percentile(ms, 99), 3),
+        'mean_ms': round(float(np.mean(ms)), 3),
+        'docs_per_s': round(batch_size * len(ms) / sum(seconds), 1)
+    }
+
+
+# ---------------------------
+# Suite
+# ---------------------------
+def run_suite(args):
+    import app  # sklearn / pandas imports are not part of the model load
+    import minhash
+    minhash.NEAR_DUPLICATE_THRESHOLD = 0  # read per request by app.find_near_duplicate
+    rss_before = memory_mb()
+    start = time.perf_counter()
+    app.load_model()
+    app.load_companies()
+    model_load_s = time.perf_counter() - start
+    if app.model is None:
+        sys.exit("❌ No model loaded - run train_model.py first")
+    rss_after_load = memory_mb()
+
+    from features import clean_text, build_model_input
+    client = app.app.test_client()
+
+    texts = pd.read_csv(os.path.join(ROOT, 'UpdatedResumeDataSet.csv'))['Resume']
+    texts = texts.sample(args.sample, replace=len(texts) < args.sample, random_state=args.seed).tolist()
+    cleaned_texts = [clean_text(t) for t in texts]
+
+    def take(pool, batch_size, count):
+        # Consecutive slices of the sample (wrapping), so every case sees the same documents
+        return [[pool[(b * batch_size + i) % len(pool)] for i in range(batch_size)] for b in range(count)]
+
+    serial = iter(range(10 ** 12))
+
+    def unique(pdfs):
+        return [make_unique(pdf, f"{args.seed}-{next(serial)}") for pdf in pdfs]
+
+    def route(pdfs):
+        pdfs = unique(pdfs)
+        if len(pdfs) == 1:
+            r = client.post('/upload_and_predict', data={'resume': (io.BytesIO(pdfs[0]), 'resume.pdf')})
+        elif len(pdfs) > ZIP_ABOVE:
+            archive = io.BytesIO()
+            with zipfile.ZipFile(archive, 'w', zipfile.ZIP_STORED) as zf:
+                for i, pdf in enumerate(pdfs):
+                    zf.writestr(f'resume_{i}.pdf', pdf)
+            archive.seek(0)
+            r = client.post('/batch_predict', data={'resumes': (archive, 'resumes.zip')})
+        else:
+            r = client.post('/batch_predict', data={'resumes': [(io.BytesIO(p), f'resume_{i}.pdf') for i, p in enumerate(pdfs)]})
+        if r.status_code != 200:
+            raise RuntimeError(f"route returned {r.status_code}: {r.get_data(as_text=True)[:200]}")
+
+    def predict(batch):
+        if len(batch) == 1:
+            app.make_enhanced_prediction(batch[0])
+        else:
+            app.make_batch_predictions(batch)
+
+    cases = []
+    for batch_size in args.batch_sizes:
+        count = max(args.min_batches, args.docs // batch_size)
+        text_batches = take(texts, batch_size, count)
+        stages = {
+            'clean_text': (lambda batch: [clean_text(t) for t in batch], text_batches),
+            'extract_features': (build_model_input, take(cleaned_texts, batch_size, count)),
+            'predict': (predict, text_batches),
+        }
+        for pages in args.pages:
+            pdfs = [resume_pdf(t, pages=pages) for t in texts[:min(len(texts), batch_size * count)]]
+            pdf_batches = take(pdfs, batch_size, count)
+            stages[f'extract_text_from_pdf/{pages}p'] = (
+                lambda batch: [app.extract_text_from_pdf(pdf) for pdf in batch], pdf_batches)
+            stages[f'route/{pages}p'] = (route, pdf_batches)
+
+        for name, (fn, batches) in stages.items():
+            result = {'stage': name, 'batch_size': batch_size, **summarize(time_batches(fn, batches), batch_size)}
+            cases.append(result)
+            print(f"   {name:<28}{batch_size:>6}{result['batches']:>8}{result['p50_ms']:>11.2f}{result['p95_ms']:>11.2f}"
+                  f"{result['p99_ms']:>11.2f}{result['docs_per_s']:>11.1f}")
+
+    memory = memory_mb()
+    return {
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'git_revision': git_revision(),
+        'python': platform.python_version(),
+        'cpus': os.cpu_count(),
+        'model_version': app.model_version,
+        'model_type': app.model_data.get('model_type'),
+        'settings': {'pages': list(args.pages), 'batch_sizes': list(args.batch_sizes), 'docs': args.docs,
+                     'min_batches': args.min_batches, 'sample': args.sample, 'seed': args.seed,
+                     'near_duplicate_lookup': False},
+        'model_load_s': round(model_load_s, 3),
+        'rss_mb': {
+            'after_model_load': round(rss_after_load['VmRSS'] - rss_before['VmRSS'], 1),
+            'final': round(memory['VmRSS'], 1),
+            'peak': round(memory['VmHWM'], 1)
+        },
+        'cases': cases
+    }
+
+
+def compare(results, baseline, threshold):
+    """Cases (and model load) whose p50 grew by more than `threshold` over the baseline"""
+    old_cases = {(c['stage'], c['batch_size']): c for c in baseline.get('cases', [])}
+    regressions = []
+    print(f"\n📈 vs baseline {baseline.get('git_revision')} ({baseline.get('created_at')}), threshold +{threshold:.0%}")
+    print(f"   {'stage':<28}{'batch':>6}{'old p50':>11}{'new p50':>11}{'change':>9}")
+    rows = [(('model_load', 0), baseline.get('model_load_s', 0) * 1000, results['model_load_s'] * 1000)]
+    rows += [((c['stage'], c['batch_size']), old_cases[(c['stage'], c['batch_size'])]['p50_ms'], c['p50_ms'])
+             for c in results['cases'] if (c['stage'], c['batch_size']) in old_cases]
+    for (stage, batch_size), old, new in rows:
+        change = (new - old) / old if old else 0
+        flag = " ❌" if change > threshold else ""
+        print(f"   {stage:<28}{batch_size:>6}{old:>11.2f}{new:>11.2f}{change:>+9.1%}{flag}")
+        if flag:
+            regressions.append({'stage': stage, 'batch_size': batch_size, 'old_p50_ms': old, 'new_p50_ms': new,
+                                'change': round(change, 4)})
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pages', type=int, nargs='+', default=list(PAGE_COUNTS), help="PDF page counts")
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=list(BATCH_SIZES))
+    parser.add_argument('--docs', type=int, default=64, help="documents per case (batches = docs / batch size)")
+    parser.add_argument('--min-batches', type=int, default=5, help="batches timed per case at least")
+    parser.add_argument('--sample', type=int, default=1024, help="distinct resumes drawn from the dataset")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default='bench_results.json')
+    parser.add_argument('--baseline', help="earlier --output file to compare against")
+    parser.add_argument('--threshold', type=float, default=0.2, help="allowed p50 slowdown (0.2 = +20%%)")
+    args = parser.parse_args()
+    args.output = os.path.abspath(args.output)
+    args.baseline = args.baseline and os.path.abspath(args.baseline)
+    os.chdir(ROOT)  # app.py loads the model and companies.csv relative to the working directory
+
+    print(f"📊 Pipeline benchmark: pages {args.pages}, batch sizes {args.batch_sizes}")
+    print(f"   {'stage':<28}{'batch':>6}{'batches':>8}{'p50 ms':>11}{'p95 ms':>11}{'p99 ms':>11}{'docs/s':>11}")
+    results = run_suite(args)
+    print(f"⏱️ Model load {results['model_load_s']:.2f}s, RSS +{results['rss_mb']['after_model_load']} MB "
+          f"(final {results['rss_mb']['final']} MB, peak {results['rss_mb']['peak']} MB)")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            results['regressions'] = compare(results, json.load(f), args.threshold)
+        results['baseline'] = args.baseline
+        results['threshold'] = args.threshold
+
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"💾 Results saved to {args.output}")
+
+    if results.get('regressions'):
+        print(f"❌ {len(results['regressions'])} case(s) regressed beyond +{args.threshold:.0%}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
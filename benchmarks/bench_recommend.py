@@ -0,0 +1,92 @@
+"""
+Parity check + micro-benchmark for recommender.CompanyIndex.
+
+companies.csv is scaled up to --rows companies (skills resampled from its own skill pool, so
+roles/locations keep their real distribution). Every query is checked against a brute-force
+per-row pandas loop, then the sparse index is timed per request.
+
+    python benchmarks/bench_recommend.py [--rows 100000] [--queries 200]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from recommender import CATEGORY_ROLES, CompanyIndex, skill_key  # noqa: E402
+
+
+def scaled_companies(rows, seed=0):
+    base = pd.read_csv(os.path.join(ROOT, 'companies.csv'))
+    pool = sorted({s.strip() for skills in base['Skills'] for s in skills.split(',')})
+    rng = np.random.default_rng(seed)
+    frame = base.sample(rows, replace=True, random_state=seed).reset_index(drop=True)
+    frame['Company'] = [f"{name} #{i}" for i, name in enumerate(frame['Company'])]
+    frame['Skills'] = [", ".join(rng.choice(pool, size=rng.integers(3, 8), replace=False)) for _ in range(rows)]
+    return frame
+
+
+def brute_force(frame, skills, category, location, top_k):
+    """Reference: score every row with a Python loop"""
+    roles = {r.lower() for r in CATEGORY_ROLES.get(category, [])}
+    if not roles & set(frame['Role'].str.lower()):
+        roles = None
+    locations = {loc.lower() for loc in location.split(',')} if location else None
+    scored = []
+    for position, row in enumerate(frame.itertuples(index=False)):
+        if roles and row.Role.lower() not in roles:
+            continue
+        if locations and row.Location.lower() not in locations:
+            continue
+        required = list(dict.fromkeys(skill_key(s) for s in row.Skills.split(',')))
+        matched = sum(1 for s in required if s in skills)
+        if matched:
+            scored.append((-(matched / len(required)), -matched, position, row.Company))
+    return [company for *_, company in sorted(scored)[:top_k]]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--check', type=int, default=20, help="queries verified against the brute-force loop")
+    args = parser.parse_args()
+
+    frame = scaled_companies(args.rows)
+    start = time.perf_counter()
+    index = CompanyIndex(frame)
+    print(f"📦 Indexed {len(index)} companies / {len(index.skill_labels)} skills in {time.perf_counter() - start:.2f}s")
+
+    rng = np.random.default_rng(1)
+    keys = list(index.skill_ids)
+    categories = list(CATEGORY_ROLES) + ['HR']
+    locations = [None, None, 'Bangalore', 'Pune,Remote']
+    queries = [
+        (sorted(rng.choice(keys, size=rng.integers(2, 10), replace=False)),
+         categories[i % len(categories)], locations[i % len(locations)])
+        for i in range(args.queries)
+    ]
+
+    for skills, category, location in queries[:args.check]:
+        got = [r['company'] for r in index.recommend(skills, category, location, top_k=5)]
+        expected = brute_force(frame, set(skills), category, location, 5)
+        if got != expected:
+            sys.exit(f"❌ Mismatch for {skills} / {category} / {location}:\n   {got}\n   {expected}")
+    print(f"✅ {args.check} queries match the brute-force loop")
+
+    timings = []
+    for skills, category, location in queries:
+        start = time.perf_counter()
+        index.recommend(skills, category, location, top_k=5)
+        timings.append(time.perf_counter() - start)
+    timings = np.array(timings) * 1000
+    print(f"⏱️ recommend(): p50 {np.percentile(timings, 50):.3f} ms, p95 {np.percentile(timings, 95):.3f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+"""
+Latency + recall benchmark for the /similar index: exact brute force vs LSH candidates.
+
+The corpus is synthetic: each row is a real resume's TF-IDF vector (from the trained model's
+vectorizer) with a random 30% of its terms dropped and 30 random vocabulary terms added, then
+re-normalised. Queries are held-out perturbations of the same resumes. recall@k is the share of
+the exact top-k that LSH returns.
+
+    python benchmarks/bench_similar.py [--rows 10000 100000 1000000] [--queries 200]
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+from scipy.sparse import csr_matrix, vstack
+from sklearn.preprocessing import normalize
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import similarity  # noqa: E402
+from similarity import SimilarityIndex, write_build, set_current, training_vectorizer  # noqa: E402
+
+
+def perturbed(base, rows, rng, chunk_rows=50000):
+    """rows x dim CSR, generated in chunks to bound peak memory"""
+    return vstack([_perturbed(base, min(chunk_rows, rows - start), rng)
+                   for start in range(0, rows, chunk_rows)], format='csr')
+
+
+def _perturbed(base, rows, rng, drop=0.3, noise_terms=30):
+    """Random base rows with some terms dropped and random terms added"""
+    picks = rng.integers(0, base.shape[0], rows)
+    chunk = base[picks].tocoo()
+    keep = rng.random(chunk.nnz) >= drop
+    noise_rows = np.repeat(np.arange(rows), noise_terms)
+    noise_cols = rng.integers(0, base.shape[1], rows * noise_terms)
+    noise_vals = rng.random(rows * noise_terms).astype(np.float32) * np.float32(chunk.data.mean())
+    matrix = csr_matrix((np.concatenate([chunk.data[keep], noise_vals]),
+                         (np.concatenate([chunk.row[keep], noise_rows]), np.concatenate([chunk.col[keep], noise_cols]))),
+                        shape=(rows, base.shape[1]), dtype=np.float32)
+    return normalize(matrix)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, nargs='+', default=[10000, 100000, 300000])
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--k', type=int, default=10)
+    args = parser.parse_args()
+
+    import pandas as pd
+    from features import clean_text
+    os.chdir(ROOT)
+    vectorizer, _ = training_vectorizer()
+    texts = pd.read_csv('UpdatedResumeDataSet.csv')['Resume'].drop_duplicates().map(clean_text)
+    base = csr_matrix(vectorizer.transform(texts), dtype=np.float32)
+    rng = np.random.default_rng(0)
+
+    print(f"🔎 top-{args.k}, {args.queries} queries per corpus size")
+    print(f"   {'rows':>9}{'build s':>9}{'bits':>6}{'brute p50 ms':>14}{'lsh p50 ms':>12}{'lsh p95 ms':>12}"
+          f"{'candidates':>12}{'recall':>8}")
+    for rows in args.rows:
+        corpus = perturbed(base, rows, rng)
+        queries = perturbed(base, args.queries, rng)
+        index_dir = tempfile.mkdtemp(prefix='bench-similar-')
+        try:
+            start = time.perf_counter()
+            build = write_build(corpus, [f"row:{i}" for i in range(rows)], ['x'] * rows, vectorizer, {}, index_dir)
+            set_current(build, index_dir)
+            build_s = time.perf_counter() - start
+            del corpus
+            index = SimilarityIndex(index_dir)
+
+            timings = {'brute_force': [], 'lsh': []}
+            recalls, candidates = [], []
+            for q in range(args.queries):
+                query = queries[q]
+                found = {}
+                for method in timings:
+                    start = time.perf_counter()
+                    results, search = index.search(query, args.k, method=method)
+                    timings[method].append((time.perf_counter() - start) * 1000)
+                    found[method] = {r['id'] for r in results}
+                    if method == 'lsh':
+                        candidates.append(search['candidates'])
+                recalls.append(len(found['lsh'] & found['brute_force']) / max(len(found['brute_force']), 1))
+            print(f"   {rows:>9}{build_s:>9.2f}{index._state['meta']['lsh_bits']:>6}"
+                  f"{np.percentile(timings['brute_force'], 50):>14.2f}{np.percentile(timings['lsh'], 50):>12.2f}"
+                  f"{np.percentile(timings['lsh'], 95):>12.2f}{np.mean(candidates):>12.0f}{np.mean(recalls):>8.3f}")
+        finally:
+            shutil.rmtree(index_dir, ignore_errors=True)
+    print(f"   (auto switches to LSH above SIMILAR_BRUTE_FORCE_MAX={similarity.SIMILAR_BRUTE_FORCE_MAX} rows)")
+
+
+if __name__ == '__main__':
+    main()
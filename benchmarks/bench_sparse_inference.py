@@ -0,0 +1,101 @@
+"""
+Parity check + per-request overhead of the sparse inference path (sparse_inference.py).
+
+For every model in the registry with an active version (full / fast / incremental), the
+compiled plan must give exactly the same matrix and probabilities as pipeline.predict_proba on
+the DataFrame from build_model_input, over every resume in the dataset. Overhead is the time
+from cleaned text to classifier input (features + model matrix, without predict_proba), timed
+at batch sizes 1 and 32 for both paths.
+
+    python benchmarks/bench_sparse_inference.py [--repeats 200]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+from scipy.sparse import issparse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import model_registry  # noqa: E402
+from features import (  # noqa: E402
+    BACKGROUND_COLUMN, DEFAULT_ACADEMIC_BACKGROUND, build_model_input, clean_text_series, feature_arrays,
+    feature_records
+)
+from sparse_inference import compile_pipeline  # noqa: E402
+
+
+def dataframe_input(pipeline, texts):
+    return pipeline.steps[0][1].transform(build_model_input(texts))
+
+
+def sparse_input(plan, texts):
+    columns = feature_arrays(texts)
+    columns[BACKGROUND_COLUMN] = DEFAULT_ACADEMIC_BACKGROUND
+    return plan.transform(texts, columns)
+
+
+def same_matrix(a, b):
+    if issparse(a) != issparse(b):
+        return False
+    if issparse(a):
+        a, b = a.tocsr(), b.tocsr()
+        return (a.shape == b.shape and a.dtype == b.dtype and np.array_equal(a.indptr, b.indptr)
+                and np.array_equal(a.indices, b.indices) and np.array_equal(a.data, b.data))
+    return a.shape == b.shape and a.dtype == b.dtype and np.array_equal(a, b)
+
+
+def p50_ms(fn, texts, repeats):
+    timings = []
+    for i in range(repeats):
+        start = time.perf_counter()
+        fn(texts)
+        timings.append(time.perf_counter() - start)
+    return np.percentile(timings, 50) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeats', type=int, default=200)
+    args = parser.parse_args()
+
+    os.chdir(ROOT)
+    texts = list(clean_text_series(pd.read_csv('UpdatedResumeDataSet.csv')['Resume']))
+    failed = False
+    for kind in model_registry.KINDS:
+        version = model_registry.active_version(kind)
+        if version is None:
+            continue
+        pipeline = model_registry.load_version(version)[0]['model']
+        plan = compile_pipeline(pipeline)
+        if plan is None:
+            print(f"⚠️ {kind} ({version}): not compilable, served through pandas")
+            continue
+
+        frame = build_model_input(texts)
+        columns = feature_arrays(texts)
+        columns[BACKGROUND_COLUMN] = DEFAULT_ACADEMIC_BACKGROUND
+        records_match = feature_records(texts, columns) == frame.to_dict(orient='records')
+        matrix_match = same_matrix(sparse_input(plan, texts), dataframe_input(pipeline, texts))
+        probs_match = np.array_equal(plan.predict_proba(sparse_input(plan, texts)), pipeline.predict_proba(frame))
+        ok = records_match and matrix_match and probs_match
+        failed |= not ok
+        print(f"{'✅' if ok else '❌'} {kind} ({version}), {len(texts)} resumes: features {records_match}, "
+              f"matrix {matrix_match}, probabilities {probs_match}")
+
+        print(f"   {'batch':>7}{'dataframe ms':>14}{'sparse ms':>11}{'saved':>8}")
+        for batch in (1, 32):
+            sample = texts[:batch]
+            old = p50_ms(lambda t: dataframe_input(pipeline, t), sample, args.repeats)
+            new = p50_ms(lambda t: sparse_input(plan, t), sample, args.repeats)
+            print(f"   {batch:>7}{old:>14.3f}{new:>11.3f}{1 - new / old:>8.0%}")
+    if failed:
+        sys.exit("❌ Sparse inference differs from the DataFrame path")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+"""
+Timing + peak-memory benchmark for train_model.py data preparation: cleaning (load_data) and
+class balancing, old implementation vs current.
+
+UpdatedResumeDataSet.csv is replicated --scale times. With --unique every copy gets a distinct
+token so no two resumes are identical (the current cleaner cleans each distinct text once, so
+plain replication flatters it). Each measurement runs in a fresh interpreter; memory is the
+growth of peak RSS (Linux VmHWM, reset after the input is prepared) during the step.
+
+    python benchmarks/bench_training_prep.py [--scale 100] [--unique]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = r'''
+import json, os, sys, time
+sys.path.insert(0, {root!r})
+os.chdir({root!r})
+from collections import Counter
+import numpy as np
+import pandas as pd
+import features
+import train_model
+
+
+def old_balance_classes(X, y):
+    class_counts = Counter(y)
+    max_count = max(class_counts.values())
+    X_bal, y_bal = [], []
+    for cls, cnt in class_counts.items():
+        idxs = [i for i, lbl in enumerate(y) if lbl == cls]
+        extra = np.random.choice(idxs, size=max_count - cnt, replace=True)
+        all_idx = idxs + list(extra)
+        X_bal.extend(X.iloc[all_idx].to_dict(orient="records"))
+        y_bal.extend([cls] * len(all_idx))
+    return pd.DataFrame(X_bal), pd.Series(y_bal)
+
+
+def peak_mb():
+    with open('/proc/self/status') as f:
+        for line in f:
+            if line.startswith('VmHWM:'):
+                return int(line.split()[1]) / 1024
+
+
+def reset_peak():
+    # Linux: writing 5 to clear_refs resets the peak RSS (VmHWM) to the current RSS
+    with open('/proc/self/clear_refs', 'w') as f:
+        f.write('5')
+
+
+base = pd.read_csv('UpdatedResumeDataSet.csv')
+frames = []
+for copy in range({scale}):
+    frame = base.copy()
+    if {unique}:
+        frame['Resume'] = frame['Resume'] + f" copy{{copy}} " + frame.index.astype(str)
+    frames.append(frame)
+df = pd.concat(frames, ignore_index=True)
+
+if {stage!r} == 'balance':
+    cleaned = features.clean_text_series(df['Resume'])
+    X = pd.DataFrame(0, index=df.index, columns=features.FEATURE_COLUMNS)
+    X.insert(0, features.TEXT_COLUMN, cleaned.values)
+    X[features.BACKGROUND_COLUMN] = features.DEFAULT_ACADEMIC_BACKGROUND
+    y = df['Category']
+    fn = old_balance_classes if {impl!r} == 'old' else train_model.balance_classes
+    args = (X, y)
+else:
+    fn = (lambda s: s.apply(features.clean_text)) if {impl!r} == 'old' else features.clean_text_series
+    args = (df['Resume'],)
+
+np.random.seed(0)
+reset_peak()
+before = peak_mb()
+start = time.perf_counter()
+result = fn(*args)
+seconds = time.perf_counter() - start
+rows = len(result[0]) if isinstance(result, tuple) else len(result)
+print(json.dumps({{'seconds': seconds, 'peak_mb': peak_mb() - before, 'rows_in': len(df), 'rows_out': rows}}))
+'''
+
+
+def measure(stage, impl, scale, unique):
+    code = CHILD.format(root=ROOT, stage=stage, impl=impl, scale=scale, unique=unique)
+    out = subprocess.run([sys.executable, '-c', code], check=True, capture_output=True, text=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--scale', type=int, default=100)
+    parser.add_argument('--unique', action='store_true', help="make every replicated resume distinct")
+    args = parser.parse_args()
+
+    print(f"📊 scale={args.scale}{' (unique texts)' if args.unique else ''}")
+    print(f"   {'stage':<10}{'impl':<6}{'rows in':>10}{'rows out':>10}{'seconds':>10}{'peak +MB':>10}")
+    for stage in ['clean', 'balance']:
+        results = {impl: measure(stage, impl, args.scale, args.unique) for impl in ['old', 'new']}
+        for impl, r in results.items():
+            print(f"   {stage:<10}{impl:<6}{r['rows_in']:>10}{r['rows_out']:>10}{r['seconds']:>10.2f}{r['peak_mb']:>10.1f}")
+        print(f"   -> {results['old']['seconds'] / results['new']['seconds']:.1f}x faster")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+"""
+Load test for /upload_and_predict.
+
+Fires --requests uploads from --concurrency client threads (keep-alive sessions) and reports
+latency percentiles and throughput. Resume PDFs are generated from UpdatedResumeDataSet.csv
+rows unless --pdf is given; by default every upload gets unique bytes so the result cache
+cannot answer it (use --allow-cache to measure cache hits instead).
+
+    gunicorn -c gunicorn.conf.py wsgi:app &
+    python benchmarks/load_test.py --url http://127.0.0.1:5000 --requests 500 --concurrency 16
+"""
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from pdf_fixtures import resume_pdf, make_unique  # noqa: E402
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def percentile(values, q):
+    if not values:
+        return float('nan')
+    values = sorted(values)
+    index = min(len(values) - 1, max(0, int(round(q / 100 * len(values) + 0.5)) - 1))
+    return values[index]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', default='http://127.0.0.1:5000')
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--pages', type=int, default=2)
+    parser.add_argument('--pdf', help='upload this PDF instead of generated ones')
+    parser.add_argument('--allow-cache', action='store_true', help='send identical bytes so repeats hit the cache')
+    parser.add_argument('--timeout', type=float, default=60)
+    args = parser.parse_args()
+
+    if args.pdf:
+        with open(args.pdf, 'rb') as f:
+            samples = [f.read()]
+    else:
+        resumes = pd.read_csv(os.path.join(ROOT, 'UpdatedResumeDataSet.csv'))['Resume']
+        samples = [resume_pdf(text, pages=args.pages) for text in resumes.sample(50, random_state=0)]
+
+    local = threading.local()
+    latencies, statuses = [], Counter()
+    lock = threading.Lock()
+
+    def one(i):
+        session = getattr(local, 'session', None)
+        if session is None:
+            session = local.session = requests.Session()
+        body = samples[i % len(samples)]
+        if not args.allow_cache:
+            body = make_unique(body, f"{time.time_ns()}-{i}")
+        start = time.perf_counter()
+        try:
+            r = session.post(f"{args.url}/upload_and_predict", files={'resume': (f'resume_{i}.pdf', body, 'application/pdf')},
+                             timeout=args.timeout)
+            status = r.status_code
+        except requests.RequestException as e:
+            status = type(e).__name__
+        elapsed = time.perf_counter() - start
+        with lock:
+            statuses[status] += 1
+            if status == 200:
+                latencies.append(elapsed)
+
+    print(f"🚀 {args.requests} requests, concurrency {args.concurrency} -> {args.url}/upload_and_predict")
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        list(pool.map(one, range(args.requests)))
+    wall = time.perf_counter() - start
+
+    ms = [x * 1000 for x in latencies]
+    print(f"   statuses: {dict(statuses)}")
+    print(f"   throughput: {len(latencies) / wall:.1f} req/s ({wall:.2f}s wall)")
+    if ms:
+        print(f"   latency ms: p50 {percentile(ms, 50):.1f}  p95 {percentile(ms, 95):.1f}  "
+              f"p99 {percentile(ms, 99):.1f}  mean {statistics.mean(ms):.1f}  max {max(ms):.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,46 @@
+"""Dependency-free synthetic PDFs (Helvetica text layer) built from resume text, for benchmarks."""
+import textwrap
+
+
+def _escape(line):
+    return line.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+def make_pdf(pages):
+    """Build a PDF whose pages hold the given lists of text lines"""
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    page_ids = []
+    for lines in pages:
+        body = "BT /F1 10 Tf 40 800 Td 12 TL " + " ".join(f"({_escape(line)}) '" for line in lines) + " ET"
+        stream = body.encode('latin-1', 'replace')
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] /Contents %d 0 R "
+            b"/Resources << /Font << /F1 3 0 R >> >> >>" % len(objects)
+        )
+        page_ids.append(len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (b" ".join(b"%d 0 R" % i for i in page_ids), len(page_ids))
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, obj in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + obj + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(out)
+
+
+def resume_pdf(text, pages=1, lines_per_page=60, width=90):
+    """Lay resume text out over `pages` pages, repeating it if it is too short to fill them"""
+    lines = textwrap.wrap(str(text).encode('ascii', 'ignore').decode(), width) or ['']
+    needed = pages * lines_per_page
+    lines = (lines * (needed // len(lines) + 1))[:needed] if pages > 1 else lines[:lines_per_page]
+    return make_pdf([lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)][:pages])
+
+
+def make_unique(pdf_bytes, token):
+    """Append a PDF comment so each upload hashes differently (defeats the result cache)"""
+    return pdf_bytes + b"%% " + str(token).encode() + b"\n"
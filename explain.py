@@ -0,0 +1,144 @@
+"""
+Fast explanations for predictions, from the linear member of the model.
+
+At model load the LogisticRegression member of the VotingClassifier (or the classifier itself, when
+it is linear, e.g. the incremental SGD model) is turned into a weight table over the model input:
+one row per column (TF-IDF term or engineered feature), one column per class. Explaining a
+prediction is then one sparse row-times-table product for the class scores plus a gather of the
+row's non-zeros:
+
+    contribution(column) = model_input[column] * weight[column, predicted class]
+
+These are exact contributions to that member's score, not to the ensemble vote; `member_prediction`
+says whether the member agrees with the ensemble.
+"""
+import os
+
+import numpy as np
+from scipy.sparse import csr_matrix, issparse
+from sklearn.ensemble import VotingClassifier
+from sklearn.feature_extraction import FeatureHasher
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import Pipeline
+
+# Terms / engineered features returned per explanation
+EXPLAIN_TOP_K = int(os.environ.get('EXPLAIN_TOP_K', 10))
+
+
+def _linear_member(classifier):
+    """(name, estimator) of the member whose coefficients explain the model, or None"""
+    if hasattr(classifier, 'coef_'):
+        return type(classifier).__name__, classifier
+    if isinstance(classifier, VotingClassifier):
+        members = list(classifier.named_estimators_.items())
+        for name, estimator in members:
+            if isinstance(estimator, LogisticRegression):
+                return name, estimator
+        for name, estimator in members:
+            if hasattr(estimator, 'coef_'):
+                return name, estimator
+    return None
+
+
+def _column_names(transformer, column_spec, width):
+    if isinstance(transformer, str) or not hasattr(transformer, 'get_feature_names_out'):
+        names = [column_spec] if isinstance(column_spec, str) else list(column_spec)
+    else:
+        try:
+            names = list(transformer.get_feature_names_out(
+                None if isinstance(column_spec, str) else list(column_spec)))
+        except (AttributeError, ValueError, TypeError):
+            names = [] if isinstance(column_spec, str) else list(column_spec)
+    return names if len(names) == width else [f"{column_spec}_{i}" for i in range(width)]
+
+
+class Explainer:
+    def __init__(self, pipeline):
+        preprocessor, classifier = pipeline.steps[0][1], pipeline.steps[-1][1]
+        self.member, estimator = _linear_member(classifier)
+        self.classes_ = pipeline.classes_
+        coef = np.asarray(estimator.coef_, dtype=np.float64)
+        intercept = np.asarray(estimator.intercept_, dtype=np.float64)
+        if coef.shape[0] == 1 and len(self.classes_) == 2:
+            coef, intercept = np.vstack([-coef, coef]), np.concatenate([-intercept, intercept])
+        if coef.shape[0] != len(self.classes_):
+            raise ValueError(f"{self.member} has {coef.shape[0]} coefficient rows for {len(self.classes_)} classes")
+        # (n_columns, n_classes): X @ weights + intercept are the member's class scores
+        self.weights = np.ascontiguousarray(coef.T)
+        self.intercept = intercept
+
+        width = coef.shape[1]
+        self.names = np.empty(width, dtype=object)
+        self.is_term = np.zeros(width, dtype=bool)
+        self.hashing = None
+        for name, transformer, column_spec in preprocessor.transformers_:
+            block = preprocessor.output_indices_[name]
+            if block.stop == block.start:
+                continue
+            if isinstance(transformer, (TfidfVectorizer, HashingVectorizer)):
+                self.is_term[block] = True
+                if isinstance(transformer, HashingVectorizer):
+                    # No vocabulary: hashed columns are named from the resume's own tokens when explained
+                    self.hashing = (block.start, transformer.build_analyzer(),
+                                    FeatureHasher(transformer.n_features, input_type='string', alternate_sign=False))
+                else:
+                    self.names[block] = transformer.get_feature_names_out()
+            else:
+                self.names[block] = _column_names(transformer, column_spec, block.stop - block.start)
+
+    def _hashed_terms(self, cleaned_text, columns):
+        offset, analyzer, hasher = self.hashing
+        tokens = sorted(set(analyzer(cleaned_text)))
+        if not tokens:
+            return {}
+        hashed = hasher.transform([[token] for token in tokens]).indices + offset
+        wanted = set(columns.tolist())
+        return {column: token for column, token in zip(hashed.tolist(), tokens) if column in wanted}
+
+    def explain(self, X, class_indices, cleaned_texts=None, top_k=EXPLAIN_TOP_K):
+        """One explanation per row of the model input X, for the class given per row (the prediction)"""
+        X = X.tocsr() if issparse(X) else csr_matrix(X)
+        scores = np.asarray(X @ self.weights) + self.intercept
+        explanations = []
+        for row, c in enumerate(class_indices):
+            start, end = X.indptr[row], X.indptr[row + 1]
+            columns = X.indices[start:end]
+            contributions = X.data[start:end] * self.weights[columns, c]
+            terms = self.is_term[columns]
+
+            term_columns, term_values = columns[terms], contributions[terms]
+            top = np.argsort(-term_values, kind='stable')[:top_k]
+            top = top[term_values[top] > 0]
+            names = self.names
+            if self.hashing is not None and cleaned_texts is not None:
+                resolved = self._hashed_terms(cleaned_texts[row], term_columns[top])
+                term_names = [resolved.get(col, f"hash_{col - self.hashing[0]}") for col in term_columns[top].tolist()]
+            else:
+                term_names = names[term_columns[top]].tolist()
+
+            feature_columns, feature_values = columns[~terms], contributions[~terms]
+            top_features = np.argsort(-np.abs(feature_values), kind='stable')[:top_k]
+            explanations.append({
+                'member': self.member,
+                'member_prediction': self.classes_[int(np.argmax(scores[row]))],
+                'class': self.classes_[c],
+                'intercept': round(float(self.intercept[c]), 4),
+                'top_terms': [{'term': name, 'contribution': round(float(value), 4)}
+                              for name, value in zip(term_names, term_values[top].tolist())],
+                'top_features': [{'feature': name, 'contribution': round(float(value), 4)}
+                                 for name, value in zip(names[feature_columns[top_features]].tolist(),
+                                                        feature_values[top_features].tolist())]
+            })
+        return explanations
+
+
+def build_explainer(model):
+    """Explainer for a fitted Pipeline(ColumnTransformer, classifier), or None if it has no linear member"""
+    try:
+        if not isinstance(model, Pipeline) or _linear_member(model.steps[-1][1]) is None:
+            raise ValueError("no linear classifier to read coefficients from")
+        return Explainer(model)
+    except (AttributeError, ValueError) as e:
+        print(f"⚠️ Explanations unavailable ({e})")
+        return None
@@ -0,0 +1,191 @@
+"""
+On-disk feature store for training: cleaned text and engineered features per resume, so a retrain
+only cleans and scans the rows it has not seen before.
+
+Rows are keyed by a hash of the raw resume text. The store directory is keyed by the feature-code
+version (FEATURE_SCHEMA_VERSION plus a digest of features.py / keyword_matcher.py), so any change to
+cleaning or feature code starts a fresh store instead of reusing stale features; opening a store
+deletes the directories of all but the FEATURE_STORE_KEEP_VERSIONS most recently used code versions.
+Every run that finds new rows appends one segment:
+
+    feature_store/<code version>/seg-<id>/keys.npy       (n,) S16 row keys
+                                          features.npy   (n, len(FEATURE_COLUMNS)) int64
+                                          text.npy       uint8, cleaned texts back to back (UTF-8)
+                                          offsets.npy    (n + 1,) int64 offsets into text.npy
+
+Arrays are loaded with mmap_mode='r'. Segments are written under a temporary name and renamed into
+place, so a crashed run never leaves a partial segment. Fitted TF-IDF matrices are cached next to
+the segments by the training pipeline's joblib memory (pipeline_cache_dir).
+"""
+import hashlib
+import os
+import re
+import shutil
+import time
+
+import numpy as np
+import pandas as pd
+from joblib import Memory
+
+import features
+import keyword_matcher
+from features import (
+    FEATURE_SCHEMA_VERSION, FEATURE_COLUMNS, TEXT_COLUMN, BACKGROUND_COLUMN, DEFAULT_ACADEMIC_BACKGROUND,
+    clean_text_series, feature_arrays
+)
+
+FEATURE_STORE_DIR = os.environ.get('FEATURE_STORE_DIR', 'feature_store')
+# Segments are merged into one once there are more than this many
+FEATURE_STORE_MAX_SEGMENTS = int(os.environ.get('FEATURE_STORE_MAX_SEGMENTS', 16))
+# Fitted preprocessors (TF-IDF matrices) kept in the pipeline cache, most recently used first
+FEATURE_STORE_PIPELINE_CACHE_ITEMS = int(os.environ.get('FEATURE_STORE_PIPELINE_CACHE_ITEMS', 8))
+# Code-version directories kept under the store root: the current one and the one before it, so switching
+# back to the previous release (or a run still on it) does not recompute every row
+FEATURE_STORE_KEEP_VERSIONS = int(os.environ.get('FEATURE_STORE_KEEP_VERSIONS', 2))
+KEY_BYTES = 16
+VERSION_DIR_RE = re.compile(r'^v.+-[0-9a-f]{12}$')
+
+
+def feature_code_version():
+    digest = hashlib.sha256()
+    for module in (features, keyword_matcher):
+        with open(module.__file__, 'rb') as f:
+            digest.update(f.read())
+    return f"v{FEATURE_SCHEMA_VERSION}-{digest.hexdigest()[:12]}"
+
+
+def row_keys(raw_texts):
+    """(n,) S16 content hashes of raw resume texts; missing values hash like "" (both clean to "")"""
+    codes, uniques = pd.factorize(pd.Series(raw_texts, dtype=object))
+    distinct = np.array([hashlib.sha256(str(text).encode()).digest()[:KEY_BYTES] for text in uniques] +
+                        [hashlib.sha256(b"").digest()[:KEY_BYTES]], dtype=f'S{KEY_BYTES}')
+    return distinct[codes]  # code -1 (missing) -> the "" key
+
+
+class _Segment:
+    def __init__(self, path):
+        self.path = path
+        self.keys = np.load(os.path.join(path, 'keys.npy'), mmap_mode='r')
+        self.features = np.load(os.path.join(path, 'features.npy'), mmap_mode='r')
+        self.text = np.load(os.path.join(path, 'text.npy'), mmap_mode='r')
+        self.offsets = np.load(os.path.join(path, 'offsets.npy'), mmap_mode='r')
+
+    def texts(self, rows):
+        offsets = self.offsets
+        return [bytes(self.text[offsets[row]:offsets[row + 1]]).decode('utf-8') for row in rows]
+
+
+def _write_segment(directory, keys, cleaned, feature_matrix):
+    encoded = [text.encode('utf-8') for text in cleaned]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(b) for b in encoded], out=offsets[1:])
+    name = f"seg-{time.time_ns()}-{os.getpid()}"
+    tmp = os.path.join(directory, f".{name}.tmp")
+    os.makedirs(tmp)
+    np.save(os.path.join(tmp, 'keys.npy'), np.asarray(keys, dtype=f'S{KEY_BYTES}'))
+    np.save(os.path.join(tmp, 'features.npy'), np.ascontiguousarray(feature_matrix, dtype=np.int64))
+    np.save(os.path.join(tmp, 'text.npy'), np.frombuffer(b"".join(encoded), dtype=np.uint8))
+    np.save(os.path.join(tmp, 'offsets.npy'), offsets)
+    os.rename(tmp, os.path.join(directory, name))
+    return os.path.join(directory, name)
+
+
+class FeatureStore:
+    def __init__(self, root=FEATURE_STORE_DIR, max_segments=FEATURE_STORE_MAX_SEGMENTS,
+                 keep_versions=FEATURE_STORE_KEEP_VERSIONS):
+        self.root = root
+        self.version = feature_code_version()
+        self.directory = os.path.join(root, self.version)
+        self.max_segments = max_segments
+        os.makedirs(self.directory, exist_ok=True)
+        os.utime(self.directory)  # mtime = last use, for prune_versions
+        self.last_stats = {}
+        self.prune_versions(keep_versions)
+
+    def prune_versions(self, keep=FEATURE_STORE_KEEP_VERSIONS):
+        """Delete the directories of other code versions beyond the keep most recently used (this one included)"""
+        versions = [
+            os.path.join(self.root, name) for name in os.listdir(self.root)
+            if VERSION_DIR_RE.match(name) and os.path.isdir(os.path.join(self.root, name))
+        ]
+        versions.sort(key=os.path.getmtime, reverse=True)
+        removed = [path for path in versions[max(keep, 1):] if path != self.directory]
+        for path in removed:
+            shutil.rmtree(path, ignore_errors=True)
+        return [os.path.basename(path) for path in removed]
+
+    @property
+    def pipeline_cache_dir(self):
+        """joblib memory for Pipeline(memory=...): fitted preprocessor + TF-IDF matrix per training set"""
+        return os.path.join(self.directory, 'pipeline_cache')
+
+    def trim_pipeline_cache(self, items_limit=FEATURE_STORE_PIPELINE_CACHE_ITEMS):
+        Memory(self.pipeline_cache_dir, verbose=0).reduce_size(items_limit=items_limit)
+
+    def _segments(self):
+        names = sorted(name for name in os.listdir(self.directory) if name.startswith('seg-'))
+        return [_Segment(os.path.join(self.directory, name)) for name in names]
+
+    def _locate(self, segments):
+        """{key: (segment number, row)}; a key stored twice (concurrent runs) resolves to its last copy"""
+        location = {}
+        for s, segment in enumerate(segments):
+            location.update({key: (s, row) for row, key in enumerate(segment.keys.tolist())})
+        return location
+
+    def lookup(self, raw_texts):
+        """(cleaned texts as an object array, (n, len(FEATURE_COLUMNS)) int64 features) for raw resumes;
+        rows missing from the store are cleaned, extracted and appended first"""
+        keys = row_keys(raw_texts)
+        segments = self._segments()
+        location = self._locate(segments)
+        missing_keys, missing_at = np.unique(keys, return_index=True)
+        new = np.array([key not in location for key in missing_keys.tolist()], dtype=bool)
+        missing_at = np.sort(missing_at[new])
+        if len(missing_at):
+            raw = pd.Series(raw_texts, dtype=object).iloc[missing_at].reset_index(drop=True)
+            cleaned = clean_text_series(raw).tolist()
+            columns = feature_arrays(cleaned)
+            matrix = np.column_stack([columns[col] for col in FEATURE_COLUMNS])
+            _write_segment(self.directory, keys[missing_at], cleaned, matrix)
+            segments = self._compact(self._segments())
+            location = self._locate(segments)
+        self.last_stats = {'rows': len(keys), 'computed': int(len(missing_at)), 'segments': len(segments)}
+
+        where = np.array([location[key] for key in keys.tolist()], dtype=np.int64).reshape(-1, 2)
+        cleaned = np.empty(len(keys), dtype=object)
+        feature_matrix = np.empty((len(keys), len(FEATURE_COLUMNS)), dtype=np.int64)
+        for s, segment in enumerate(segments):
+            positions = np.flatnonzero(where[:, 0] == s)
+            if len(positions):
+                rows = where[positions, 1]
+                feature_matrix[positions] = segment.features[rows]
+                cleaned[positions] = segment.texts(rows)
+        return cleaned, feature_matrix
+
+    def model_input(self, raw_texts, academic_background=DEFAULT_ACADEMIC_BACKGROUND):
+        """Same frame as build_model_input(clean_text_series(raw_texts)), served from the store"""
+        index = raw_texts.index if isinstance(raw_texts, pd.Series) else None
+        cleaned, feature_matrix = self.lookup(raw_texts)
+        frame = pd.DataFrame({col: feature_matrix[:, j] for j, col in enumerate(FEATURE_COLUMNS)}, index=index)
+        frame.insert(0, TEXT_COLUMN, cleaned)
+        frame[BACKGROUND_COLUMN] = academic_background
+        return frame
+
+    def _compact(self, segments):
+        if len(segments) <= self.max_segments:
+            return segments
+        location = self._locate(segments)
+        keys = np.array(list(location), dtype=f'S{KEY_BYTES}')
+        where = np.array(list(location.values()), dtype=np.int64).reshape(-1, 2)
+        cleaned, parts, part_keys = [], [], []
+        for s, segment in enumerate(segments):
+            positions = np.flatnonzero(where[:, 0] == s)
+            rows = where[positions, 1]
+            cleaned.extend(segment.texts(rows))
+            parts.append(np.asarray(segment.features[rows]))
+            part_keys.append(keys[positions])
+        _write_segment(self.directory, np.concatenate(part_keys), cleaned, np.concatenate(parts))
+        for segment in segments:
+            shutil.rmtree(segment.path, ignore_errors=True)
+        return self._segments()
@@ -0,0 +1,267 @@
+import re
+import time
+import numpy as np
+import pandas as pd
+from keyword_matcher import KeywordMatcher, WordPatternMatcher
+
+# Bump whenever cleaning, keyword lists or feature semantics change. The version is saved in
+# advanced_model.pkl by train_model.py and checked by app.py when the model is loaded.
+FEATURE_SCHEMA_VERSION = 2
+
+TEXT_COLUMN = 'resume_text'
+BACKGROUND_COLUMN = 'academic_background'
+DEFAULT_ACADEMIC_BACKGROUND = "Computer Science"
+
+
+# ---------------------------
+# Text Cleaning
+# ---------------------------
+EMAIL_RE = re.compile(r'\S+@\S+')
+URL_RE = re.compile(r'http\S+|www.\S+')
+SYMBOL_RE = re.compile(r'[^a-z\s]')
+# After the symbol pass only letters and whitespace remain, so one substitution of every non-letter
+# run plus strip() equals " ".join(text.split()) without building per-row word lists
+NON_LETTER_RUN_RE = re.compile(r'[^a-z]+')
+CLEAN_CHUNK_ROWS = 2000
+
+
+def clean_text(text):
+    if pd.isna(text):
+        return ""
+    text = str(text).lower()
+    text = EMAIL_RE.sub(' ', text)  # emails
+    text = URL_RE.sub(' ', text)  # urls
+    text = SYMBOL_RE.sub(' ', text)  # symbols/numbers
+    return " ".join(text.split())
+
+
+def _clean_distinct(texts):
+    s = pd.Series(texts, dtype=object).astype(str).str.lower()
+    has_email = s.str.contains('@', regex=False)
+    s[has_email] = s[has_email].str.replace(EMAIL_RE, ' ', regex=True)
+    has_url = s.str.contains('http', regex=False) | s.str.contains('www', regex=False)
+    s[has_url] = s[has_url].str.replace(URL_RE, ' ', regex=True)
+    return s.str.replace(NON_LETTER_RUN_RE, ' ', regex=True).str.strip().to_numpy(dtype=object)
+
+
+def clean_text_series(texts, chunk_size=CLEAN_CHUNK_ROWS):
+    """clean_text over a whole Series with Series.str operations (identical output)
+
+    Each distinct text is cleaned once, in chunks so the intermediate copies stay bounded, and the
+    email / url passes only run on the rows that contain '@' / 'http' / 'www'. Object dtype keeps
+    Python `re` semantics (Unicode whitespace).
+    """
+    texts = texts if isinstance(texts, pd.Series) else pd.Series(texts)
+    codes, uniques = pd.factorize(texts.astype(object))
+    chunks = [_clean_distinct(uniques[i:i + chunk_size]) for i in range(0, len(uniques), chunk_size)]
+    cleaned = np.concatenate(chunks + [np.array([""], dtype=object)])  # code -1 (missing) -> ""
+    return pd.Series(cleaned[codes], index=texts.index, dtype=object)
+
+
+# ---------------------------
+# Keyword lists
+# ---------------------------
+ORIGINAL_SKILLS = [
+    'python', 'java', 'c++', 'sql', 'machine learning', 'deep learning',
+    'nlp', 'html', 'css', 'javascript', 'react', 'django', 'flask'
+]
+EDUCATION_PATTERNS = {
+    'btech': r'b\.?tech',
+    'mtech': r'm\.?tech',
+    'phd': r'ph\.?d',
+    'mba': r'mba',
+    'bsc': r'b\.?sc',
+    'msc': r'm\.?sc'
+}
+EXP_PATTERNS = [re.compile(p) for p in [
+    r'(\d+)\s*(?:years?|yrs?)\s*(?:of\s*)?(?:experience|exp)',
+    r'(\d+)\s*(?:\+|plus)\s*(?:years?|yrs?)',
+    r'over\s+(\d+)\s*(?:years?|yrs?)',
+    r'since\s+(\d{4})'
+]]
+EXPERIENCE_REFERENCE_YEAR = 2025  # fixed so "since 2019" maps to the same value at train and serve time
+PROJECT_KEYWORDS = [
+    'project', 'developed', 'built', 'implemented', 'designed',
+    'created', 'contributed', 'engineered'
+]
+INTERNSHIP_KEYWORDS = [
+    'internship', 'intern', 'trainee', 'apprentice', 'fellowship'
+]
+CATEGORY_KEYWORDS = {
+    "Data Science": ['tensorflow', 'pytorch', 'pandas', 'numpy', 'scikit-learn', 'matplotlib', 'seaborn', 'jupyter'],
+    "Web Development": ['nodejs', 'angular', 'vue', 'bootstrap', 'express', 'typescript'],
+    "DevOps Engineer": ['docker', 'kubernetes', 'jenkins', 'terraform', 'ansible', 'aws', 'azure', 'gcp', 'ci/cd'],
+    "Automation Testing": ['selenium', 'pytest', 'junit', 'testng', 'cypress', 'automation framework'],
+    "Blockchain": ['blockchain', 'ethereum', 'solidity', 'smart contract', 'web3'],
+    "Mobile App Development": ['android', 'ios', 'flutter', 'react native', 'swift', 'kotlin'],
+    "Java Developer": ['spring boot', 'hibernate', 'jsp', 'servlets']
+}
+# 🚀 Category keyword counts are boosted ×5
+CATEGORY_KEYWORD_BOOST = 5
+
+# Every keyword list is compiled into one matcher, so a resume is scanned once instead of once per keyword
+KEYWORD_MATCHER = KeywordMatcher(
+    ORIGINAL_SKILLS + PROJECT_KEYWORDS + INTERNSHIP_KEYWORDS +
+    [kw for keywords in CATEGORY_KEYWORDS.values() for kw in keywords]
+)
+EDUCATION_MATCHER = WordPatternMatcher(EDUCATION_PATTERNS)
+DIGIT_RE = re.compile(r'\d')
+
+
+# ---------------------------
+# Schema
+# ---------------------------
+def _category_column(category):
+    return f"{category.lower().replace(' ', '_')}_keywords"
+
+
+SKILL_COLUMNS = [f"skill_{skill}" for skill in ORIGINAL_SKILLS]
+EDUCATION_COLUMNS = [f"has_{degree}" for degree in EDUCATION_PATTERNS]
+CATEGORY_COLUMNS = [_category_column(category) for category in CATEGORY_KEYWORDS]
+NUMERIC_COLUMNS = ['word_count', 'unique_words', 'years_experience']
+FEATURE_COLUMNS = (
+    ['word_count', 'unique_words'] + SKILL_COLUMNS + EDUCATION_COLUMNS +
+    ['years_experience', 'project_mentioned', 'internship_mentioned'] + CATEGORY_COLUMNS
+)
+# Column order of the frame the pipeline is fitted on
+INPUT_COLUMNS = [TEXT_COLUMN] + FEATURE_COLUMNS + [BACKGROUND_COLUMN]
+
+
+# ---------------------------
+# Feature Engineering
+# ---------------------------
+def _years_experience(text):
+    years = []
+    if DIGIT_RE.search(text):  # every pattern needs a digit; cleaned text has none
+        for p in EXP_PATTERNS:
+            for match in p.findall(text):
+                if isinstance(match, tuple):
+                    match = match[0]
+                if match.isdigit():
+                    if len(match) == 4:  # year
+                        years.append(EXPERIENCE_REFERENCE_YEAR - int(match))
+                    else:
+                        years.append(int(match))
+    return max(years) if years else 0
+
+
+def _scan(text):
+    words = text.split()
+    unique_words = set(words)
+    found = KEYWORD_MATCHER.find(text, unique_words)
+    return len(words), len(unique_words), found, EDUCATION_MATCHER.find(text), _years_experience(text)
+
+
+def _category_hits(found):
+    hits = {}
+    for category, keywords in CATEGORY_KEYWORDS.items():
+        matched = [kw for kw in keywords if kw in found]
+        if matched:
+            hits[category] = matched
+    return hits
+
+
+def extract_features(text):
+    """Feature dict for one cleaned resume, plus the category keywords it matched (for the API response)"""
+    word_count, unique_count, found, degrees, years = _scan(text)
+    features = {'word_count': word_count, 'unique_words': unique_count}
+    for skill, col in zip(ORIGINAL_SKILLS, SKILL_COLUMNS):
+        features[col] = 1 if skill in found else 0
+    for degree, col in zip(EDUCATION_PATTERNS, EDUCATION_COLUMNS):
+        features[col] = 1 if degree in degrees else 0
+    features['years_experience'] = years
+    features['project_mentioned'] = int(any(kw in found for kw in PROJECT_KEYWORDS))
+    features['internship_mentioned'] = int(any(kw in found for kw in INTERNSHIP_KEYWORDS))
+
+    detected_category_keywords = _category_hits(found)
+    for category, col in zip(CATEGORY_KEYWORDS, CATEGORY_COLUMNS):
+        features[col] = len(detected_category_keywords.get(category, [])) * CATEGORY_KEYWORD_BOOST
+
+    # Attach detected category keywords for debugging/response
+    features['detected_category_keywords'] = detected_category_keywords
+    return features
+
+
+def feature_arrays(texts, return_keyword_hits=False):
+    """{column: int64 array} in FEATURE_COLUMNS order for a list of cleaned resumes (no DataFrame)"""
+    scans = [_scan(text) for text in texts]
+    n = len(scans)
+    found_sets = [scan[2] for scan in scans]
+    degree_sets = [scan[3] for scan in scans]
+
+    def flag(keywords, sets):
+        return np.fromiter((any(kw in s for kw in keywords) for s in sets), dtype=np.int64, count=n)
+
+    columns = {
+        'word_count': np.fromiter((scan[0] for scan in scans), dtype=np.int64, count=n),
+        'unique_words': np.fromiter((scan[1] for scan in scans), dtype=np.int64, count=n),
+    }
+    for skill, col in zip(ORIGINAL_SKILLS, SKILL_COLUMNS):
+        columns[col] = flag([skill], found_sets)
+    for degree, col in zip(EDUCATION_PATTERNS, EDUCATION_COLUMNS):
+        columns[col] = flag([degree], degree_sets)
+    columns['years_experience'] = np.fromiter((scan[4] for scan in scans), dtype=np.int64, count=n)
+    columns['project_mentioned'] = flag(PROJECT_KEYWORDS, found_sets)
+    columns['internship_mentioned'] = flag(INTERNSHIP_KEYWORDS, found_sets)
+    for category, col in zip(CATEGORY_KEYWORDS, CATEGORY_COLUMNS):
+        keywords = CATEGORY_KEYWORDS[category]
+        counts = np.fromiter((sum(kw in s for kw in keywords) for s in found_sets), dtype=np.int64, count=n)
+        columns[col] = counts * CATEGORY_KEYWORD_BOOST
+
+    if return_keyword_hits:
+        return columns, [_category_hits(found) for found in found_sets]
+    return columns
+
+
+def feature_records(cleaned_texts, columns, academic_background=DEFAULT_ACADEMIC_BACKGROUND):
+    """Per-resume dicts keyed in INPUT_COLUMNS order, equal to build_model_input(...).to_dict('records')"""
+    values = {col: columns[col].tolist() for col in FEATURE_COLUMNS}
+    return [
+        {TEXT_COLUMN: text, **{col: values[col][i] for col in FEATURE_COLUMNS}, BACKGROUND_COLUMN: academic_background}
+        for i, text in enumerate(cleaned_texts)
+    ]
+
+
+def column_default(column):
+    """Fill value for an input column a model expects but the current schema does not produce"""
+    if column == TEXT_COLUMN:
+        return ""
+    if column == BACKGROUND_COLUMN:
+        return DEFAULT_ACADEMIC_BACKGROUND
+    return 0
+
+
+def extract_features_batch(texts, return_keyword_hits=False, timings=None):
+    """Feature DataFrame (FEATURE_COLUMNS) for a Series/list of cleaned resumes, built column by column
+
+    When a `timings` dict is given, the seconds spent scanning the texts ('extract_features') and
+    assembling the frame ('dataframe_build') are added to it.
+    """
+    start = time.perf_counter()
+    index = texts.index if isinstance(texts, pd.Series) else None
+    result = feature_arrays(texts, return_keyword_hits=return_keyword_hits)
+    columns = result[0] if return_keyword_hits else result
+    scanned = time.perf_counter()
+    frame = pd.DataFrame(columns, index=index)
+    if timings is not None:
+        timings['extract_features'] = timings.get('extract_features', 0) + scanned - start
+        timings['dataframe_build'] = timings.get('dataframe_build', 0) + time.perf_counter() - scanned
+    if return_keyword_hits:
+        return frame, result[1]
+    return frame
+
+
+def build_model_input(cleaned_texts, academic_background=DEFAULT_ACADEMIC_BACKGROUND, return_keyword_hits=False,
+                      timings=None):
+    """Frame with INPUT_COLUMNS, ready for the pipeline's ColumnTransformer"""
+    cleaned_texts = pd.Series(cleaned_texts) if not isinstance(cleaned_texts, pd.Series) else cleaned_texts
+    result = extract_features_batch(cleaned_texts, return_keyword_hits=return_keyword_hits, timings=timings)
+    frame = result[0] if return_keyword_hits else result
+    start = time.perf_counter()
+    frame.insert(0, TEXT_COLUMN, cleaned_texts.values)
+    frame[BACKGROUND_COLUMN] = academic_background
+    if timings is not None:
+        timings['dataframe_build'] += time.perf_counter() - start
+    if return_keyword_hits:
+        return frame, result[1]
+    return frame
@@ -0,0 +1,58 @@
+import gc
+import multiprocessing
+import os
+import shutil
+import tempfile
+
+from admission import ADMISSION_MAX_IN_FLIGHT, ADMISSION_QUEUE_SIZE
+
+bind = os.environ.get('BIND', '0.0.0.0:5000')
+workers = int(os.environ.get('WEB_WORKERS', multiprocessing.cpu_count()))
+# Enough threads for every admitted and queued upload plus light requests (health, metrics), so excess
+# uploads reach the app and are shed at once with 503 instead of waiting unseen in the listen backlog
+threads = int(os.environ.get('WEB_THREADS', ADMISSION_MAX_IN_FLIGHT + ADMISSION_QUEUE_SIZE + 4))
+worker_class = 'gthread'
+timeout = int(os.environ.get('WEB_TIMEOUT', 120))
+# Recycle workers now and then so slow leaks in PDF parsing cannot accumulate
+max_requests = int(os.environ.get('WEB_MAX_REQUESTS', 2000))
+max_requests_jitter = 200
+
+# Import wsgi.py (and load the model) in the master, then fork
+preload_app = True
+accesslog = '-'
+
+# Every worker writes its metric snapshot here so /metrics on any worker reports all of them
+# (set before the app is imported, metrics.py reads it at import time)
+os.environ.setdefault('METRICS_DIR', os.path.join(tempfile.gettempdir(), f"resume-api-metrics-{os.getpid()}"))
+
+
+def on_starting(server):
+    # Counters restart with the server: drop snapshots left by a previous run
+    shutil.rmtree(os.environ['METRICS_DIR'], ignore_errors=True)
+    os.makedirs(os.environ['METRICS_DIR'], exist_ok=True)
+
+
+def when_ready(server):
+    # Move the preloaded model out of the GC's reach so collections in the workers do not
+    # touch (and copy-on-write duplicate) its pages
+    gc.freeze()
+    server.log.info("Model preloaded; forking %s workers x %s threads", workers, threads)
+
+
+def post_worker_init(worker):
+    # Background job / registry watcher threads must be started after the fork, in each worker
+    from app import job_queue, start_model_watcher
+    job_queue.start()
+    start_model_watcher()
+
+
+def worker_exit(server, worker):
+    # Last snapshot of this worker's counters (flushes are rate limited)
+    from metrics import registry
+    registry.flush(force=True)
+
+
+def child_exit(server, worker):
+    # Fold the exited worker's counters into the retired totals and drop its snapshot file
+    from metrics import retire_worker
+    retire_worker(worker.pid)
@@ -0,0 +1,236 @@
+import json
+import os
+import shutil
+import sqlite3
+import threading
+import time
+import urllib.request
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+JOBS_DB = os.environ.get('JOBS_DB', 'jobs.sqlite3')
+JOBS_DIR = os.environ.get('JOBS_DIR', 'job_uploads')
+JOB_WORKERS = int(os.environ.get('JOB_WORKERS', 2))
+# A 'running' job whose worker has not heartbeated for this long is assumed dead and requeued
+JOB_LEASE_SECONDS = int(os.environ.get('JOB_LEASE_SECONDS', 600))
+# A job whose lease has expired this many times (it keeps killing its worker) is failed, not requeued
+JOB_MAX_ATTEMPTS = int(os.environ.get('JOB_MAX_ATTEMPTS', 3))
+JOB_POLL_SECONDS = float(os.environ.get('JOB_POLL_SECONDS', 2))
+JOB_RETENTION_SECONDS = int(os.environ.get('JOB_RETENTION_SECONDS', 7 * 24 * 3600))
+# Completion webhooks may only point at these hosts
+JOB_WEBHOOK_HOSTS = set(os.environ.get('JOB_WEBHOOK_HOSTS', 'localhost,127.0.0.1,::1').split(','))
+
+
+# ---------------------------
+# SQLite-backed job queue
+# ---------------------------
+class JobQueue:
+    """Durable background queue: uploads are spooled to disk, state lives in SQLite
+
+    Every process that serves the app runs a dispatcher thread plus a small worker pool. Jobs are
+    claimed with an atomic UPDATE, so several preforked workers can share one database, and jobs
+    left 'running' by a worker that died are requeued once their lease expires, up to max_attempts
+    runs in total.
+    """
+
+    def __init__(self, handler, db_path=JOBS_DB, spool_dir=JOBS_DIR, workers=JOB_WORKERS,
+                 max_attempts=JOB_MAX_ATTEMPTS):
+        self.handler = handler  # handler(list of (filename, data, error)) -> JSON-serialisable result
+        self.db_path = db_path
+        self.spool_dir = spool_dir
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self._local = threading.local()
+        self._started_pid = None
+        self._start_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._slots = None
+        self._pool = None
+
+    # --- storage ---
+    def _db(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                "id TEXT PRIMARY KEY, status TEXT NOT NULL, created_at REAL NOT NULL, started_at REAL, "
+                "finished_at REAL, heartbeat_at REAL, attempts INTEGER NOT NULL DEFAULT 0, "
+                "files TEXT NOT NULL, webhook TEXT, result TEXT, error TEXT)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created_at)")
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    def submit(self, items, webhook=None):
+        """Spool (filename, data, error) items and queue them as one job; returns the job id"""
+        if webhook and urlparse(webhook).hostname not in JOB_WEBHOOK_HOSTS:
+            raise ValueError(f"webhook host must be one of {sorted(JOB_WEBHOOK_HOSTS)}")
+        job_id = uuid.uuid4().hex
+        job_dir = os.path.join(self.spool_dir, job_id)
+        os.makedirs(job_dir, exist_ok=True)
+        manifest = []
+        for index, (filename, data, error) in enumerate(items):
+            entry = {'filename': filename, 'error': error}
+            if not error:
+                entry['path'] = os.path.join(job_dir, f"{index}.pdf")
+                with open(entry['path'], 'wb') as f:
+                    f.write(data)
+            manifest.append(entry)
+        self._db().execute(
+            "INSERT INTO jobs (id, status, created_at, files, webhook) VALUES (?, 'queued', ?, ?, ?)",
+            (job_id, time.time(), json.dumps(manifest), webhook)
+        )
+        self.start()
+        self._wakeup.set()
+        return job_id
+
+    def get(self, job_id):
+        row = self._db().execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = {
+            'job_id': row['id'],
+            'status': row['status'],
+            'created_at': row['created_at'],
+            'started_at': row['started_at'],
+            'finished_at': row['finished_at'],
+            'attempts': row['attempts'],
+            'file_count': len(json.loads(row['files']))
+        }
+        if row['result'] is not None:
+            job['result'] = json.loads(row['result'])
+        if row['error'] is not None:
+            job['error'] = row['error']
+        return job
+
+    def counts(self):
+        rows = self._db().execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        return {status: count for status, count in rows}
+
+    # --- workers ---
+    def start(self):
+        """Start this process's dispatcher (idempotent; restarts after a fork)"""
+        with self._start_lock:
+            if self._started_pid == os.getpid():
+                return
+            self._started_pid = os.getpid()
+            self._slots = threading.Semaphore(self.workers)
+            self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='jobs')
+            threading.Thread(target=self._dispatch_loop, name='jobs-dispatcher', daemon=True).start()
+
+    def _dispatch_loop(self):
+        last_purge = 0
+        while True:
+            try:
+                self._requeue_stale()
+                if time.time() - last_purge > 3600:
+                    self._purge_finished()
+                    last_purge = time.time()
+                while self._slots.acquire(blocking=False):
+                    job_id = self._claim_next()
+                    if job_id is None:
+                        self._slots.release()
+                        break
+                    self._pool.submit(self._run, job_id)
+            except Exception as e:
+                print(f"⚠️ Job dispatcher error: {e}")
+            self._wakeup.wait(JOB_POLL_SECONDS)
+            self._wakeup.clear()
+
+    def _claim_next(self):
+        db = self._db()
+        while True:
+            row = db.execute("SELECT id FROM jobs WHERE status = 'queued' ORDER BY created_at LIMIT 1").fetchone()
+            if row is None:
+                return None
+            now = time.time()
+            claimed = db.execute(
+                "UPDATE jobs SET status = 'running', started_at = ?, heartbeat_at = ?, attempts = attempts + 1 "
+                "WHERE id = ? AND status = 'queued'", (now, now, row['id'])
+            ).rowcount
+            if claimed:
+                return row['id']
+
+    def _requeue_stale(self):
+        db = self._db()
+        now = time.time()
+        expired = now - JOB_LEASE_SECONDS
+        failed = db.execute(
+            "SELECT id FROM jobs WHERE status = 'running' AND heartbeat_at < ? AND attempts >= ?",
+            (expired, self.max_attempts)
+        ).fetchall()
+        for row in failed:
+            if db.execute(
+                "UPDATE jobs SET status = 'failed', finished_at = ?, error = 'exceeded max attempts' "
+                "WHERE id = ? AND status = 'running' AND heartbeat_at < ?", (now, row['id'], expired)
+            ).rowcount:
+                shutil.rmtree(os.path.join(self.spool_dir, row['id']), ignore_errors=True)
+                print(f"❌ Job {row['id']} failed after {self.max_attempts} attempts")
+        db.execute(
+            "UPDATE jobs SET status = 'queued' WHERE status = 'running' AND heartbeat_at < ? AND attempts < ?",
+            (expired, self.max_attempts)
+        )
+
+    def _purge_finished(self):
+        db = self._db()
+        cutoff = time.time() - JOB_RETENTION_SECONDS
+        db.execute("DELETE FROM jobs WHERE status IN ('done', 'failed') AND finished_at < ?", (cutoff,))
+
+    def _heartbeat(self, job_id, stop):
+        while not stop.wait(JOB_LEASE_SECONDS / 4):
+            self._db().execute(
+                "UPDATE jobs SET heartbeat_at = ? WHERE id = ? AND status = 'running'", (time.time(), job_id)
+            )
+
+    def _run(self, job_id):
+        stop = threading.Event()
+        threading.Thread(target=self._heartbeat, args=(job_id, stop), daemon=True).start()
+        try:
+            row = self._db().execute("SELECT files, webhook FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            try:
+                items = self._load_items(row['files'])
+            except (OSError, ValueError, KeyError) as e:
+                # A missing spool file will be missing on every retry too: fail now instead of looping
+                items, status, payload, error = None, 'failed', None, f"spooled upload unreadable: {e}"
+            if items is not None:
+                try:
+                    result = self.handler(items)
+                    status, payload, error = 'done', json.dumps(result), None
+                except Exception as e:
+                    status, payload, error = 'failed', None, str(e)
+            self._db().execute(
+                "UPDATE jobs SET status = ?, finished_at = ?, heartbeat_at = ?, result = ?, error = ? WHERE id = ?",
+                (status, time.time(), time.time(), payload, error, job_id)
+            )
+            shutil.rmtree(os.path.join(self.spool_dir, job_id), ignore_errors=True)
+            if row['webhook']:
+                self._notify(row['webhook'], job_id, status)
+        except Exception as e:
+            print(f"❌ Job {job_id} error: {e}")
+        finally:
+            stop.set()
+            self._slots.release()
+            self._wakeup.set()
+
+    @staticmethod
+    def _load_items(files):
+        items = []
+        for entry in json.loads(files):
+            if entry.get('error'):
+                items.append((entry['filename'], None, entry['error']))
+                continue
+            with open(entry['path'], 'rb') as f:
+                items.append((entry['filename'], f.read(), None))
+        return items
+
+    def _notify(self, webhook, job_id, status):
+        body = json.dumps({'job_id': job_id, 'status': status, 'status_url': f"/jobs/{job_id}"}).encode()
+        req = urllib.request.Request(webhook, data=body, headers={'Content-Type': 'application/json'}, method='POST')
+        try:
+            urllib.request.urlopen(req, timeout=5).close()
+        except Exception as e:
+            print(f"⚠️ Webhook for job {job_id} failed: {e}")
@@ -0,0 +1,63 @@
+import re
+
+
+# ---------------------------
+# Single-pass keyword matching
+# ---------------------------
+class KeywordMatcher:
+    """Precompiled substring matcher: reports which keywords occur in a text (same result as `kw in text`)"""
+
+    def __init__(self, keywords, token_cache_size=65536):
+        self.keywords = list(dict.fromkeys(keywords))
+        self.phrases = [kw for kw in self.keywords if len(kw.split()) > 1 or kw != kw.strip()]
+
+        # A keyword without whitespace can only occur inside one whitespace-delimited token, so
+        # each distinct token is scanned once and the result memoised across resumes. The words
+        # of multi-word phrases are scanned the same way and act as a cheap pre-filter.
+        phrase_words = [w for phrase in self.phrases for w in phrase.split()]
+        self._token_terms = tuple(dict.fromkeys(
+            [kw for kw in self.keywords if kw not in self.phrases] + phrase_words
+        ))
+        self._phrase_words = {phrase: phrase.split() for phrase in self.phrases}
+        self._keyword_set = frozenset(self.keywords)
+        self._token_cache = {}
+        self._token_cache_size = token_cache_size
+
+    def _scan_token(self, token):
+        hits = tuple(term for term in self._token_terms if term in token)
+        if len(self._token_cache) < self._token_cache_size:
+            self._token_cache[token] = hits
+        return hits
+
+    def find(self, text, unique_words=None):
+        """Return the set of keywords present in `text`; pass `set(text.split())` if already computed"""
+        if unique_words is None:
+            unique_words = set(text.split())
+        cache = self._token_cache
+        found = set()
+        for token in unique_words:
+            hits = cache.get(token)
+            if hits is None:
+                hits = self._scan_token(token)
+            if hits:
+                found.update(hits)
+        # Every word of a phrase must appear inside some token before the phrase can be in the text
+        for phrase, words in self._phrase_words.items():
+            if all(w in found for w in words) and phrase in text:
+                found.add(phrase)
+        return found & self._keyword_set if self.phrases else found
+
+
+class WordPatternMatcher:
+    """Matches several whole-word regexes with one alternation of named groups; returns the names found"""
+
+    def __init__(self, patterns):
+        self.names = list(patterns)
+        alternation = '|'.join(f'(?P<{name}>{pattern})' for name, pattern in patterns.items())
+        # Leading with a character class lets the regex engine skip most positions outright
+        first_chars = sorted({pattern[0] for pattern in patterns.values()})
+        lead = f"(?=[{''.join(first_chars)}])" if all(c.isalnum() for c in first_chars) else ''
+        self._regex = re.compile(rf'{lead}\b(?:{alternation})\b')
+
+    def find(self, text):
+        return {match.lastgroup for match in self._regex.finditer(text)}
@@ -0,0 +1,252 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# Directory where each worker process drops its metric snapshot so /metrics can sum every worker
+# ('' = report this process only, e.g. the dev server). Snapshots of exited workers are folded into
+# retired.json by retire_worker (gunicorn's child_exit hook), so counters survive worker recycling.
+METRICS_DIR = os.environ.get('METRICS_DIR', '')
+RETIRED_NAME = 'retired.json'
+METRICS_FLUSH_SECONDS = float(os.environ.get('METRICS_FLUSH_SECONDS', 1))
+
+STAGE_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+PAGE_BUCKETS = (1, 2, 3, 5, 10, 20, 50, 100)
+
+
+# ---------------------------
+# Prometheus-style metrics
+# ---------------------------
+class Metric:
+    """One metric family; values are keyed by their sorted label pairs"""
+
+    def __init__(self, name, kind, help, buckets=None, merge='last'):
+        self.name = name
+        self.kind = kind
+        self.help = help
+        self.buckets = buckets
+        self.merge = merge  # gauges only: 'last' (same value in every worker) or 'sum' (per-worker amounts)
+        self.values = {}
+
+    def _key(self, labels):
+        return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+        self._last_flush = 0
+
+    def _metric(self, name, kind, help, buckets=None, merge='last'):
+        metric = self._metrics.get(name)
+        if metric is None:
+            metric = self._metrics[name] = Metric(name, kind, help, buckets, merge)
+        return metric
+
+    def counter(self, name, help):
+        return self._metric(name, 'counter', help)
+
+    def gauge(self, name, help, merge='last'):
+        return self._metric(name, 'gauge', help, merge=merge)
+
+    def histogram(self, name, help, buckets=STAGE_BUCKETS):
+        return self._metric(name, 'histogram', help, buckets)
+
+    def inc(self, metric, amount=1, **labels):
+        key = metric._key(labels)
+        with self._lock:
+            metric.values[key] = metric.values.get(key, 0) + amount
+
+    def set(self, metric, value, **labels):
+        with self._lock:
+            metric.values[metric._key(labels)] = value
+
+    def clear(self, metric):
+        with self._lock:
+            metric.values.clear()
+
+    def observe(self, metric, value, **labels):
+        key = metric._key(labels)
+        with self._lock:
+            state = metric.values.get(key)
+            if state is None:
+                state = metric.values[key] = [0] * (len(metric.buckets) + 2)  # buckets..., sum, count
+            for i, bound in enumerate(metric.buckets):
+                if value <= bound:
+                    state[i] += 1
+            state[-2] += value
+            state[-1] += 1
+
+    @contextmanager
+    def timer(self, metric, timings=None, **labels):
+        """Observe the block's duration; also stored in `timings[labels['stage']]` when a dict is given"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            self.observe(metric, seconds, **labels)
+            if timings is not None:
+                timings[labels.get('stage', metric.name)] = seconds
+
+    # --- multi-process ---
+    def snapshot(self):
+        with self._lock:
+            return {
+                name: {'kind': m.kind, 'help': m.help, 'buckets': m.buckets, 'merge': m.merge,
+                       'values': [[list(map(list, key)), value] for key, value in m.values.items()]}
+                for name, m in self._metrics.items()
+            }
+
+    def flush(self, force=False):
+        """Write this process's snapshot to METRICS_DIR (rate limited unless forced)"""
+        if not METRICS_DIR or (not force and time.time() - self._last_flush < METRICS_FLUSH_SECONDS):
+            return
+        self._last_flush = time.time()
+        os.makedirs(METRICS_DIR, exist_ok=True)
+        _write_json(os.path.join(METRICS_DIR, f"worker-{os.getpid()}.json"), self.snapshot())
+
+    def _collect(self):
+        """[(pid, snapshot)] for every worker that has flushed (pid None: retired workers' totals), or just
+        this process"""
+        if not METRICS_DIR:
+            return [(os.getpid(), self.snapshot())]
+        self.flush(force=True)
+        retired_path = os.path.join(METRICS_DIR, RETIRED_NAME)
+        for _ in range(5):
+            retired = _read_json(retired_path) or {'pids': [], 'metrics': {}}
+            snapshots = [(None, retired['metrics'])]
+            for pid, path in _worker_files():
+                # A worker already folded into retired.json whose file is not deleted yet must not count twice
+                snapshot = _read_json(path) if pid not in retired['pids'] else None
+                if snapshot is not None:
+                    snapshots.append((pid, snapshot))
+            # Retry if a worker was retired while the files were read (it might be missed or counted twice)
+            if (_read_json(retired_path) or {'pids': [], 'metrics': {}}) == retired:
+                break
+        return snapshots
+
+    def render(self):
+        """Prometheus text exposition; counters and histograms are summed over worker snapshots (exited
+        workers included, so totals never go backwards), gauges come from live workers only"""
+        merged = {}
+        for pid, snapshot in self._collect():
+            _merge(merged, snapshot, gauges=pid is not None and (pid == os.getpid() or _alive(pid)))
+
+        lines = []
+        for name in sorted(merged):
+            family = merged[name]
+            lines.append(f"# HELP {name} {family['help']}")
+            lines.append(f"# TYPE {name} {family['kind']}")
+            for key, value in sorted(family['values'].items()):
+                if family['kind'] == 'histogram':
+                    for bound, count in zip(list(family['buckets']) + ['+Inf'], value[:-2] + [value[-1]]):
+                        lines.append(f"{name}_bucket{_labels(key + (('le', str(bound)),))} {count}")
+                    lines.append(f"{name}_sum{_labels(key)} {value[-2]}")
+                    lines.append(f"{name}_count{_labels(key)} {value[-1]}")
+                else:
+                    lines.append(f"{name}{_labels(key)} {value}")
+        return "\n".join(lines) + "\n"
+
+
+def _merge(merged, snapshot, gauges=True):
+    """Add a snapshot into merged ({name: family with values keyed by label tuples})"""
+    for name, family in snapshot.items():
+        target = merged.setdefault(name, {**family, 'values': {}})
+        if family['kind'] == 'gauge' and not gauges:
+            continue
+        for key, value in family['values']:
+            key = tuple(map(tuple, key))
+            if family['kind'] == 'histogram':
+                current = target['values'].get(key)
+                target['values'][key] = value if current is None else [a + b for a, b in zip(current, value)]
+            elif family['kind'] == 'counter' or family.get('merge') == 'sum':
+                target['values'][key] = target['values'].get(key, 0) + value
+            else:
+                target['values'][key] = value
+
+
+def _read_json(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _worker_files():
+    for name in os.listdir(METRICS_DIR):
+        if name.startswith('worker-') and name.endswith('.json'):
+            yield int(name[len('worker-'):-len('.json')]), os.path.join(METRICS_DIR, name)
+
+
+def retire_worker(pid):
+    """Fold an exited worker's counters and histograms into retired.json and delete its snapshot
+
+    Called in the gunicorn master, one worker at a time. While the worker's file still exists its pid
+    is listed in retired.json, so a reader in between does not count the worker twice.
+    """
+    if not METRICS_DIR:
+        return
+    path = os.path.join(METRICS_DIR, f"worker-{pid}.json")
+    snapshot = _read_json(path)
+    if snapshot is None:
+        return
+    retired_path = os.path.join(METRICS_DIR, RETIRED_NAME)
+    merged = {}
+    _merge(merged, (_read_json(retired_path) or {'metrics': {}})['metrics'])
+    _merge(merged, snapshot, gauges=False)
+    metrics = {
+        name: {**family, 'values': [[list(map(list, key)), value] for key, value in family['values'].items()]}
+        for name, family in merged.items() if family['kind'] != 'gauge'
+    }
+    _write_json(retired_path, {'pids': [pid], 'metrics': metrics})
+    os.remove(path)
+    _write_json(retired_path, {'pids': [], 'metrics': metrics})
+
+
+def _write_json(path, data):
+    with open(f"{path}.tmp", 'w') as f:
+        json.dump(data, f)
+    os.replace(f"{path}.tmp", path)
+
+
+def _labels(pairs):
+    if not pairs:
+        return ""
+    escaped = []
+    for k, v in pairs:
+        v = str(v).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+        escaped.append(f'{k}="{v}"')
+    return "{" + ",".join(escaped) + "}"
+
+
+def _alive(pid):
+    try:
+        os.kill(pid, 0)
+        return True
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+
+
+registry = MetricsRegistry()
+
+REQUESTS = registry.counter('resume_api_requests_total', "HTTP requests by endpoint and status code")
+ERRORS = registry.counter('resume_api_errors_total', "Errors by type (exception class or rejection reason)")
+REQUEST_SECONDS = registry.histogram('resume_api_request_seconds', "End-to-end request latency by endpoint")
+STAGE_SECONDS = registry.histogram('resume_api_stage_seconds', "Hot-path stage latency (pdf_parse, clean_text, "
+                                   "extract_features, dataframe_build, predict_proba, serialize)")
+PDF_PAGES = registry.histogram('resume_api_pdf_pages', "Page count of uploaded PDFs", buckets=PAGE_BUCKETS)
+NEAR_DUPLICATES = registry.counter('resume_api_near_duplicates_total', "Uploads answered with the result of an "
+                                   "earlier near-identical resume")
+IN_FLIGHT = registry.gauge('resume_api_in_flight', "Admitted upload requests doing extraction / inference now "
+                           "(all workers)", merge='sum')
+QUEUE_DEPTH = registry.gauge('resume_api_admission_queue_depth', "Upload requests waiting for an admission slot "
+                             "(all workers)", merge='sum')
+SHED = registry.counter('resume_api_shed_total', "Requests refused with 503 by admission control, by endpoint and "
+                        "reason (queue_full, queue_timeout)")
+MODEL_INFO = registry.gauge('resume_api_model_info', "Active model (value 1) labelled with its version and type")
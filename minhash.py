@@ -0,0 +1,193 @@
+"""
+MinHash signatures of cleaned resume text, for near-duplicate detection.
+
+A resume is the set of its word 3-shingles; the Jaccard similarity of two such sets is estimated
+by the share of equal positions in their signatures. LSH banding (MINHASH_BANDS bands of
+MINHASH_PERMUTATIONS / MINHASH_BANDS values) finds candidate pairs without comparing everything,
+and candidates are then confirmed against the threshold.
+"""
+import os
+import threading
+import zlib
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+MINHASH_PERMUTATIONS = 128
+MINHASH_BANDS = 16
+SHINGLE_WORDS = 3
+# Estimated Jaccard similarity at or above which two resumes count as near-duplicates
+NEAR_DUPLICATE_THRESHOLD = float(os.environ.get('NEAR_DUPLICATE_THRESHOLD', 0.8))
+# Resumes remembered per worker for serving-time duplicate lookups
+NEAR_DUPLICATE_INDEX_SIZE = int(os.environ.get('NEAR_DUPLICATE_INDEX_SIZE', 50000))
+# Shingles hashed per NumPy pass (x MINHASH_PERMUTATIONS uint64 values)
+SIGNATURE_CHUNK_SHINGLES = 1 << 13
+SIGNATURE_BATCH_TEXTS = 2000
+
+_rng = np.random.default_rng(20240101)  # fixed: signatures must be comparable across processes and runs
+PERM_A = _rng.integers(1, 2 ** 63, MINHASH_PERMUTATIONS, dtype=np.uint64) | np.uint64(1)
+PERM_B = _rng.integers(0, 2 ** 63, MINHASH_PERMUTATIONS, dtype=np.uint64)
+SHINGLE_MIX = _rng.integers(1, 2 ** 63, SHINGLE_WORDS, dtype=np.uint64) | np.uint64(1)
+BAND_MIX = _rng.integers(1, 2 ** 63, MINHASH_PERMUTATIONS // MINHASH_BANDS, dtype=np.uint64) | np.uint64(1)
+EMPTY = np.iinfo(np.uint32).max
+
+
+# ---------------------------
+# Signatures
+# ---------------------------
+def _shingles(texts):
+    """(shingle hashes, doc offsets): word 3-shingles of every text, concatenated in text order"""
+    token_lists = [str(text).split() for text in texts]
+    lengths = np.fromiter((len(tokens) for tokens in token_lists), dtype=np.int64, count=len(token_lists))
+    flat = [token for tokens in token_lists for token in tokens]
+    codes, uniques = pd.factorize(pd.Series(flat, dtype=object)) if flat else (np.empty(0, np.int64), [])
+    # crc32 rather than hash(): stable across processes (PYTHONHASHSEED) and runs
+    token_hashes = np.fromiter((zlib.crc32(token.encode()) for token in uniques), dtype=np.uint64,
+                               count=len(uniques))[codes]
+
+    doc = np.repeat(np.arange(len(texts)), lengths)
+    n = len(token_hashes)
+    w = SHINGLE_WORDS
+    if n >= w:
+        starts = np.flatnonzero(doc[:n - w + 1] == doc[w - 1:])  # windows that stay inside one text
+        with np.errstate(over='ignore'):
+            hashes = sum(token_hashes[starts + i] * SHINGLE_MIX[i] for i in range(w))
+        shingle_doc = doc[starts]
+    else:
+        hashes, shingle_doc = np.empty(0, np.uint64), np.empty(0, np.int64)
+    # Texts shorter than one shingle fall back to their words
+    short = np.flatnonzero((lengths > 0) & (lengths < w))
+    if len(short):
+        short_tokens = np.isin(doc, short)
+        hashes = np.concatenate([hashes, token_hashes[short_tokens]])
+        shingle_doc = np.concatenate([shingle_doc, doc[short_tokens]])
+        order = np.argsort(shingle_doc, kind='stable')
+        hashes, shingle_doc = hashes[order], shingle_doc[order]
+    offsets = np.searchsorted(shingle_doc, np.arange(len(texts) + 1))
+    return hashes, offsets
+
+
+def signatures(texts):
+    """(len(texts), MINHASH_PERMUTATIONS) uint32 signatures of cleaned texts; empty texts are all EMPTY"""
+    texts = list(texts)
+    codes, distinct = pd.factorize(pd.Series(texts, dtype=object), use_na_sentinel=False)
+    if len(distinct) < len(texts):
+        return signatures(distinct)[codes]  # identical texts are signed once
+    result = np.full((len(texts), MINHASH_PERMUTATIONS), EMPTY, dtype=np.uint32)
+    # Tokens are materialised for one batch of texts at a time
+    for start in range(0, len(texts), SIGNATURE_BATCH_TEXTS):
+        _signatures(texts[start:start + SIGNATURE_BATCH_TEXTS], result[start:start + SIGNATURE_BATCH_TEXTS])
+    return result
+
+
+def _signatures(texts, result):
+    hashes, offsets = _shingles(texts)
+    counts = np.diff(offsets)
+    docs = np.flatnonzero(counts)
+    if not len(docs):
+        return
+    # Wide enough for a full chunk, or for one text that alone exceeds a chunk
+    buffer = np.empty((MINHASH_PERMUTATIONS, min(len(hashes), max(SIGNATURE_CHUNK_SHINGLES, counts.max()))),
+                      dtype=np.uint64)
+    # Whole texts per pass, about SIGNATURE_CHUNK_SHINGLES shingles each
+    i = 0
+    while i < len(docs):
+        j = i + 1
+        while j < len(docs) and offsets[docs[j] + 1] - offsets[docs[i]] <= SIGNATURE_CHUNK_SHINGLES:
+            j += 1
+        chunk_docs = docs[i:j]
+        lo, hi = offsets[chunk_docs[0]], offsets[chunk_docs[-1] + 1]
+        # Multiply-shift hashing, in place: the high 32 bits of a*x + b (mod 2^64)
+        permuted = np.multiply(PERM_A[:, None], hashes[None, lo:hi], out=buffer[:, :hi - lo])
+        np.add(permuted, PERM_B[:, None], out=permuted)
+        np.right_shift(permuted, np.uint64(32), out=permuted)
+        result[chunk_docs] = np.minimum.reduceat(permuted, offsets[chunk_docs] - lo, axis=1).T
+        i = j
+
+
+def signature(text):
+    return signatures([text])[0]
+
+
+def similarity(a, b):
+    """Estimated Jaccard similarity of the shingle sets behind two signatures (rows broadcast)"""
+    return np.mean(np.asarray(a) == np.asarray(b), axis=-1)
+
+
+def band_keys(sigs):
+    """(n, MINHASH_BANDS) uint64 bucket keys; similar texts share at least one with high probability"""
+    rows = MINHASH_PERMUTATIONS // MINHASH_BANDS
+    bands = np.asarray(sigs, dtype=np.uint64).reshape(len(sigs), MINHASH_BANDS, rows)
+    with np.errstate(over='ignore'):
+        return (bands * BAND_MIX).sum(axis=2, dtype=np.uint64)
+
+
+# ---------------------------
+# Corpus deduplication
+# ---------------------------
+def near_duplicates(texts, threshold=NEAR_DUPLICATE_THRESHOLD):
+    """For each text, the position of an earlier near-duplicate it repeats, or -1 (keep it)"""
+    sigs = signatures(texts)
+    n = len(sigs)
+    empty = sigs[:, 0] == EMPTY
+    keys = band_keys(sigs)
+    positions = pd.Series(np.arange(n))
+    pairs = []
+    for band in range(MINHASH_BANDS):
+        # Earliest text in the same bucket of this band
+        first = positions.groupby(keys[:, band]).transform('min').to_numpy()
+        candidates = np.flatnonzero(first < positions.to_numpy())
+        pairs.append(np.stack([candidates, first[candidates]], axis=1))
+    pairs = np.unique(np.concatenate(pairs), axis=0) if pairs else np.empty((0, 2), dtype=np.int64)
+    pairs = pairs[~empty[pairs[:, 0]] & ~empty[pairs[:, 1]]]
+    confirmed = pairs[similarity(sigs[pairs[:, 0]], sigs[pairs[:, 1]]) >= threshold]
+
+    duplicate_of = np.full(n, -1, dtype=np.int64)
+    # Several earlier matches: keep the earliest (np.unique sorted pairs by text, then by match)
+    repeated, first_match = np.unique(confirmed[:, 0], return_index=True)
+    duplicate_of[repeated] = confirmed[first_match, 1]
+    return duplicate_of
+
+
+# ---------------------------
+# Serving index
+# ---------------------------
+class NearDuplicateIndex:
+    """Bounded in-memory LSH index from signatures to the result-cache key of the resume they came from"""
+
+    def __init__(self, threshold=NEAR_DUPLICATE_THRESHOLD, max_entries=NEAR_DUPLICATE_INDEX_SIZE):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self._items = OrderedDict()  # key -> (signature, band keys), oldest first
+        self._buckets = [{} for _ in range(MINHASH_BANDS)]
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._items)
+
+    def query(self, sig):
+        """(key, similarity) of the most similar indexed resume at or above the threshold, else None"""
+        if sig[0] == EMPTY:
+            return None
+        keys = band_keys(sig[None, :])[0]
+        with self._lock:
+            candidates = {self._buckets[band].get(int(key)) for band, key in enumerate(keys)} - {None}
+            scored = [(float(similarity(sig, self._items[c][0])), c) for c in candidates]
+        best = max(scored, default=None)
+        return (best[1], best[0]) if best and best[0] >= self.threshold else None
+
+    def add(self, key, sig):
+        if sig[0] == EMPTY:
+            return
+        bands = band_keys(sig[None, :])[0]
+        with self._lock:
+            self._items[key] = (sig, bands)
+            self._items.move_to_end(key)
+            for band, bucket_key in enumerate(bands):
+                self._buckets[band][int(bucket_key)] = key
+            while len(self._items) > self.max_entries:
+                old_key, (_, old_bands) = self._items.popitem(last=False)
+                for band, bucket_key in enumerate(old_bands):
+                    if self._buckets[band].get(int(bucket_key)) == old_key:
+                        del self._buckets[band][int(bucket_key)]
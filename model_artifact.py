@@ -0,0 +1,55 @@
+import joblib
+import numpy as np
+from sklearn.compose import ColumnTransformer
+from sklearn.feature_extraction.text import CountVectorizer
+from sklearn.pipeline import Pipeline
+
+ARTIFACT_PATH = 'advanced_model.joblib'
+# Optional linear / distilled model from `train_model.py --fast-model` (served with SERVING_MODEL=fast)
+FAST_ARTIFACT_PATH = 'fast_model.joblib'
+ARTIFACT_FORMAT = 1
+
+
+# ---------------------------
+# Memory-mappable model artifact
+# ---------------------------
+def _find_vectorizers(estimator):
+    """Yield every fitted (Count|Tfidf)Vectorizer inside a Pipeline / ColumnTransformer, in a stable order"""
+    if isinstance(estimator, CountVectorizer):
+        yield estimator
+    elif isinstance(estimator, Pipeline):
+        for _, step in estimator.steps:
+            yield from _find_vectorizers(step)
+    elif isinstance(estimator, ColumnTransformer):
+        for _, transformer, _ in getattr(estimator, 'transformers_', []):
+            yield from _find_vectorizers(transformer)
+
+
+def save_artifact(model_data, path=ARTIFACT_PATH):
+    """Write model_data with joblib so every NumPy array (IDF weights, SVC support vectors, LR/forest
+    arrays) can be memory-mapped on load; vocabularies are stored as one fixed-width term array each"""
+    vectorizers = list(_find_vectorizers(model_data['model']))
+    vocabularies = [vec.vocabulary_ for vec in vectorizers]
+    term_arrays = []
+    for vocabulary in vocabularies:
+        terms = [None] * len(vocabulary)
+        for term, index in vocabulary.items():
+            terms[index] = term
+        term_arrays.append(np.array(terms, dtype=str))
+    try:
+        for vec in vectorizers:
+            vec.vocabulary_ = None
+        joblib.dump({**model_data, 'vocabularies': term_arrays, 'artifact_format': ARTIFACT_FORMAT}, path)
+    finally:
+        for vec, vocabulary in zip(vectorizers, vocabularies):
+            vec.vocabulary_ = vocabulary
+    return path
+
+
+def load_artifact(path=ARTIFACT_PATH, mmap_mode='r'):
+    """Load an artifact written by save_artifact; arrays stay memory-mapped (shared page cache across workers)"""
+    model_data = joblib.load(path, mmap_mode=mmap_mode)
+    term_arrays = model_data.pop('vocabularies', [])
+    for vec, terms in zip(_find_vectorizers(model_data['model']), term_arrays):
+        vec.vocabulary_ = {term: index for index, term in enumerate(terms.tolist())}
+    return model_data
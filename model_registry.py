@@ -0,0 +1,118 @@
+import json
+import os
+import shutil
+import time
+
+from model_artifact import save_artifact, load_artifact
+
+MODEL_REGISTRY_DIR = os.environ.get('MODEL_REGISTRY_DIR', 'model_registry')
+# Versions kept per kind; the active one is never pruned
+MODEL_REGISTRY_KEEP = int(os.environ.get('MODEL_REGISTRY_KEEP', 10))
+
+ARTIFACT_NAME = 'model.joblib'
+METADATA_NAME = 'metadata.json'
+# One active pointer per kind: the voting ensemble, the fast linear model and the incremental model
+KINDS = ('full', 'fast', 'incremental')
+
+
+# ---------------------------
+# Versioned model registry
+# ---------------------------
+# model_registry/
+#     20250101120000/model.joblib, metadata.json
+#     20250101120000-fast-linear/...
+#     ACTIVE_FULL, ACTIVE_FAST, ACTIVE_INCREMENTAL   <- version served for each SERVING_MODEL, replaced atomically
+def _pointer(kind, registry_dir):
+    return os.path.join(registry_dir, f"ACTIVE_{kind.upper()}")
+
+
+def _version_dir(version, registry_dir):
+    return os.path.join(registry_dir, str(version))
+
+
+def register(model_data, kind='full', activate=True, registry_dir=MODEL_REGISTRY_DIR):
+    """Store model_data as a new version (memory-mappable artifact + metadata.json); returns the version"""
+    version = str(model_data['model_version'])
+    final_dir = _version_dir(version, registry_dir)
+    tmp_dir = f"{final_dir}.tmp{os.getpid()}"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+    save_artifact(model_data, os.path.join(tmp_dir, ARTIFACT_NAME))
+    metadata = {
+        'version': version,
+        'kind': kind,
+        'model_type': model_data.get('model_type'),
+        'feature_schema_version': model_data.get('feature_schema_version'),
+        'class_names': list(model_data.get('class_names', [])),
+        'metrics': model_data.get('metrics', {}),
+        'registered_at': time.time()
+    }
+    with open(os.path.join(tmp_dir, METADATA_NAME), 'w') as f:
+        json.dump(metadata, f, indent=2, default=float)
+    # The directory appears complete or not at all, so a watching server never loads half a version
+    shutil.rmtree(final_dir, ignore_errors=True)
+    os.replace(tmp_dir, final_dir)
+    if activate:
+        set_active(version, kind, registry_dir)
+    prune(kind, registry_dir)
+    return version
+
+
+def set_active(version, kind='full', registry_dir=MODEL_REGISTRY_DIR):
+    if not os.path.exists(os.path.join(_version_dir(version, registry_dir), ARTIFACT_NAME)):
+        raise ValueError(f"Unknown model version: {version}")
+    pointer = _pointer(kind, registry_dir)
+    tmp = f"{pointer}.tmp{os.getpid()}"
+    with open(tmp, 'w') as f:
+        f.write(str(version))
+    os.replace(tmp, pointer)
+
+
+def active_version(kind='full', registry_dir=MODEL_REGISTRY_DIR):
+    try:
+        with open(_pointer(kind, registry_dir)) as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def version_kind(version, registry_dir=MODEL_REGISTRY_DIR):
+    """Kind a version was registered as ('full' for versions without metadata)"""
+    try:
+        with open(os.path.join(_version_dir(version, registry_dir), METADATA_NAME)) as f:
+            return json.load(f).get('kind', 'full')
+    except FileNotFoundError:
+        return 'full'
+
+
+def list_versions(registry_dir=MODEL_REGISTRY_DIR):
+    """Metadata of every registered version, newest first, with an 'active' flag"""
+    if not os.path.isdir(registry_dir):
+        return []
+    active = {kind: active_version(kind, registry_dir) for kind in KINDS}
+    versions = []
+    for name in os.listdir(registry_dir):
+        path = os.path.join(registry_dir, name, METADATA_NAME)
+        if os.path.exists(path):
+            with open(path) as f:
+                metadata = json.load(f)
+            metadata['active'] = active.get(metadata.get('kind')) == metadata['version']
+            versions.append(metadata)
+    return sorted(versions, key=lambda m: m.get('registered_at', 0), reverse=True)
+
+
+def load_version(version, registry_dir=MODEL_REGISTRY_DIR, mmap_mode='r'):
+    """Load a registered version; returns (model_data, artifact path). Pass mmap_mode=None to get
+    writable arrays (e.g. to keep training the model)"""
+    path = os.path.join(_version_dir(version, registry_dir), ARTIFACT_NAME)
+    if not os.path.exists(path):
+        raise ValueError(f"Unknown model version: {version}")
+    return load_artifact(path, mmap_mode=mmap_mode), path
+
+
+def prune(kind='full', registry_dir=MODEL_REGISTRY_DIR, keep=MODEL_REGISTRY_KEEP):
+    # Deleting a version a worker still has memory-mapped is safe: the mapping keeps the file alive
+    versions = [m for m in list_versions(registry_dir) if m.get('kind') == kind]
+    for metadata in versions[keep:]:
+        if not metadata['active']:
+            shutil.rmtree(_version_dir(metadata['version'], registry_dir), ignore_errors=True)
@@ -0,0 +1,237 @@
+import io
+import os
+import time
+import multiprocessing
+import threading
+from concurrent.futures import CancelledError, ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+
+import pdfplumber
+
+try:
+    import pypdfium2 as pdfium  # installed with pdfplumber; much faster text-layer extraction
+except ImportError:
+    pdfium = None
+
+# Extraction budgets and engine settings (0 = unlimited / disabled)
+PDF_MAX_PAGES = int(os.environ.get('PDF_MAX_PAGES', 20))
+PDF_MAX_CHARS = int(os.environ.get('PDF_MAX_CHARS', 100000))
+PDF_FAST_PATH = os.environ.get('PDF_FAST_PATH', '1') == '1'
+PDF_WORKERS = int(os.environ.get('PDF_WORKERS', 0))
+PDF_PARALLEL_MIN_PAGES = int(os.environ.get('PDF_PARALLEL_MIN_PAGES', 8))
+PDF_PAGES_PER_TASK = int(os.environ.get('PDF_PAGES_PER_TASK', 4))
+# Admission limits: documents with more pages are refused outright. PDF_MAX_SECONDS is a hard deadline:
+# the document is extracted in a pool process, which is killed if it is still running when time is up
+PDF_MAX_DOCUMENT_PAGES = int(os.environ.get('PDF_MAX_DOCUMENT_PAGES', 200))
+PDF_MAX_SECONDS = float(os.environ.get('PDF_MAX_SECONDS', 10))
+# Pool size when PDF_WORKERS is 0: documents extracted at once per process under the deadline
+PDF_PROCESSES = int(os.environ.get('PDF_PROCESSES', 4))
+
+_pool = None
+_pool_lock = threading.Lock()
+# PDFium is not thread-safe: every pdfium call in this process (open, page text, close) holds this lock.
+# Request threads and job-queue threads extract concurrently; pool processes each have their own PDFium.
+_pdfium_lock = threading.Lock()
+
+
+class PdfTooLarge(ValueError):
+    """The document is over an admission limit and was not extracted"""
+
+
+class PdfTimedOut(PdfTooLarge):
+    """Extraction did not finish within the deadline and was abandoned"""
+
+
+# ---------------------------
+# Page-level extraction
+# ---------------------------
+class _Document:
+    """One opened PDF: pdfium for the text layer, pdfplumber opened lazily for pages pdfium returns nothing for"""
+
+    def __init__(self, data, fast=PDF_FAST_PATH):
+        self.data = data
+        self._pdfium = None
+        self._plumber = None
+        if fast and pdfium is not None:
+            with _pdfium_lock:
+                try:
+                    self._pdfium = pdfium.PdfDocument(data)
+                    self.page_count = len(self._pdfium)
+                except Exception:
+                    self._pdfium = None
+        if self._pdfium is None:
+            self.page_count = len(self._open_plumber().pages)
+
+    def _open_plumber(self):
+        if self._plumber is None:
+            self._plumber = pdfplumber.open(io.BytesIO(self.data))
+        return self._plumber
+
+    def page_text(self, index):
+        """Return (text, engine, seconds) for one page"""
+        start = time.perf_counter()
+        if self._pdfium is not None:
+            with _pdfium_lock:
+                page = self._pdfium[index]
+                textpage = page.get_textpage()
+                text = textpage.get_text_range()
+                textpage.close()
+                page.close()
+            if text.strip():
+                return text.replace('\r\n', '\n').strip(), 'pdfium', time.perf_counter() - start
+        text = self._open_plumber().pages[index].extract_text() or ""
+        return text, 'pdfplumber', time.perf_counter() - start
+
+    def close(self):
+        if self._pdfium is not None:
+            with _pdfium_lock:
+                self._pdfium.close()
+        if self._plumber is not None:
+            self._plumber.close()
+
+
+def _extract_page_range(data, first, last, fast):
+    """Process-pool task: extract pages [first, last) of a PDF given as bytes"""
+    doc = _Document(data, fast=fast)
+    try:
+        return [(i, *doc.page_text(i)) for i in range(first, min(last, doc.page_count))]
+    finally:
+        doc.close()
+
+
+def _get_pool(workers):
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn: forking a threaded Flask worker is not safe
+            _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+        return _pool
+
+
+def _recycle_pool(pool):
+    """Kill the processes of a pool with a runaway task; the next extraction starts a fresh pool"""
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    if hasattr(pool, 'terminate_workers'):
+        pool.terminate_workers()
+    else:
+        # Python < 3.14 has no public way to stop a busy worker
+        for process in list((pool._processes or {}).values()):
+            process.terminate()
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _read_bytes(source):
+    if isinstance(source, (bytes, bytearray)):
+        return bytes(source)
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, 'rb') as f:
+            return f.read()
+    if hasattr(source, 'seek'):
+        source.seek(0)
+    return source.read()
+
+
+# ---------------------------
+# Streaming / budgeted extraction
+# ---------------------------
+def _iter_pages(doc, data, last, fast, workers):
+    if workers and last >= PDF_PARALLEL_MIN_PAGES:
+        pool = _get_pool(workers)
+        futures = [
+            pool.submit(_extract_page_range, data, first, min(first + PDF_PAGES_PER_TASK, last), fast)
+            for first in range(0, last, PDF_PAGES_PER_TASK)
+        ]
+        try:
+            for future in futures:
+                yield from future.result()
+        finally:
+            for future in futures:
+                future.cancel()
+    else:
+        for index in range(last):
+            yield (index, *doc.page_text(index))
+
+
+def iter_pdf_pages(source, max_pages=PDF_MAX_PAGES, fast=PDF_FAST_PATH, workers=PDF_WORKERS):
+    """Yield (page_index, text, engine, seconds) in page order, up to max_pages pages
+
+    Large documents are split into page ranges and spread over a process pool when workers > 0;
+    stopping the iteration early cancels the ranges that have not started yet.
+    """
+    data = _read_bytes(source)
+    doc = _Document(data, fast=fast)
+    try:
+        last = doc.page_count if not max_pages else min(doc.page_count, max_pages)
+        yield from _iter_pages(doc, data, last, fast, workers)
+    finally:
+        doc.close()
+
+
+def _extract(data, max_pages, max_chars, fast, workers, max_document_pages):
+    start = time.perf_counter()
+    doc = _Document(data, fast=fast)
+    parts, pages, chars = [], [], 0
+    try:
+        if max_document_pages and doc.page_count > max_document_pages:
+            raise PdfTooLarge(f"{doc.page_count} pages (limit {max_document_pages})")
+        last = doc.page_count if not max_pages else min(doc.page_count, max_pages)
+        pages_iter = _iter_pages(doc, data, last, fast, workers)
+        try:
+            for index, text, engine, seconds in pages_iter:
+                pages.append({'page': index + 1, 'engine': engine, 'ms': round(seconds * 1000, 3), 'chars': len(text)})
+                if text:
+                    parts.append(text)
+                    chars += len(text) + 1
+                if max_chars and chars > max_chars:
+                    break
+        finally:
+            pages_iter.close()
+    finally:
+        doc.close()
+
+    # One join instead of repeated `text +=` concatenation
+    text = "\n".join(parts)
+    truncated = len(pages) < doc.page_count or bool(max_chars and len(text) > max_chars)
+    if max_chars:
+        text = text[:max_chars]
+    report = {
+        'page_count': doc.page_count,
+        'pages_extracted': len(pages),
+        'truncated': truncated,
+        'pages': pages,
+        'total_ms': round((time.perf_counter() - start) * 1000, 3)
+    }
+    return text.strip(), report
+
+
+def extract_pdf(source, max_pages=PDF_MAX_PAGES, max_chars=PDF_MAX_CHARS, fast=PDF_FAST_PATH, workers=PDF_WORKERS,
+                max_document_pages=PDF_MAX_DOCUMENT_PAGES, max_seconds=PDF_MAX_SECONDS):
+    """Extract text from a PDF (path, bytes or binary stream) within the page/character/time budget
+
+    Returns (text, report); the report has the page count, per-page engine/timings and whether
+    the budget cut the document short. Raises PdfTooLarge for documents over max_document_pages.
+    With max_seconds the whole document is extracted in one pool process (no page-range fan-out)
+    and PdfTimedOut is raised, and the pool recycled, if it is not done in time.
+    """
+    data = _read_bytes(source)
+    if not max_seconds:
+        return _extract(data, max_pages, max_chars, fast, workers, max_document_pages)
+    for attempt in (1, 2):
+        pool = _get_pool(workers or PDF_PROCESSES)
+        try:
+            future = pool.submit(_extract, data, max_pages, max_chars, fast, 0, max_document_pages)
+            return future.result(timeout=max_seconds)
+        except FutureTimeout:
+            if future.cancel():
+                raise PdfTimedOut(f"not started within {max_seconds:g}s (extraction pool busy)")
+            _recycle_pool(pool)
+            raise PdfTimedOut(f"extraction took longer than {max_seconds:g}s")
+        except (BrokenProcessPool, CancelledError):
+            # Another document's timeout (or a crashed worker) took the pool down: retry once on a fresh one
+            _recycle_pool(pool)
+            if attempt == 2:
+                raise
@@ -0,0 +1,122 @@
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+# Requests slower than this dump a sampled profile (0 = profiler off)
+PROFILE_SLOW_MS = float(os.environ.get('PROFILE_SLOW_MS', 0))
+PROFILE_INTERVAL_MS = float(os.environ.get('PROFILE_INTERVAL_MS', 5))
+PROFILE_DIR = os.environ.get('PROFILE_DIR', 'profiles')
+
+_active = {}  # thread ident -> profile of the request that thread is working for
+_lock = threading.Lock()
+_sampler_pid = None
+
+
+# ---------------------------
+# Sampling profiler
+# ---------------------------
+# One daemon thread per process snapshots the stacks of the threads that are serving a request.
+# Stacks are stored folded ('root;caller;callee count'), the input format of flamegraph.pl,
+# speedscope and inferno.
+class Profile:
+    def __init__(self):
+        self.stacks = Counter()
+        self.samples = 0
+
+
+def _frame_name(frame):
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def _fold(frame):
+    names = []
+    while frame is not None:
+        names.append(_frame_name(frame))
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+def _sample_loop():
+    interval = PROFILE_INTERVAL_MS / 1000
+    while True:
+        time.sleep(interval)
+        # Samples are recorded under the lock: once end() has unregistered a profile, nothing
+        # writes to it any more and its stacks can be read safely
+        with _lock:
+            if not _active:
+                continue
+            frames = sys._current_frames()
+            for ident, profile in _active.items():
+                frame = frames.get(ident)
+                if frame is not None:
+                    profile.stacks[_fold(frame)] += 1
+                    profile.samples += 1
+
+
+def _ensure_sampler():
+    global _sampler_pid
+    # Threads do not survive a fork: each worker starts its own sampler on first use
+    if _sampler_pid != os.getpid():
+        _sampler_pid = os.getpid()
+        threading.Thread(target=_sample_loop, name='profiler', daemon=True).start()
+
+
+def enabled():
+    return PROFILE_SLOW_MS > 0
+
+
+def begin():
+    """Start sampling the current thread; returns the request's profile (None when disabled)"""
+    if not enabled():
+        return None
+    _ensure_sampler()
+    profile = Profile()
+    with _lock:
+        _active[threading.get_ident()] = profile
+    return profile
+
+
+def current():
+    """Profile the current thread is sampled for, if any"""
+    return _active.get(threading.get_ident())
+
+
+@contextmanager
+def attach(profile):
+    """Also sample the current thread for `profile` (work handed to a pool thread)"""
+    if profile is None:
+        yield
+        return
+    ident = threading.get_ident()
+    with _lock:
+        _active[ident] = profile
+    try:
+        yield
+    finally:
+        with _lock:
+            if _active.get(ident) is profile:
+                del _active[ident]
+
+
+def end(profile, seconds, name):
+    """Stop sampling; writes PROFILE_DIR/<name>-<ms>ms-<time>.folded when the request was slow"""
+    if profile is None:
+        return None
+    with _lock:
+        for ident in [i for i, p in _active.items() if p is profile]:
+            del _active[ident]
+    if seconds * 1000 < PROFILE_SLOW_MS or not profile.stacks:
+        return None
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    name = re.sub(r'[^A-Za-z0-9_-]+', '_', name).strip('_') or 'root'
+    path = os.path.join(PROFILE_DIR, f"{name}-{seconds * 1000:.0f}ms-{time.time():.6f}-{os.getpid()}.folded")
+    with open(path, 'w') as f:
+        for stack, count in profile.stacks.most_common():
+            f.write(f"{stack} {count}\n")
+    print(f"🔥 Slow request ({seconds * 1000:.0f} ms, {profile.samples} samples) profiled to {path}")
+    return path
@@ -0,0 +1,198 @@
+import os
+import re
+import numpy as np
+import pandas as pd
+from scipy.sparse import csr_matrix
+
+COMPANY_TOP_K = int(os.environ.get('COMPANY_TOP_K', 5))
+
+# Company roles that suit each predicted category; categories not listed here are not role-filtered
+CATEGORY_ROLES = {
+    "Data Science": ['Data Scientist', 'ML Engineer', 'AI Engineer', 'AI Consultant', 'Data Analyst'],
+    "Python Developer": ['Software Engineer', 'Software Developer', 'Backend Developer', 'Backend Engineer', 'Data Engineer'],
+    "Java Developer": ['Software Engineer', 'Software Developer', 'Backend Developer', 'Backend Engineer'],
+    "DotNet Developer": ['Software Engineer', 'Software Developer', 'Backend Developer', 'Backend Engineer'],
+    "SAP Developer": ['Software Engineer', 'Software Developer'],
+    "Blockchain": ['Software Engineer', 'Software Developer', 'Backend Developer', 'Backend Engineer'],
+    "Web Designing": ['Full Stack Developer', 'Software Engineer', 'Software Developer'],
+    "Testing": ['Software Engineer', 'Software Developer'],
+    "Automation Testing": ['Software Engineer', 'Software Developer'],
+    "DevOps Engineer": ['DevOps Engineer', 'Cloud Engineer'],
+    "Network Security Engineer": ['Network Engineer', 'Cloud Engineer'],
+    "Hadoop": ['Data Engineer'],
+    "ETL Developer": ['Data Engineer', 'Data Analyst'],
+    "Database": ['Data Engineer', 'Data Analyst'],
+    "Business Analyst": ['Data Analyst']
+}
+
+# Spellings that name the same skill (applied to company skills and resume text alike)
+SKILL_ALIASES = {
+    'ml': 'machine learning',
+    'ai': 'artificial intelligence',
+    'nodejs': 'node.js',
+    'k8s': 'kubernetes',
+    'powerbi': 'power bi'
+}
+# Skills that are also everyday words or single letters ("Go Ayur System", "R- experience", "excel in
+# teamwork"): a bare mention in a resume does not count, only one of these spellings does
+CONTEXT_SKILLS = {
+    'go': ['golang', 'go lang', 'go language', 'go programming'],
+    'r': ['r programming', 'r language', 'rstudio', 'r studio'],
+    'net': ['.net', 'dotnet', 'dot net', 'asp.net', 'vb.net', 'ado.net'],
+    'excel': ['ms excel', 'microsoft excel', 'advanced excel', 'excel vba', 'excel macros'],
+    'cloud': ['cloud computing', 'cloud platform', 'cloud platforms', 'cloud services', 'cloud infrastructure',
+              'cloud native', 'cloud based'],
+    'security': ['network security', 'cyber security', 'cybersecurity', 'information security', 'it security',
+                 'application security', 'web security', 'cloud security', 'security testing']
+}
+# A leading '.' is kept ('.net'), so the .NET framework and the word "net" stay apart
+SKILL_TOKEN_RE = re.compile(r'\.?[a-z0-9+#]+(?:\.[a-z0-9+#]+)*')
+CONTEXT_ALIASES = {
+    " ".join(SKILL_TOKEN_RE.findall(phrase)): skill for skill, phrases in CONTEXT_SKILLS.items() for phrase in phrases
+}
+
+
+def _canonical(key):
+    return CONTEXT_ALIASES.get(key) or SKILL_ALIASES.get(key, key)
+
+
+def skill_key(text):
+    """Canonical form of a skill name: lower-case tokens ('Node.js' -> 'node.js', '.NET' -> 'net')"""
+    return _canonical(" ".join(SKILL_TOKEN_RE.findall(str(text).lower())))
+
+
+def _column(frame, name):
+    for col in frame.columns:
+        if str(col).strip().lower() == name:
+            return frame[col]
+    return pd.Series([""] * len(frame), index=frame.index)
+
+
+# ---------------------------
+# Company index
+# ---------------------------
+class CompanyIndex:
+    """Companies parsed once into a sparse skill-by-company matrix (an inverted index from skill to companies)
+
+    Scoring a resume is the product of its 0/1 skill vector with that matrix, computed as one
+    bincount over the postings of the skills it actually has; filters are integer-code lookups.
+    """
+
+    def __init__(self, frame):
+        frame = frame.reset_index(drop=True)
+        self.names = _column(frame, 'company').fillna("").astype(str).str.strip().to_numpy()
+        self.roles = _column(frame, 'role').fillna("").astype(str).str.strip().to_numpy()
+        self.locations = _column(frame, 'location').fillna("").astype(str).str.strip().to_numpy()
+        self.websites = _column(frame, 'website').fillna("").astype(str).str.strip().to_numpy()
+
+        self.skill_ids = {}
+        self.skill_labels = []
+        rows, cols = [], []
+        for company, skills in enumerate(_column(frame, 'skills').fillna("").astype(str)):
+            seen = set()
+            for label in skills.split(','):
+                key = skill_key(label)
+                if not key or key in seen:
+                    continue
+                seen.add(key)
+                if key not in self.skill_ids:
+                    self.skill_ids[key] = len(self.skill_labels)
+                    self.skill_labels.append(label.strip())
+                rows.append(self.skill_ids[key])
+                cols.append(company)
+
+        n_companies, n_skills = len(frame), len(self.skill_labels)
+        ones = np.ones(len(rows), dtype=np.float32)
+        self.skill_matrix = csr_matrix((ones, (rows, cols)), shape=(n_skills, n_companies))
+        self.company_skills = self.skill_matrix.T.tocsr()
+        self.total_skills = np.diff(self.company_skills.indptr)
+        self.max_words = max((len(key.split()) for key in list(self.skill_ids) + list(CONTEXT_ALIASES)), default=1)
+
+        # Role / location filters compare small integer codes instead of strings
+        self.role_codes, role_values = pd.factorize(pd.Series(self.roles).str.lower())
+        self.location_codes, location_values = pd.factorize(pd.Series(self.locations).str.lower())
+        self.role_lookup = {value: code for code, value in enumerate(role_values)}
+        self.location_lookup = {value: code for code, value in enumerate(location_values)}
+
+    def __len__(self):
+        return len(self.names)
+
+    def skills_in(self, text):
+        """Canonical keys of the indexed skills mentioned in a (raw) resume text"""
+        tokens = SKILL_TOKEN_RE.findall(str(text).lower())
+        found = set()
+        for n in range(1, self.max_words + 1):
+            for i in range(len(tokens) - n + 1):
+                gram = " ".join(tokens[i:i + n]) if n > 1 else tokens[i]
+                key = _canonical(gram)
+                if key in CONTEXT_SKILLS and gram not in CONTEXT_ALIASES:
+                    continue
+                if key in self.skill_ids:
+                    found.add(key)
+        return sorted(found)
+
+    def _codes(self, lookup, values):
+        return [lookup[v] for v in values if v in lookup]
+
+    def _code_mask(self, lookup, codes):
+        mask = np.zeros(len(lookup), dtype=bool)
+        mask[codes] = True
+        return mask
+
+    def recommend(self, skills, category=None, location=None, top_k=COMPANY_TOP_K):
+        """Top-k companies by share of their required skills the resume covers
+
+        Companies are restricted to the roles mapped to `category` (when any exist in the index)
+        and to `location`, which may be a comma-separated list.
+        """
+        ids = [self.skill_ids[s] for s in skills if s in self.skill_ids]
+        if not ids or not len(self):
+            return []
+        # query @ skill_matrix for a 0/1 query vector: count how often each company appears in the
+        # postings of the resume's skills
+        indptr, postings = self.skill_matrix.indptr, self.skill_matrix.indices
+        counts = np.bincount(
+            np.concatenate([postings[indptr[j]:indptr[j + 1]] for j in ids]), minlength=len(self)
+        )
+
+        keep = counts > 0
+        role_codes = self._codes(self.role_lookup, [r.lower() for r in CATEGORY_ROLES.get(category, [])])
+        if role_codes:
+            keep &= self._code_mask(self.role_lookup, role_codes)[self.role_codes]
+        if location:
+            wanted = [loc.strip().lower() for loc in str(location).split(',') if loc.strip()]
+            keep &= self._code_mask(self.location_lookup, self._codes(self.location_lookup, wanted))[self.location_codes]
+        candidates = np.flatnonzero(keep)
+        matched = counts[candidates]
+        if not len(candidates):
+            return []
+
+        share = matched / self.total_skills[candidates]
+        # Coverage first, then number of matched skills, then file order
+        key = share + matched * 1e-9
+        if len(candidates) > top_k:
+            # Everything above the k-th best key, then the earliest rows tied with it (candidates are ascending)
+            threshold = -np.partition(-key, top_k - 1)[top_k - 1]
+            better = np.flatnonzero(key > threshold)
+            tied = np.flatnonzero(key == threshold)[:top_k - len(better)]
+            top = np.concatenate([better, tied])
+        else:
+            top = np.arange(len(candidates))
+        top = top[np.lexsort((candidates[top], -key[top]))]
+
+        query_ids = set(ids)
+        results = []
+        for i in top:
+            company = candidates[i]
+            row = self.company_skills.indices[self.company_skills.indptr[company]:self.company_skills.indptr[company + 1]]
+            results.append({
+                "company": self.names[company],
+                "role": self.roles[company],
+                "location": self.locations[company],
+                "website": self.websites[company],
+                "match_percent": round(float(share[i]) * 100, 1),
+                "matched_skills": int(matched[i]),
+                "total_skills": int(self.total_skills[company]),
+                "matching_skills": [self.skill_labels[j] for j in row if j in query_ids]
+            })
+        return results
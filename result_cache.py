@@ -0,0 +1,131 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+RESULT_CACHE_SIZE = int(os.environ.get('RESULT_CACHE_SIZE', 1024))
+# Path of the optional SQLite tier, e.g. result_cache.sqlite3 next to app.py ('' = memory only)
+RESULT_CACHE_DB = os.environ.get('RESULT_CACHE_DB', '')
+# Model versions whose rows the SQLite tier keeps: the current one and the one before it, so workers
+# still on the previous version during a rolling reload do not lose their rows
+RESULT_CACHE_KEEP_VERSIONS = int(os.environ.get('RESULT_CACHE_KEEP_VERSIONS', 2))
+
+
+# ---------------------------
+# Two-tier result cache
+# ---------------------------
+class ResultCache:
+    """Prediction responses keyed on sha256(upload bytes) + model version
+
+    Tier 1 is a bounded in-memory LRU; tier 2 is an optional SQLite table shared by every worker
+    on the host. Entries for other model versions are never returned, so retraining invalidates the
+    cache automatically; rows of versions older than the last keep_versions activated are purged
+    from disk when a model is activated.
+    """
+
+    def __init__(self, max_entries=RESULT_CACHE_SIZE, db_path=RESULT_CACHE_DB,
+                 keep_versions=RESULT_CACHE_KEEP_VERSIONS):
+        self.max_entries = max_entries
+        self.keep_versions = keep_versions
+        self.db_path = db_path or None
+        self.model_version = None
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = None
+        self._conn_pid = None
+
+    @property
+    def _db(self):
+        """SQLite connection for this process; reopened after a fork (preforked servers load the app first)"""
+        if not self.db_path:
+            return None
+        if self._conn is None or self._conn_pid != os.getpid():
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "key TEXT PRIMARY KEY, model_version TEXT NOT NULL, response TEXT NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS versions (model_version TEXT PRIMARY KEY, activated_at REAL NOT NULL)"
+            )
+            self._conn_pid = os.getpid()
+        return self._conn
+
+    def set_model_version(self, model_version):
+        """Switch to a new model: drop the memory tier and purge rows of versions that are no longer
+        among the last keep_versions activated (by any worker) from disk"""
+        with self._lock:
+            if model_version == self.model_version:
+                return
+            self.model_version = model_version
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT INTO versions (model_version, activated_at) VALUES (?, ?) "
+                    "ON CONFLICT (model_version) DO UPDATE SET activated_at = excluded.activated_at",
+                    (str(model_version), time.time())
+                )
+                self._db.execute(
+                    "DELETE FROM versions WHERE model_version NOT IN "
+                    "(SELECT model_version FROM versions ORDER BY activated_at DESC LIMIT ?)", (self.keep_versions,)
+                )
+                self._db.execute("DELETE FROM results WHERE model_version NOT IN (SELECT model_version FROM versions)")
+
+    def key_for(self, data):
+        return f"{hashlib.sha256(data).hexdigest()}:{self.model_version}"
+
+    def get(self, key):
+        with self._lock:
+            response = self._memory.get(key)
+            if response is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return response
+            if self._db is not None:
+                row = self._db.execute("SELECT response FROM results WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    response = json.loads(row[0])
+                    self._remember(key, response)
+                    self.hits += 1
+                    self.disk_hits += 1
+                    return response
+            self.misses += 1
+            return None
+
+    def put(self, key, response):
+        with self._lock:
+            self._remember(key, response)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO results (key, model_version, response) VALUES (?, ?, ?)",
+                    (key, str(self.model_version), json.dumps(response))
+                )
+
+    def _remember(self, key, response):
+        self._memory[key] = response
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            stats = {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else None,
+                'memory_entries': len(self._memory),
+                'max_entries': self.max_entries,
+                'model_version': self.model_version
+            }
+            if self._db is not None:
+                stats['disk_hits'] = self.disk_hits
+                stats['disk_entries'] = self._db.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+            return stats
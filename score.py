@@ -0,0 +1,288 @@
+"""
+Bulk scoring: re-score a whole resume archive with the serving model, without the HTTP API.
+
+    python score.py resumes/ scores.csv                        # directory of PDFs (recursive)
+    python score.py UpdatedResumeDataSet.csv scores.parquet    # CSV with a Resume column
+    python score.py resumes/ scores.csv --model <version>      # a specific registry version
+
+Inputs stream through in fixed-size chunks: PDF text is extracted by a process pool one chunk
+ahead while the current chunk goes through one batched predict_proba call (app.make_batch_predictions,
+so scores match the API). Results are appended chunk by chunk to a CSV file or to one Parquet part
+file per chunk in an output directory. After each chunk a checkpoint (<output>.checkpoint.json)
+records how far the run got. Re-running the same command after a crash continues from there.
+"""
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from pdf_extract import extract_pdf
+
+try:
+    import pyarrow  # noqa: F401  (Parquet output only)
+except ImportError:
+    pyarrow = None
+
+SCORE_CHUNK_SIZE = int(os.environ.get('SCORE_CHUNK_SIZE', 256))
+SCORE_WORKERS = int(os.environ.get('SCORE_WORKERS', os.cpu_count() or 1))
+OUTPUT_COLUMNS = [
+    'id', 'predicted_internship', 'confidence', 'prediction_quality', 'top_predictions',
+    'word_count', 'years_experience', 'detected_skills', 'label', 'model_version', 'error'
+]
+
+
+# ---------------------------
+# Inputs
+# ---------------------------
+def list_pdfs(directory):
+    paths = []
+    for root, dirs, files in os.walk(directory):
+        dirs.sort()
+        paths.extend(os.path.join(root, name) for name in sorted(files) if name.lower().endswith('.pdf'))
+    return paths
+
+
+def input_fingerprint(source, pdfs=None):
+    """Identifies the input a checkpoint belongs to: the file listing of a directory, size + mtime of a CSV"""
+    if pdfs is not None:
+        digest = hashlib.sha256("\n".join(os.path.relpath(p, source) for p in pdfs).encode())
+        return f"pdfs:{len(pdfs)}:{digest.hexdigest()[:16]}"
+    stat = os.stat(source)
+    return f"csv:{stat.st_size}:{stat.st_mtime_ns}"
+
+
+def _extract_file(path):
+    """Process-pool task: (text, error) for one PDF"""
+    try:
+        # Already in a pool process: extract here rather than in a nested deadline pool
+        text, _ = extract_pdf(path, max_seconds=0)
+    except Exception as e:
+        return "", f"{type(e).__name__}: {e}"
+    return text, None if text else "Failed to extract text"
+
+
+def pdf_chunks(source, pdfs, chunk_size, skip_chunks, pool):
+    """Yield (ids, texts, errors, labels) per chunk; the next chunk is extracted while the caller scores this one"""
+    starts = range(skip_chunks * chunk_size, len(pdfs), chunk_size)
+    pending = None
+    for start in list(starts) + [None]:
+        submitted = None
+        if start is not None:
+            paths = pdfs[start:start + chunk_size]
+            submitted = (paths, [pool.submit(_extract_file, path) for path in paths])
+        if pending is not None:
+            paths, futures = pending
+            extracted = [future.result() for future in futures]
+            yield ([os.path.relpath(p, source) for p in paths], [text for text, _ in extracted],
+                   [error for _, error in extracted], [None] * len(paths))
+        pending = submitted
+
+
+def csv_chunks(source, chunk_size, skip_chunks, text_column, id_column, label_column):
+    offset = 0
+    for i, chunk in enumerate(pd.read_csv(source, chunksize=chunk_size)):
+        if i >= skip_chunks:
+            if text_column not in chunk.columns:
+                raise SystemExit(f"❌ {source} has no {text_column!r} column (use --text-column)")
+            texts = chunk[text_column].fillna("").astype(str).tolist()
+            ids = chunk[id_column].astype(str).tolist() if id_column else [str(offset + j) for j in range(len(chunk))]
+            labels = chunk[label_column].tolist() if label_column in chunk.columns else [None] * len(chunk)
+            yield ids, texts, [None if text.strip() else "Empty resume text" for text in texts], labels
+        offset += len(chunk)
+
+
+# ---------------------------
+# Scoring
+# ---------------------------
+def score_chunk(app, ids, texts, errors, labels):
+    """Output rows for one chunk; failed inputs keep their row with the error filled in"""
+    rows = [dict.fromkeys(OUTPUT_COLUMNS) for _ in ids]
+    for row, item_id, error, label in zip(rows, ids, errors, labels):
+        row.update(id=item_id, error=error, label=label, model_version=app.model_version)
+    ok = [i for i, error in enumerate(errors) if error is None]
+    if ok:
+        analyses, feature_list = app.make_batch_predictions([texts[i] for i in ok])
+        for i, analysis, features in zip(ok, analyses, feature_list):
+            response = app.build_prediction_response(analysis, features)
+            extracted = response['extracted_features']
+            rows[i].update(
+                predicted_internship=analysis['primary_prediction'],
+                confidence=analysis['confidence'],
+                prediction_quality=analysis['prediction_quality'],
+                top_predictions=json.dumps(analysis['top_3_predictions']),
+                word_count=extracted['word_count'],
+                years_experience=extracted['years_experience'],
+                detected_skills="; ".join(extracted['detected_skills'])
+            )
+    return pd.DataFrame(rows, columns=OUTPUT_COLUMNS)
+
+
+# ---------------------------
+# Output + checkpoint
+# ---------------------------
+class CsvOutput:
+    def __init__(self, path):
+        self.path = path
+
+    def reset(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def truncate(self, checkpoint):
+        """Drop anything appended after the last checkpoint (a chunk cut short by a crash)"""
+        size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        if size < checkpoint['output_bytes']:
+            raise SystemExit(f"❌ {self.path} is shorter than its checkpoint; re-run with --restart")
+        if size:
+            with open(self.path, 'r+b') as f:
+                f.truncate(checkpoint['output_bytes'])
+
+    def append(self, frame, chunk_index):
+        header = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+        with open(self.path, 'a', newline='', encoding='utf-8') as f:
+            frame.to_csv(f, header=header, index=False)
+            f.flush()
+            os.fsync(f.fileno())
+        return os.path.getsize(self.path)
+
+
+class ParquetOutput:
+    def __init__(self, path):
+        if pyarrow is None:
+            raise SystemExit("❌ Parquet output needs pyarrow (pip install pyarrow), or write a .csv")
+        self.path = path
+
+    def _parts(self):
+        return sorted(name for name in os.listdir(self.path) if name.endswith('.parquet')) \
+            if os.path.isdir(self.path) else []
+
+    def reset(self):
+        for name in self._parts():
+            os.remove(os.path.join(self.path, name))
+
+    def truncate(self, checkpoint):
+        for name in self._parts()[checkpoint['chunks_done']:]:
+            os.remove(os.path.join(self.path, name))
+
+    def append(self, frame, chunk_index):
+        os.makedirs(self.path, exist_ok=True)
+        part = os.path.join(self.path, f"part-{chunk_index:06d}.parquet")
+        frame.to_parquet(part + '.tmp', engine='pyarrow', index=False)
+        os.replace(part + '.tmp', part)
+        return None
+
+
+def read_checkpoint(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def write_checkpoint(path, checkpoint):
+    tmp = path + '.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(checkpoint, f, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def run(args):
+    output = ParquetOutput(args.output) if args.format == 'parquet' else CsvOutput(args.output)
+    checkpoint_path = args.output.rstrip(os.sep) + '.checkpoint.json'
+    is_dir = os.path.isdir(args.input)
+    pdfs = list_pdfs(args.input) if is_dir else None
+    fingerprint = input_fingerprint(args.input, pdfs)
+
+    if args.kind:
+        os.environ['SERVING_MODEL'] = args.kind
+    import app  # after SERVING_MODEL is set; PDF workers never import it
+    if not app.load_model(args.model):
+        raise SystemExit("❌ No servable model")
+
+    checkpoint = None if args.restart else read_checkpoint(checkpoint_path)
+    if checkpoint is not None:
+        expected = {'input_fingerprint': fingerprint, 'model_version': app.model_version, 'chunk_size': args.chunk_size}
+        changed = [key for key, value in expected.items() if checkpoint.get(key) != value]
+        if changed:
+            raise SystemExit(f"❌ {checkpoint_path} was written for a different {', '.join(changed)}; "
+                             f"re-run with --restart to score from scratch")
+        output.truncate(checkpoint)
+        print(f"↩️ Resuming after chunk {checkpoint['chunks_done']} ({checkpoint['rows_done']} rows already scored)")
+    else:
+        if os.path.exists(args.output) and not args.restart:
+            raise SystemExit(f"❌ {args.output} already exists; pass --restart to overwrite it")
+        output.reset()
+        checkpoint = {
+            'input': os.path.abspath(args.input), 'input_fingerprint': fingerprint,
+            'model_version': app.model_version, 'chunk_size': args.chunk_size, 'format': args.format,
+            'chunks_done': 0, 'rows_done': 0, 'errors': 0, 'output_bytes': 0
+        }
+
+    pool = None
+    if is_dir:
+        # spawn: workers import only this module's top level (pdf_extract), never the model
+        pool = ProcessPoolExecutor(max_workers=args.workers, mp_context=multiprocessing.get_context('spawn'))
+        chunks = pdf_chunks(args.input, pdfs, args.chunk_size, checkpoint['chunks_done'], pool)
+        total = len(pdfs)
+    else:
+        chunks = csv_chunks(args.input, args.chunk_size, checkpoint['chunks_done'],
+                            args.text_column, args.id_column, args.label_column)
+        total = None
+
+    start, rows = time.perf_counter(), 0
+    try:
+        for ids, texts, errors, labels in chunks:
+            frame = score_chunk(app, ids, texts, errors, labels)
+            output_bytes = output.append(frame, checkpoint['chunks_done'])
+            checkpoint['chunks_done'] += 1
+            checkpoint['rows_done'] += len(frame)
+            checkpoint['errors'] += int(frame['error'].notna().sum())
+            checkpoint['output_bytes'] = output_bytes
+            write_checkpoint(checkpoint_path, checkpoint)
+            rows += len(frame)
+            rate = rows / (time.perf_counter() - start)
+            progress = f"{checkpoint['rows_done']}/{total}" if total else str(checkpoint['rows_done'])
+            print(f"📦 chunk {checkpoint['chunks_done']}: {progress} rows, {rate:.1f} rows/s, "
+                  f"{checkpoint['errors']} errors", flush=True)
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+    checkpoint['complete'] = True
+    write_checkpoint(checkpoint_path, checkpoint)
+    elapsed = time.perf_counter() - start
+    print(f"✅ Scored {checkpoint['rows_done']} rows with model {app.model_version} -> {args.output} "
+          f"({rows} this run in {elapsed:.1f}s, {checkpoint['errors']} errors)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score a directory of PDF resumes or a resume CSV in bulk")
+    parser.add_argument('input', help="directory of PDFs, or a CSV shaped like UpdatedResumeDataSet.csv")
+    parser.add_argument('output', help="results .csv file, or .parquet directory of per-chunk part files")
+    parser.add_argument('--format', choices=['csv', 'parquet'], help="default: from the output suffix")
+    parser.add_argument('--model', help="registry version to score with (default: the active SERVING_MODEL)")
+    parser.add_argument('--kind', choices=['full', 'fast', 'incremental'], help="overrides SERVING_MODEL")
+    parser.add_argument('--chunk-size', type=int, default=SCORE_CHUNK_SIZE, help="resumes per batch / checkpoint")
+    parser.add_argument('--workers', type=int, default=SCORE_WORKERS, help="PDF extraction processes")
+    parser.add_argument('--text-column', default='Resume')
+    parser.add_argument('--id-column', help="CSV column to use as id (default: row number)")
+    parser.add_argument('--label-column', default='Category', help="copied to the output when present")
+    parser.add_argument('--restart', action='store_true', help="ignore any checkpoint and overwrite the output")
+    args = parser.parse_args(argv)
+    args.format = args.format or ('parquet' if args.output.rstrip(os.sep).endswith('.parquet') else 'csv')
+    if not os.path.exists(args.input):
+        sys.exit(f"❌ {args.input} not found")
+    run(args)
+
+
+if __name__ == "__main__":
+    main()
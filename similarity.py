@@ -0,0 +1,371 @@
+"""
+Similar-resume search over the TF-IDF space of the trained pipeline.
+
+    python similarity.py build [--data UpdatedResumeDataSet.csv] [--model VERSION]
+    python similarity.py compact        # fold resumes added through /similar into the base index
+
+The index stores L2-normalised TF-IDF rows (cosine similarity is a dot product) together with
+random-hyperplane LSH signatures. Up to SIMILAR_BRUTE_FORCE_MAX rows a query is scored against
+every row; above that only rows sharing a signature bucket with the query (in any of the hash
+tables, plus a few nearest buckets) are re-scored exactly.
+"""
+import argparse
+import fcntl
+import json
+import os
+import shutil
+import threading
+import time
+
+import joblib
+import numpy as np
+from scipy.sparse import csr_matrix, vstack
+
+from features import clean_text
+
+SIMILAR_INDEX_DIR = os.environ.get('SIMILAR_INDEX_DIR', 'similar_index')
+SIMILAR_TOP_K = int(os.environ.get('SIMILAR_TOP_K', 5))
+# Above this many indexed rows queries switch from exact brute force to LSH candidates
+SIMILAR_BRUTE_FORCE_MAX = int(os.environ.get('SIMILAR_BRUTE_FORCE_MAX', 100000))
+SIMILAR_LSH_TABLES = int(os.environ.get('SIMILAR_LSH_TABLES', 12))
+# Extra buckets probed per table: the query's code with one low-margin bit flipped
+SIMILAR_LSH_PROBES = int(os.environ.get('SIMILAR_LSH_PROBES', 4))
+# Target rows per LSH bucket; the number of bits per table follows from the corpus size
+LSH_BUCKET_ROWS = 32
+SIGNATURE_CHUNK_ROWS = 65536
+
+CURRENT_NAME = 'CURRENT'
+META_NAME = 'meta.json'
+VECTORIZER_NAME = 'vectorizer.joblib'
+INSERTS_NAME = 'inserts.jsonl'
+ARRAYS = ('data', 'indices', 'indptr', 'ids', 'labels', 'planes', 'codes', 'order', 'sorted_codes')
+KEEP_BUILDS = 2
+
+
+# ---------------------------
+# LSH signatures
+# ---------------------------
+def lsh_bits(rows):
+    return int(np.clip(np.ceil(np.log2(max(rows, 1) / LSH_BUCKET_ROWS)), 4, 24))
+
+
+def bucket_codes(projected, n_tables):
+    """Pack the signs of projections onto the random hyperplanes into one code per row and table"""
+    n_bits = projected.shape[1] // n_tables
+    bits = (projected > 0).reshape(-1, n_tables, n_bits)
+    return (bits * (1 << np.arange(n_bits, dtype=np.uint32))).sum(axis=2, dtype=np.uint32)
+
+
+def signatures(vectors, planes, n_tables):
+    codes = np.empty((vectors.shape[0], n_tables), dtype=np.uint32)
+    for start in range(0, vectors.shape[0], SIGNATURE_CHUNK_ROWS):
+        codes[start:start + SIGNATURE_CHUNK_ROWS] = bucket_codes(
+            np.asarray(vectors[start:start + SIGNATURE_CHUNK_ROWS] @ planes), n_tables)
+    return codes
+
+
+def bucket_tables(codes):
+    """Per table: row ids sorted by bucket code, and the sorted codes (for searchsorted lookups)"""
+    order = np.argsort(codes, axis=0, kind='stable').T.astype(np.int32)
+    sorted_codes = np.take_along_axis(codes.T, order, axis=1)
+    return np.ascontiguousarray(order), np.ascontiguousarray(sorted_codes)
+
+
+def _as_float32(vectors):
+    vectors = csr_matrix(vectors, dtype=np.float32)
+    vectors.sort_indices()
+    return vectors
+
+
+def _top(scores, k):
+    """Indices of the k largest scores, best first (ties: lowest index)"""
+    if len(scores) > k:
+        candidates = np.argpartition(-scores, k - 1)[:k]
+        return candidates[np.lexsort((candidates, -scores[candidates]))]
+    return np.argsort(-scores, kind='stable')
+
+
+# ---------------------------
+# Index
+# ---------------------------
+class SimilarityIndex:
+    """Persisted nearest-neighbour index; arrays are memory-mapped, so preforked workers share them
+
+    New rows are appended to the build's inserts.jsonl (by any worker) and picked up by every
+    process on its next query; `compact` folds them into the base arrays.
+    """
+
+    def __init__(self, index_dir=SIMILAR_INDEX_DIR):
+        self.index_dir = index_dir
+        self._lock = threading.Lock()
+        self._build = None
+        self._state = None
+        self.refresh()
+
+    @classmethod
+    def open(cls, index_dir=SIMILAR_INDEX_DIR):
+        """The index under index_dir, or None when none has been built"""
+        if not os.path.exists(os.path.join(index_dir, CURRENT_NAME)):
+            return None
+        return cls(index_dir)
+
+    def _current_build(self):
+        with open(os.path.join(self.index_dir, CURRENT_NAME)) as f:
+            return f.read().strip()
+
+    def _load(self, build):
+        path = os.path.join(self.index_dir, build)
+        with open(os.path.join(path, META_NAME)) as f:
+            meta = json.load(f)
+        arrays = {name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode='r') for name in ARRAYS}
+        vectors = csr_matrix((arrays['data'], arrays['indices'], arrays['indptr']), shape=tuple(meta['shape']), copy=False)
+        return {
+            'meta': meta,
+            'vectorizer': joblib.load(os.path.join(path, VECTORIZER_NAME)),
+            'vectors': vectors,
+            'arrays': arrays,
+            'inserts_path': os.path.join(path, INSERTS_NAME),
+            'inserts_offset': 0,
+            'pending': csr_matrix((0, meta['shape'][1]), dtype=np.float32),
+            'pending_ids': [],
+            'pending_labels': [],
+        }
+
+    def refresh(self):
+        """Follow a rebuilt/compacted index and pick up rows other workers have inserted"""
+        with self._lock:
+            build = self._current_build()
+            if build != self._build:
+                self._state = self._load(build)
+                self._build = build
+            state = self._state
+            try:
+                size = os.path.getsize(state['inserts_path'])
+            except FileNotFoundError:
+                size = 0
+            if size > state['inserts_offset']:
+                state = self._read_inserts(state)
+            return state
+
+    def _read_inserts(self, state):
+        rows, ids, labels = [], [], []
+        with open(state['inserts_path'], 'rb') as f:
+            f.seek(state['inserts_offset'])
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break  # a write in progress; read it next time
+                state['inserts_offset'] += len(line)
+                entry = json.loads(line)
+                rows.append(entry)
+                ids.append(entry['id'])
+                labels.append(entry['label'])
+        if rows:
+            dim = state['meta']['shape'][1]
+            indptr = np.cumsum([0] + [len(r['indices']) for r in rows])
+            added = csr_matrix((np.concatenate([r['data'] for r in rows]).astype(np.float32),
+                                np.concatenate([r['indices'] for r in rows]).astype(np.int32), indptr),
+                               shape=(len(rows), dim))
+            # A new state dict, so searches already holding the old one are unaffected
+            self._state = state = {**state, 'pending': vstack([state['pending'], added], format='csr'),
+                                   'pending_ids': state['pending_ids'] + ids,
+                                   'pending_labels': state['pending_labels'] + labels}
+        return state
+
+    def __len__(self):
+        state = self._state
+        return state['vectors'].shape[0] + state['pending'].shape[0]
+
+    def info(self):
+        state = self._state
+        return {
+            'build': self._build,
+            'rows': len(self),
+            'pending_inserts': state['pending'].shape[0],
+            'method': 'brute_force' if state['vectors'].shape[0] <= SIMILAR_BRUTE_FORCE_MAX else 'lsh',
+            'model_version': state['meta'].get('model_version')
+        }
+
+    def vectorize(self, texts, cleaned=False):
+        state = self._state
+        texts = texts if cleaned else [clean_text(t) for t in texts]
+        return _as_float32(state['vectorizer'].transform(texts))
+
+    def _lsh_candidates(self, state, query):
+        arrays = state['arrays']
+        n_tables = state['meta']['lsh_tables']
+        projected = np.asarray(query @ arrays['planes'])
+        codes = bucket_codes(projected, n_tables)
+        margins = np.abs(projected[0]).reshape(n_tables, -1)
+        found = []
+        for table in range(n_tables):
+            probes = [codes[0, table]]
+            # Multi-probe: the bits the query is least sure about are the likeliest to differ for a neighbour
+            for bit in np.argsort(margins[table])[:SIMILAR_LSH_PROBES]:
+                probes.append(codes[0, table] ^ np.uint32(1 << int(bit)))
+            sorted_codes, order = arrays['sorted_codes'][table], arrays['order'][table]
+            for code in probes:
+                lo, hi = np.searchsorted(sorted_codes, code, 'left'), np.searchsorted(sorted_codes, code, 'right')
+                found.append(order[lo:hi])
+        return np.unique(np.concatenate(found)) if found else np.empty(0, dtype=np.int32)
+
+    def search(self, query, k=SIMILAR_TOP_K, method='auto', exclude=None):
+        """Top-k rows by cosine similarity to one query vector (1 x dim CSR)"""
+        state = self.refresh()
+        vectors, arrays, categories = state['vectors'], state['arrays'], state['meta']['categories']
+        if method == 'auto':
+            method = 'brute_force' if vectors.shape[0] <= SIMILAR_BRUTE_FORCE_MAX else 'lsh'
+
+        dense = query.toarray().ravel()
+        if method == 'lsh':
+            rows = self._lsh_candidates(state, query)
+            scores = vectors[rows] @ dense
+        else:
+            rows = None
+            scores = vectors @ dense
+        pending_scores = state['pending'] @ dense
+
+        hits = []
+        for i in _top(scores, k + 1):  # one spare in case the query itself is indexed
+            row = int(rows[i]) if rows is not None else int(i)
+            hits.append((float(scores[i]), arrays['ids'][row].decode(), categories[arrays['labels'][row]], 'corpus'))
+        for i in _top(pending_scores, k + 1):
+            hits.append((float(pending_scores[i]), state['pending_ids'][i], state['pending_labels'][i], 'upload'))
+        hits.sort(key=lambda hit: -hit[0])
+        results = [
+            {'id': id_, 'category': label, 'similarity': round(score, 4), 'source': source}
+            for score, id_, label, source in hits if id_ != exclude and score > 0
+        ][:k]
+        return results, {'method': method, 'candidates': len(scores) + len(pending_scores)}
+
+    def contains(self, item_id):
+        state = self.refresh()
+        return item_id in state['pending_ids'] or bool(np.any(state['arrays']['ids'] == item_id.encode()))
+
+    def add(self, item_id, label, vector):
+        """Append one row to the insert log (visible to every worker); False if item_id is already indexed"""
+        while True:
+            if self.contains(item_id):
+                return False
+            state = self._state
+            with open(state['inserts_path'], 'ab') as f:
+                fcntl.flock(f, fcntl.LOCK_EX)
+                # A compaction may have switched builds while we waited for the lock
+                if self._current_build() != self._build:
+                    continue
+                line = json.dumps({'id': item_id, 'label': label, 'indices': vector.indices.tolist(),
+                                   'data': [round(float(x), 6) for x in vector.data]})
+                f.write(line.encode() + b'\n')
+            self.refresh()
+            return True
+
+
+# ---------------------------
+# Build / compact
+# ---------------------------
+def write_build(vectors, ids, labels, vectorizer, meta, index_dir=SIMILAR_INDEX_DIR, planes=None, codes=None,
+                seed=42):
+    """Write a complete build directory; returns its name. `planes`/`codes` are reused when compacting"""
+    vectors = _as_float32(vectors)
+    categories = sorted(set(labels) | set(meta.get('categories', [])))
+    n_tables = meta.get('lsh_tables', SIMILAR_LSH_TABLES)
+    if planes is None:
+        n_bits = lsh_bits(vectors.shape[0])
+        planes = np.random.default_rng(seed).standard_normal((vectors.shape[1], n_tables * n_bits)).astype(np.float32)
+    if codes is None or len(codes) < vectors.shape[0]:
+        new_codes = signatures(vectors[0 if codes is None else len(codes):], planes, n_tables)
+        codes = new_codes if codes is None else np.concatenate([codes, new_codes])
+    order, sorted_codes = bucket_tables(codes)
+    lookup = {c: i for i, c in enumerate(categories)}
+
+    build = time.strftime('%Y%m%d%H%M%S') + f"-{os.getpid()}"
+    path = os.path.join(index_dir, build)
+    os.makedirs(path)
+    arrays = {
+        'data': vectors.data, 'indices': vectors.indices.astype(np.int32), 'indptr': vectors.indptr.astype(np.int64),
+        'ids': np.array([str(i).encode() for i in ids], dtype='S40'),
+        'labels': np.array([lookup[label] for label in labels], dtype=np.int16),
+        'planes': planes, 'codes': codes, 'order': order, 'sorted_codes': sorted_codes
+    }
+    for name, array in arrays.items():
+        np.save(os.path.join(path, f"{name}.npy"), array)
+    joblib.dump(vectorizer, os.path.join(path, VECTORIZER_NAME))
+    with open(os.path.join(path, META_NAME), 'w') as f:
+        json.dump({**meta, 'shape': list(vectors.shape), 'categories': categories, 'lsh_tables': n_tables,
+                   'lsh_bits': planes.shape[1] // n_tables, 'built_at': time.time()}, f, indent=2)
+    open(os.path.join(path, INSERTS_NAME), 'ab').close()
+    return build
+
+
+def set_current(build, index_dir=SIMILAR_INDEX_DIR):
+    pointer = os.path.join(index_dir, CURRENT_NAME)
+    with open(f"{pointer}.tmp", 'w') as f:
+        f.write(build)
+    os.replace(f"{pointer}.tmp", pointer)
+    builds = sorted(name for name in os.listdir(index_dir) if os.path.isdir(os.path.join(index_dir, name)))
+    for old in builds[:-KEEP_BUILDS]:
+        if old != build:
+            shutil.rmtree(os.path.join(index_dir, old), ignore_errors=True)
+
+
+def training_vectorizer(version=None):
+    """The fitted TfidfVectorizer of a registered full model (default: the active one) and its version"""
+    import model_registry
+    from model_artifact import ARTIFACT_PATH, load_artifact
+    version = version or model_registry.active_version('full')
+    if version:
+        model_data, _ = model_registry.load_version(version, mmap_mode=None)
+    else:
+        model_data = load_artifact(ARTIFACT_PATH)
+    preprocessor = model_data['model'].named_steps['preprocessor']
+    return preprocessor.named_transformers_['text'], model_data.get('model_version')
+
+
+def build(args):
+    from train_model import load_data, drop_near_duplicates
+    start = time.perf_counter()
+    vectorizer, model_version = training_vectorizer(args.model)
+    df = load_data(args.data)
+    # Copies of one resume would crowd each other out of every top-k; index each once
+    df = drop_near_duplicates(df)
+    vectors = vectorizer.transform(df['resume_text'])
+    ids = [f"row:{i}" for i in df.index]
+    os.makedirs(args.index_dir, exist_ok=True)
+    name = write_build(vectors, ids, list(df['internship_type']), vectorizer,
+                       {'model_version': model_version, 'source': args.data}, args.index_dir)
+    set_current(name, args.index_dir)
+    print(f"✅ Indexed {len(ids)} resumes ({vectors.shape[1]} TF-IDF dims) as {name} in {time.perf_counter() - start:.2f}s")
+
+
+def compact(args):
+    index = SimilarityIndex.open(args.index_dir)
+    if index is None:
+        raise SystemExit("❌ No similarity index yet; run `python similarity.py build` first")
+    start = time.perf_counter()
+    old_path = os.path.join(args.index_dir, index._build)
+    with open(os.path.join(old_path, INSERTS_NAME), 'ab') as log:
+        # Writers block on this lock, then see the new build and append there instead
+        fcntl.flock(log, fcntl.LOCK_EX)
+        state = index.refresh()
+        arrays, meta = state['arrays'], state['meta']
+        categories = meta['categories']
+        vectors = vstack([state['vectors'], state['pending']], format='csr')
+        ids = [i.decode() for i in arrays['ids']] + state['pending_ids']
+        labels = [categories[c] for c in arrays['labels']] + state['pending_labels']
+        name = write_build(vectors, ids, labels, state['vectorizer'], meta, args.index_dir,
+                           planes=np.asarray(arrays['planes']), codes=np.asarray(arrays['codes']))
+        set_current(name, args.index_dir)
+    print(f"✅ Folded {len(state['pending_ids'])} inserted resumes into {name} "
+          f"({len(ids)} rows) in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build / compact the /similar nearest-neighbour index")
+    commands = parser.add_subparsers(dest='command', required=True)
+    build_parser = commands.add_parser('build', help="index the training corpus with a trained model's TF-IDF")
+    build_parser.add_argument('--data', default='UpdatedResumeDataSet.csv')
+    build_parser.add_argument('--model', help="registry version whose vectorizer to use (default: active full model)")
+    compact_parser = commands.add_parser('compact', help="fold resumes added via /similar into the base index")
+    for sub in (build_parser, compact_parser):
+        sub.add_argument('--index-dir', default=SIMILAR_INDEX_DIR)
+    args = parser.parse_args()
+    build(args) if args.command == 'build' else compact(args)
@@ -0,0 +1,186 @@
+"""
+Serving path that feeds the classifier without pandas.
+
+`compile_pipeline` reads a fitted Pipeline(ColumnTransformer, classifier) once, at model load,
+and turns every transformer into plain array operations on the feature columns from
+features.feature_arrays. The result is the same matrix ColumnTransformer would build: same
+values, same CSR layout, same dtype. The classifier is then called directly, so predictions
+are identical to pipeline.predict_proba(frame).
+Pipelines with transformers it does not know compile to None and are served by the pandas path.
+"""
+import numpy as np
+from scipy.sparse import csr_matrix, issparse
+from sklearn.compose import ColumnTransformer
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfVectorizer
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import FunctionTransformer, OneHotEncoder, StandardScaler
+
+from features import TEXT_COLUMN, column_default
+
+
+class UnsupportedPipeline(ValueError):
+    pass
+
+
+# ---------------------------
+# Compiled transformers
+# ---------------------------
+class _Text:
+    def __init__(self, vectorizer, column):
+        if column != TEXT_COLUMN:
+            raise UnsupportedPipeline(f"vectorizer over {column!r}")
+        self.vectorizer = vectorizer
+
+    def __call__(self, texts, columns, n):
+        return self.vectorizer.transform(texts)
+
+
+class _OneHot:
+    def __init__(self, encoder, column_names):
+        if encoder.drop_idx_ is not None or getattr(encoder, '_infrequent_enabled', False):
+            raise UnsupportedPipeline("OneHotEncoder with drop / infrequent categories")
+        self.column_names = column_names
+        self.sparse = encoder.sparse_output
+        self.ignore_unknown = encoder.handle_unknown != 'error'
+        self.lookups, self.offsets = [], []
+        offset = 0
+        for categories in encoder.categories_:
+            self.lookups.append({value: i for i, value in enumerate(categories.tolist())})
+            self.offsets.append(offset)
+            offset += len(categories)
+        self.width = offset
+
+    def __call__(self, texts, columns, n):
+        out = np.zeros((n, self.width), dtype=np.float64)
+        for name, lookup, offset in zip(self.column_names, self.lookups, self.offsets):
+            values = columns.get(name, column_default(name))
+            values = [values] * n if np.isscalar(values) else values
+            for row, value in enumerate(values):
+                index = lookup.get(value)
+                if index is None:
+                    if not self.ignore_unknown:
+                        raise ValueError(f"Found unknown categories [{value!r}] in column {name!r} during transform")
+                    continue
+                out[row, offset + index] = 1.0
+        return csr_matrix(out) if self.sparse else out
+
+
+def _numeric_block(columns, names, n):
+    return np.column_stack([
+        np.asarray(columns[name]) if name in columns else np.full(n, column_default(name)) for name in names
+    ]) if names else np.empty((n, 0))
+
+
+class _Scaler:
+    def __init__(self, scaler, column_names):
+        self.column_names = column_names
+        self.mean = scaler.mean_ if scaler.with_mean else None
+        self.scale = scaler.scale_ if scaler.with_std else None
+
+    def __call__(self, texts, columns, n):
+        X = _numeric_block(columns, self.column_names, n).astype(np.float64)
+        # Same operations, in the same order, as StandardScaler.transform
+        if self.mean is not None:
+            X -= self.mean
+        if self.scale is not None:
+            X /= self.scale
+        return X
+
+
+class _Function:
+    """FunctionTransformer; ColumnTransformer stores 'passthrough' as one with func=None"""
+
+    def __init__(self, transformer, column_names):
+        self.column_names = column_names
+        self.func = transformer.func
+        self.kw_args = transformer.kw_args or {}
+
+    def __call__(self, texts, columns, n):
+        X = _numeric_block(columns, self.column_names, n)
+        return X if self.func is None else self.func(X, **self.kw_args)
+
+
+def _compile_transformer(transformer, column_spec):
+    if isinstance(transformer, (TfidfVectorizer, HashingVectorizer)):
+        return _Text(transformer, column_spec)
+    if isinstance(column_spec, str) or not all(isinstance(c, str) for c in column_spec):
+        raise UnsupportedPipeline(f"column selector {column_spec!r}")
+    column_names = list(column_spec)
+    if isinstance(transformer, OneHotEncoder):
+        return _OneHot(transformer, column_names)
+    if isinstance(transformer, StandardScaler):
+        return _Scaler(transformer, column_names)
+    if isinstance(transformer, FunctionTransformer) and not transformer.validate:
+        return _Function(transformer, column_names)
+    raise UnsupportedPipeline(f"transformer {type(transformer).__name__}")
+
+
+# ---------------------------
+# Compiled pipeline
+# ---------------------------
+def _stack_csr(blocks, n):
+    """Horizontal stack into CSR with the layout of scipy.sparse.hstack(blocks).tocsr():
+    per row, blocks left to right, explicit zeros of dense blocks dropped"""
+    rows, cols, data = [], [], []
+    offset = 0
+    for block in blocks:
+        if issparse(block):
+            coo = block.tocoo()
+            block_rows, block_cols, block_data = coo.row, coo.col, coo.data
+        else:
+            block_rows, block_cols = np.nonzero(block)
+            block_data = block[block_rows, block_cols]
+        rows.append(block_rows)
+        cols.append(block_cols + offset)
+        data.append(block_data.astype(np.float64, copy=False))
+        offset += block.shape[1]
+    rows, cols, data = np.concatenate(rows), np.concatenate(cols), np.concatenate(data)
+    order = np.argsort(rows, kind='stable')
+    indptr = np.zeros(n + 1, dtype=np.int32)
+    np.cumsum(np.bincount(rows, minlength=n), out=indptr[1:])
+    return csr_matrix((data[order], cols[order].astype(np.int32), indptr), shape=(n, offset))
+
+
+class SparsePipeline:
+    def __init__(self, pipeline):
+        if not isinstance(pipeline, Pipeline) or len(pipeline.steps) != 2:
+            raise UnsupportedPipeline("expected Pipeline([preprocessor, classifier])")
+        preprocessor, self.classifier = pipeline.steps[0][1], pipeline.steps[1][1]
+        if not isinstance(preprocessor, ColumnTransformer):
+            raise UnsupportedPipeline(f"preprocessor {type(preprocessor).__name__}")
+        self.steps = []
+        get_weight = (preprocessor.transformer_weights or {}).get
+        for name, transformer, column_spec in preprocessor.transformers_:
+            if isinstance(transformer, str) and transformer == 'drop':
+                continue
+            if isinstance(transformer, str):
+                raise UnsupportedPipeline(f"transformer {transformer!r}")
+            if not isinstance(column_spec, str) and not len(column_spec):
+                continue  # ColumnTransformer skips empty selections too
+            self.steps.append((_compile_transformer(transformer, column_spec), get_weight(name)))
+        self.sparse_output = preprocessor.sparse_output_
+        self.classes_ = pipeline.classes_
+
+    def transform(self, cleaned_texts, columns):
+        """Model input for cleaned texts and their features.feature_arrays columns"""
+        n = len(cleaned_texts)
+        blocks = []
+        for step, weight in self.steps:
+            block = step(cleaned_texts, columns, n)
+            # transformer_weights: the same multiplication ColumnTransformer applies to the block
+            blocks.append(block if weight is None else block * weight)
+        if self.sparse_output:
+            return _stack_csr(blocks, n)
+        return np.hstack([block.toarray() if issparse(block) else block for block in blocks])
+
+    def predict_proba(self, X):
+        return self.classifier.predict_proba(X)
+
+
+def compile_pipeline(model):
+    """SparsePipeline for a fitted model, or None when it has to go through pandas"""
+    try:
+        return SparsePipeline(model)
+    except UnsupportedPipeline as e:
+        print(f"⚠️ Sparse inference unavailable ({e}); using the DataFrame path")
+        return None
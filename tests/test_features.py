@@ -0,0 +1,154 @@
+"""
+Parity of the compiled matchers in features.py / keyword_matcher.py with the original per-keyword
+`extract_features` loops from app.py, kept verbatim below as the reference (with the schema's
+category boost applied).
+"""
+import os
+import re
+
+import pandas as pd
+import pytest
+
+import features
+from keyword_matcher import KeywordMatcher, WordPatternMatcher
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+# ---------------------------
+# Reference implementation (pre-matcher)
+# ---------------------------
+CATEGORY_KEYWORD_BOOST = 5
+
+
+def reference_features(text):
+    features = {}
+    words = text.split()
+    features['word_count'] = len(words)
+    features['unique_words'] = len(set(words))
+    original_skills = [
+        'python', 'java', 'c++', 'sql', 'machine learning', 'deep learning',
+        'nlp', 'html', 'css', 'javascript', 'react', 'django', 'flask'
+    ]
+    for skill in original_skills:
+        features[f"skill_{skill}"] = 1 if skill in text else 0
+    features['has_btech'] = 1 if re.search(r'\bb\.?tech\b', text) else 0
+    features['has_mtech'] = 1 if re.search(r'\bm\.?tech\b', text) else 0
+    features['has_phd'] = 1 if re.search(r'\bph\.?d\b', text) else 0
+    features['has_mba'] = 1 if re.search(r'\bmba\b', text) else 0
+    features['has_bsc'] = 1 if re.search(r'\bb\.?sc\b', text) else 0
+    features['has_msc'] = 1 if re.search(r'\bm\.?sc\b', text) else 0
+    exp_patterns = [
+        r'(\d+)\s*(?:years?|yrs?)\s*(?:of\s*)?(?:experience|exp)',
+        r'(\d+)\s*(?:\+|plus)\s*(?:years?|yrs?)',
+        r'over\s+(\d+)\s*(?:years?|yrs?)',
+        r'since\s+(\d{4})'
+    ]
+    years = []
+    for p in exp_patterns:
+        for match in re.findall(p, text):
+            if isinstance(match, tuple):
+                match = match[0]
+            if match.isdigit():
+                if len(match) == 4:
+                    years.append(2025 - int(match))
+                else:
+                    years.append(int(match))
+    features['years_experience'] = max(years) if years else 0
+    project_keywords = [
+        'project', 'developed', 'built', 'implemented', 'designed',
+        'created', 'contributed', 'engineered'
+    ]
+    features['project_mentioned'] = int(any(kw in text for kw in project_keywords))
+    internship_keywords = ['internship', 'intern', 'trainee', 'apprentice', 'fellowship']
+    features['internship_mentioned'] = int(any(kw in text for kw in internship_keywords))
+    category_keywords = {
+        "Data Science": ['tensorflow', 'pytorch', 'pandas', 'numpy', 'scikit-learn', 'matplotlib', 'seaborn', 'jupyter'],
+        "Web Development": ['nodejs', 'angular', 'vue', 'bootstrap', 'express', 'typescript'],
+        "DevOps Engineer": ['docker', 'kubernetes', 'jenkins', 'terraform', 'ansible', 'aws', 'azure', 'gcp', 'ci/cd'],
+        "Automation Testing": ['selenium', 'pytest', 'junit', 'testng', 'cypress', 'automation framework'],
+        "Blockchain": ['blockchain', 'ethereum', 'solidity', 'smart contract', 'web3'],
+        "Mobile App Development": ['android', 'ios', 'flutter', 'react native', 'swift', 'kotlin'],
+        "Java Developer": ['spring boot', 'hibernate', 'jsp', 'servlets']
+    }
+    detected_category_keywords = {}
+    for category, keywords in category_keywords.items():
+        found = [kw for kw in keywords if kw in text]
+        features[f"{category.lower().replace(' ', '_')}_keywords"] = len(found) * CATEGORY_KEYWORD_BOOST
+        if found:
+            detected_category_keywords[category] = found
+    features['detected_category_keywords'] = detected_category_keywords
+    return features
+
+
+# ---------------------------
+# Parity
+# ---------------------------
+EDGE_CASES = [
+    "",
+    "   \t\n ",
+    # phrases: exact, split across lines / double spaces, glued, inside longer tokens
+    "machine learning and deep learning with spring boot and react native",
+    "machine\nlearning, deep  learning, spring-boot, reactnative",
+    "xmachine learningx built an automation framework for smart contracts",
+    "smart contract automation\tframework",
+    # punctuation inside keywords and degrees
+    "c++, ci/cd pipelines, node.js, scikit-learn, web3.js",
+    "b.tech, m.tech, ph.d, b.sc, m.sc, mba; btech/mtech/phd",
+    "(b.tech) [ph.d] mba's phd-level btechnology embassy",
+    # experience phrasing
+    "5 years of experience, 7+ yrs, over 10 years, since 2019, 3yrs exp",
+    # case: the reference is case-sensitive, so capitalised keywords must not match either
+    "Python Java SQL Machine Learning Docker AWS B.Tech MBA Internship",
+    "PYTHON developer with pandas NumPy and TensorFlow",
+    # substrings: 'intern' in 'international', 'java' in 'javascript', 'react' in 'reactjs'
+    "international javascript reactjs projects interned trainees",
+]
+
+
+@pytest.fixture(scope='module')
+def resumes():
+    return pd.read_csv(os.path.join(ROOT, 'UpdatedResumeDataSet.csv'))['Resume']
+
+
+def assert_same_features(texts):
+    for text in texts:
+        expected, actual = reference_features(text), features.extract_features(text)
+        assert actual == expected, text[:80]
+        assert list(actual) == list(expected)
+
+
+@pytest.mark.parametrize('text', EDGE_CASES)
+def test_edge_cases_match_reference(text):
+    assert_same_features([text])
+
+
+def test_dataset_cleaned_matches_reference(resumes):
+    assert_same_features([features.clean_text(text) for text in resumes])
+
+
+def test_dataset_raw_lowercase_matches_reference(resumes):
+    # Lower-cased raw text keeps digits and punctuation, exercising c++ / b.tech / "5+ years" paths too
+    assert_same_features([str(text).lower() for text in resumes])
+
+
+def test_batch_matches_per_row(resumes):
+    texts = [features.clean_text(text) for text in resumes] + EDGE_CASES
+    frame, hits = features.extract_features_batch(pd.Series(texts), return_keyword_hits=True)
+    rows = [features.extract_features(text) for text in texts]
+    expected = pd.DataFrame([{col: row[col] for col in features.FEATURE_COLUMNS} for row in rows])
+    assert list(frame.columns) == features.FEATURE_COLUMNS
+    assert frame.equals(expected.astype(frame.dtypes.to_dict()))
+    assert hits == [row['detected_category_keywords'] for row in rows]
+
+
+@pytest.mark.parametrize('text', EDGE_CASES + ["a.b a-b a b ab", " r  and r, go lang"])
+def test_keyword_matcher_matches_substring_test(text):
+    keywords = ['a b', 'a.b', 'a-b', 'ab', ' r ', 'r,', 'go lang', 'c++', 'ci/cd', 'machine learning', 'learn']
+    assert KeywordMatcher(keywords).find(text) == {kw for kw in keywords if kw in text}
+
+
+@pytest.mark.parametrize('text', EDGE_CASES)
+def test_word_pattern_matcher_matches_separate_searches(text):
+    expected = {name for name, pattern in features.EDUCATION_PATTERNS.items() if re.search(rf'\b{pattern}\b', text)}
+    assert WordPatternMatcher(features.EDUCATION_PATTERNS).find(text) == expected
@@ -0,0 +1,62 @@
+import os
+
+import pandas as pd
+import pytest
+
+from conftest import ROOT
+from recommender import CONTEXT_SKILLS, CompanyIndex, skill_key
+
+
+@pytest.fixture(scope='module')
+def index():
+    return CompanyIndex(pd.read_csv(os.path.join(ROOT, 'companies.csv')))
+
+
+@pytest.mark.parametrize('text, skill', [
+    ("Project-II: Go Ayur System", 'go'),
+    ("Synopsis: Go Ayurveda Panchakarma Centre", 'go'),
+    ("R- Exprience - Less than 1 year months", 'r'),
+    ("Hobbies: listening to music, surfing net", 'net'),
+    ("I excel in teamwork and communication", 'excel'),
+    ("Excel- Exprience - Less than 1 year months", 'excel'),
+    ("Tokenised the reviews and plotted word cloud", 'cloud'),
+    ("Masked personal information (social security numbers, addresses)", 'security'),
+])
+def test_everyday_words_are_not_skills(index, text, skill):
+    assert skill not in index.skills_in(text)
+
+
+@pytest.mark.parametrize('text, skill', [
+    ("Microservices in Golang and Python", 'go'),
+    ("Statistical modelling in R programming and RStudio", 'r'),
+    ("C#, .NET Core, ASP.NET MVC", 'net'),
+    ("Dot Net developer with 3 years experience", 'net'),
+    ("Reporting in MS Excel and Advanced Excel", 'excel'),
+    ("Cloud computing on AWS", 'cloud'),
+    ("Network security and firewall administration", 'security'),
+])
+def test_skills_named_in_context_are_found(index, text, skill):
+    assert skill in index.skills_in(text)
+
+
+def test_other_skills_still_match_as_bare_tokens(index):
+    assert index.skills_in("Python, SQL, Node.js, C# and machine learning") == [
+        'c#', 'machine learning', 'node.js', 'python', 'sql']
+
+
+def test_company_skill_labels_share_the_canonical_keys():
+    assert skill_key('.NET') == skill_key('dotnet') == 'net'
+    assert skill_key('Golang') == skill_key('Go') == 'go'
+    assert skill_key('Node.js') == skill_key('nodejs') == 'node.js'
+
+
+def test_bundled_resumes_without_context_do_not_match(index):
+    resumes = pd.read_csv(os.path.join(ROOT, 'UpdatedResumeDataSet.csv'))['Resume']
+    ayur = [text for text in resumes if 'Go Ayur' in text]
+    assert ayur
+    assert not any('go' in index.skills_in(text) for text in ayur)
+    for text in resumes:
+        found = set(index.skills_in(text)) & set(CONTEXT_SKILLS)
+        lowered = " ".join(text.lower().split())
+        for skill in found:
+            assert any(phrase in lowered for phrase in CONTEXT_SKILLS[skill]), (skill, text[:80])
@@ -1,6 +1,12 @@
+import argparse
+import multiprocessing
+import os
+import resource
+import tempfile
+import time
+from multiprocessing.connection import wait
 import pandas as pd
 import numpy as np
-import re
 import pickle
 from collections import Counter
 from sklearn.model_selection import train_test_split, StratifiedKFold, cross_val_score, RandomizedSearchCV
@@ -9,161 +15,413 @@ from sklearn.preprocessing import OneHotEncoder, StandardScaler
 from sklearn.compose import ColumnTransformer
 from sklearn.pipeline import Pipeline
 from sklearn.ensemble import VotingClassifier, RandomForestClassifier
-from sklearn.linear_model import LogisticRegression
-from sklearn.svm import SVC
-from sklearn.metrics import classification_report, precision_recall_fscore_support
-from scipy.stats import uniform, randint
+from sklearn.linear_model import LogisticRegression, SGDClassifier
+from sklearn.svm import SVC, LinearSVC
+from sklearn.calibration import CalibratedClassifierCV
+from sklearn.base import clone
+from sklearn.preprocessing import LabelEncoder
+from sklearn.utils import Bunch, resample
+from sklearn.utils.validation import check_memory
+from sklearn.metrics import classification_report, precision_recall_fscore_support, accuracy_score
+from scipy.stats import uniform, randint, loguniform
 import warnings
+from datetime import datetime, timezone
+from model_artifact import ARTIFACT_PATH, FAST_ARTIFACT_PATH, save_artifact
+import model_registry
+from feature_store import FEATURE_STORE_DIR, FeatureStore
+from minhash import NEAR_DUPLICATE_THRESHOLD, near_duplicates
+from features import (
+    FEATURE_SCHEMA_VERSION, INPUT_COLUMNS, FEATURE_COLUMNS, NUMERIC_COLUMNS, TEXT_COLUMN, BACKGROUND_COLUMN,
+    clean_text_series, build_model_input
+)
 warnings.filterwarnings('ignore')
 
-# ---------------------------
-# Text Cleaning
-# ---------------------------
-def clean_text(text):
-    if pd.isna(text):
-        return ""
-    text = str(text).lower()
-    text = re.sub(r'\S+@\S+', ' ', text)  # emails
-    text = re.sub(r'http\S+|www.\S+', ' ', text)  # urls
-    text = re.sub(r'[^a-z\s]', ' ', text)  # symbols/numbers
-    return " ".join(text.split())
-
-# ---------------------------
-# Feature Engineering with Keyword Boosting
-# ---------------------------
-def extract_features(text):
-    features = {}
-    words = text.split()
-
-    # Basic counts
-    features['word_count'] = len(words)
-    features['unique_words'] = len(set(words))
-
-    # Original skills
-    original_skills = [
-        'python', 'java', 'c++', 'sql', 'machine learning', 'deep learning',
-        'nlp', 'html', 'css', 'javascript', 'react', 'django', 'flask'
-    ]
-    for skill in original_skills:
-        features[f"skill_{skill}"] = 1 if skill in text else 0
-
-    # Education
-    features['has_btech'] = 1 if re.search(r'\bb\.?tech\b', text) else 0
-    features['has_mtech'] = 1 if re.search(r'\bm\.?tech\b', text) else 0
-    features['has_phd'] = 1 if re.search(r'\bph\.?d\b', text) else 0
-    features['has_mba'] = 1 if 'mba' in text else 0
-    features['has_bsc'] = 1 if re.search(r'\bb\.?sc\b', text) else 0
-    features['has_msc'] = 1 if re.search(r'\bm\.?sc\b', text) else 0
-
-    # Experience
-    exp_patterns = [
-        r'(\d+)\s*(?:years?|yrs?)\s*(?:experience|exp)',
-        r'(\d+)\s*(?:\+|plus)\s*(?:years?|yrs?)'
-    ]
-    years = []
-    for p in exp_patterns:
-        years.extend(re.findall(p, text))
-    features['years_experience'] = max([int(y) for y in years]) if years else 0
-
-    # Project / internship
-    features['project_mentioned'] = int(any(k in text for k in ['project', 'developed', 'built']))
-    features['internship_mentioned'] = int(any(k in text for k in ['internship', 'intern', 'trainee']))
-
-    # Category-specific keywords (with boosting)
-    category_keywords = {
-        "Data Science": ['tensorflow', 'pytorch', 'pandas', 'numpy', 'scikit-learn', 'matplotlib', 'seaborn'],
-        "Web Development": ['nodejs', 'angular', 'vue', 'bootstrap', 'express', 'typescript'],
-        "DevOps Engineer": ['docker', 'kubernetes', 'jenkins', 'terraform', 'ansible', 'aws', 'azure', 'gcp'],
-        "Automation Testing": ['selenium', 'pytest', 'junit', 'testng', 'cypress'],
-        "Blockchain": ['blockchain', 'ethereum', 'solidity', 'smart contract', 'web3'],
-        "Mobile App Development": ['android', 'ios', 'flutter', 'react native', 'swift', 'kotlin'],
-        "Java Developer": ['spring boot', 'hibernate', 'jsp', 'servlets']
-    }
-
-    for category, keywords in category_keywords.items():
-        count = sum(1 for kw in keywords if kw in text)
-        # 🚀 Boost weight ×5
-        features[f"{category.lower().replace(' ', '_')}_keywords"] = count * 5
-
-    return features
-
 # ---------------------------
 # Class Balancing
 # ---------------------------
-def balance_classes(X, y):
-    class_counts = Counter(y)
-    max_count = max(class_counts.values())
-    X_bal, y_bal = [], []
+def balance_indices(y, random_state=42):
+    """Row positions that oversample every class up to the largest one (classes in order of appearance);
+    seeded like the split and the models, so the same data always gives the same balanced set"""
+    rng = np.random.default_rng(random_state)
+    codes, _ = pd.factorize(pd.Series(y))
+    counts = np.bincount(codes)
+    # Grouped integer index arrays: one stable argsort instead of a scan of y per class
+    groups = np.split(np.argsort(codes, kind='stable'), np.cumsum(counts)[:-1])
+    parts = []
+    for idxs in groups:
+        parts.append(idxs)
+        parts.append(rng.choice(idxs, size=counts.max() - len(idxs), replace=True))
+    return np.concatenate(parts)
 
-    for cls, cnt in class_counts.items():
-        idxs = [i for i, lbl in enumerate(y) if lbl == cls]
-        extra = np.random.choice(idxs, size=max_count - cnt, replace=True)
-        all_idx = idxs + list(extra)
-        X_bal.extend(X.iloc[all_idx].to_dict(orient="records"))
-        y_bal.extend([cls] * len(all_idx))
-
-    return pd.DataFrame(X_bal), pd.Series(y_bal)
+def balance_classes(X, y, random_state=42):
+    idx = balance_indices(y, random_state)
+    # One positional take per frame; text cells are shared references, not per-row dict copies
+    return X.take(idx).reset_index(drop=True), pd.Series(y).take(idx).reset_index(drop=True)
 
 # ---------------------------
 # Load Data
 # ---------------------------
-def load_data():
-    df = pd.read_csv("UpdatedResumeDataSet.csv")
+DATA_PATH = "UpdatedResumeDataSet.csv"
+
+def load_data(path=DATA_PATH, store=None):
+    """Dataset with cleaned resume_text; with a FeatureStore it also has the INPUT_COLUMNS features,
+    and only rows the store has not seen are cleaned and extracted"""
+    df = pd.read_csv(path)
     df.rename(columns={'Resume': 'resume_text', 'Category': 'internship_type'}, inplace=True)
-    df['resume_text'] = df['resume_text'].apply(clean_text)
-    return df
+    if store is None:
+        df['resume_text'] = clean_text_series(df['resume_text'])
+        return df
+    return pd.concat([df.drop(columns='resume_text'), store.model_input(df['resume_text'])], axis=1)
+
+def drop_near_duplicates(df, threshold=NEAR_DUPLICATE_THRESHOLD):
+    """Keep the first of every group of near-identical resumes (MinHash over the cleaned text), so
+    copies cannot land on both sides of the train/test split; 0 keeps everything"""
+    if not threshold:
+        return df
+    return df[near_duplicates(df['resume_text'], threshold) < 0]
 
 # ---------------------------
 # Pipeline
 # ---------------------------
-def create_pipeline():
+def create_pipeline(memory=None, n_jobs=None):
     preprocessor = ColumnTransformer(
         transformers=[
-            ('text', TfidfVectorizer(max_features=5000, stop_words='english', ngram_range=(1, 2)), 'resume_text'),
-            ('cat', OneHotEncoder(handle_unknown='ignore', sparse_output=False), ['academic_background']),
-            ('num', StandardScaler(), ['word_count','unique_words','years_experience']),
-            ('skills', 'passthrough', [c for c in feature_cols if c.startswith('skill_') or c.endswith('_mentioned') or c.endswith('_keywords')])
+            ('text', TfidfVectorizer(max_features=5000, stop_words='english', ngram_range=(1, 2)), TEXT_COLUMN),
+            ('cat', OneHotEncoder(handle_unknown='ignore', sparse_output=False), [BACKGROUND_COLUMN]),
+            ('num', StandardScaler(), NUMERIC_COLUMNS),
+            ('skills', 'passthrough', [c for c in FEATURE_COLUMNS if c.startswith('skill_') or c.endswith('_mentioned') or c.endswith('_keywords')])
         ]
     )
-    rf = RandomForestClassifier(n_estimators=100, class_weight='balanced', random_state=42)
+    rf = RandomForestClassifier(n_estimators=100, class_weight='balanced', random_state=42, n_jobs=n_jobs)
     lr = LogisticRegression(max_iter=1000, class_weight='balanced')
     svm = SVC(probability=True, class_weight='balanced')
 
-    ensemble = VotingClassifier(estimators=[('rf', rf), ('lr', lr), ('svm', svm)], voting='soft', weights=[3,2,1])
-    return Pipeline([('preprocessor', preprocessor), ('classifier', ensemble)])
+    ensemble = VotingClassifier(estimators=[('rf', rf), ('lr', lr), ('svm', svm)], voting='soft', weights=[3,2,1], n_jobs=n_jobs)
+    return Pipeline([('preprocessor', preprocessor), ('classifier', ensemble)], memory=memory)
+
+# ---------------------------
+# Hyperparameter Search
+# ---------------------------
+SEARCH_SPACE = {
+    'classifier__rf__n_estimators': randint(100, 400),
+    'classifier__rf__max_depth': [None, 20, 40],
+    'classifier__rf__min_samples_leaf': randint(1, 4),
+    'classifier__rf__max_features': ['sqrt', 'log2'],
+    'classifier__lr__C': loguniform(0.1, 100),
+    'classifier__svm__C': loguniform(0.1, 100),
+    'classifier__svm__gamma': ['scale', 'auto'],
+    'classifier__weights': [[3, 2, 1], [2, 2, 1], [1, 1, 1], [3, 1, 1], [2, 3, 1], [1, 2, 1], [2, 1, 2]]
+}
+SEARCH_RESULTS_PATH = 'search_results.csv'
+
+def search_hyperparameters(X, y, n_iter=20, cv=5, n_jobs=-1, results_path=SEARCH_RESULTS_PATH, cache_dir=None):
+    """Randomized search over the ensemble members and voting weights; returns the refitted best pipeline
+
+    Only classifier parameters are searched, so the preprocessor (TF-IDF) is identical for every
+    candidate: the pipeline's joblib memory caches its fitted transform once per fold and every
+    other candidate on that fold loads it instead of refitting. A persistent cache_dir (the feature
+    store's) keeps those fits for later runs on the same data.
+    """
+    with tempfile.TemporaryDirectory(prefix='tfidf_cache_') as tmp_dir:
+        search = RandomizedSearchCV(
+            create_pipeline(memory=cache_dir or tmp_dir), SEARCH_SPACE, n_iter=n_iter, scoring='f1_weighted',
+            cv=StratifiedKFold(n_splits=cv, shuffle=True, random_state=42),
+            n_jobs=n_jobs, random_state=42, refit=True, verbose=1
+        )
+        search.fit(X, y)
+    best = search.best_estimator_.set_params(memory=None)
+
+    results = pd.DataFrame(search.cv_results_)
+    param_cols = [c for c in results.columns if c.startswith('param_')]
+    table = results[['rank_test_score', 'mean_test_score', 'std_test_score', 'mean_fit_time', 'std_fit_time', 'mean_score_time'] + param_cols]
+    table = table.rename(columns={c: c[len('param_classifier__'):] for c in param_cols}).sort_values('rank_test_score')
+    table.to_csv(results_path, index=False)
+
+    print(f"🔎 {n_iter} candidates x {cv} folds; results written to {results_path}")
+    print(table.head(5).to_string(index=False))
+    print(f"🏆 Best f1_weighted {search.best_score_:.4f} with {search.best_params_}")
+    return best
+
+# ---------------------------
+# Fast Serving Model
+# ---------------------------
+# Teacher probabilities below this are dropped from the distillation set
+DISTILL_MIN_PROB = 0.01
+
+def create_fast_model(pipeline, X_train, y_train, kind='linear'):
+    """Single linear model over the ensemble's fitted preprocessor (same TF-IDF + engineered features)
+
+    'linear' fits on the labels; 'distilled' fits on the ensemble's soft probabilities, each training
+    row repeated once per class with the teacher probability as its sample weight (soft cross-entropy).
+    """
+    preprocessor = pipeline.named_steps['preprocessor']
+    Xt = preprocessor.transform(X_train)
+    student = LogisticRegression(max_iter=1000, class_weight='balanced' if kind == 'linear' else None)
+    if kind == 'distilled':
+        teacher = pipeline.named_steps['classifier'].predict_proba(Xt)
+        rows, labels = np.nonzero(teacher >= DISTILL_MIN_PROB)
+        student.fit(Xt[rows], pipeline.classes_[labels], sample_weight=teacher[rows, labels])
+    else:
+        student.fit(Xt, y_train)
+    return Pipeline([('preprocessor', preprocessor), ('classifier', student)])
+
+def evaluate(model, X_test, y_test, latency_rows=50):
+    """Weighted precision/F1, accuracy and predict_proba latency (single resume and whole test set)"""
+    probs = model.predict_proba(X_test)
+    y_pred = model.classes_[probs.argmax(axis=1)]
+    precision, _, f1, _ = precision_recall_fscore_support(y_test, y_pred, average='weighted', zero_division=0)
+
+    single = []
+    for i in range(min(latency_rows, len(X_test))):
+        start = time.perf_counter()
+        model.predict_proba(X_test.iloc[[i]])
+        single.append(time.perf_counter() - start)
+    start = time.perf_counter()
+    model.predict_proba(X_test)
+    batch = time.perf_counter() - start
+
+    metrics = {
+        'accuracy': round(accuracy_score(y_test, y_pred), 4),
+        'f1_weighted': round(f1, 4),
+        'precision_weighted': round(precision, 4),
+        'latency_ms_single': round(float(np.median(single)) * 1000, 3),
+        'latency_ms_per_row_batch': round(batch / len(X_test) * 1000, 3)
+    }
+    return metrics, y_pred
+
+def print_comparison(full_metrics, fast_metrics, agreement):
+    print("⚖️ Full ensemble vs fast model:")
+    print(f"   {'metric':<26}{'ensemble':>10}{'fast':>10}")
+    for key in full_metrics:
+        print(f"   {key:<26}{full_metrics[key]:>10}{fast_metrics[key]:>10}")
+    print(f"   accuracy gap: {full_metrics['accuracy'] - fast_metrics['accuracy']:+.4f}, "
+          f"single-resume speedup: {full_metrics['latency_ms_single'] / fast_metrics['latency_ms_single']:.1f}x, "
+          f"agreement with ensemble: {agreement:.2%}")
+
+# ---------------------------
+# Parallel Ensemble Fitting
+# ---------------------------
+# Rows the substitute of an over-budget member is fitted on
+SUBSTITUTE_MAX_ROWS = int(os.environ.get('SUBSTITUTE_MAX_ROWS', 5000))
+
+def substitute_member(name, n_jobs=None):
+    """Cheaper stand-in for an ensemble member that ran over the fit budget"""
+    if name == 'svm':
+        # Linear kernel + 3-fold sigmoid calibration instead of libsvm's RBF with 5-fold Platt scaling
+        return CalibratedClassifierCV(LinearSVC(class_weight='balanced'), cv=3)
+    if name == 'rf':
+        return RandomForestClassifier(n_estimators=25, class_weight='balanced', random_state=42, n_jobs=n_jobs)
+    return SGDClassifier(loss='log_loss', class_weight='balanced', random_state=42)
+
+def _fit_preprocessor(preprocessor, X, y):
+    """(model input, fitted preprocessor); cached by the pipeline's joblib memory in fit_ensemble_parallel"""
+    return preprocessor.fit_transform(X, y), preprocessor
+
+def _fit_member(conn, estimator, X, y):
+    """Process target: fit one member and send it back with its fit time and peak memory growth"""
+    try:
+        conn.send(('started', time.time()))
+        before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss  # KB on Linux
+        start = time.perf_counter()
+        estimator.fit(X, y)
+        seconds = time.perf_counter() - start
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        conn.send(('fitted', estimator, seconds, peak * 1024, (peak - before) * 1024))
+    except Exception as e:
+        conn.send(('failed', f"{type(e).__name__}: {e}"))
+    finally:
+        conn.close()
+
+def fit_ensemble_parallel(pipeline, X, y, budget=None, n_jobs=-1):
+    """Fit the pipeline with every VotingClassifier member in its own process, all at once
+
+    Each member's fit time and peak memory are logged and returned. With a budget (seconds per
+    member), a member still fitting when it runs out is stopped and replaced by substitute_member()
+    fitted on at most SUBSTITUTE_MAX_ROWS rows. Returns (fitted pipeline, {member: report}).
+    """
+    (pre_name, preprocessor), (clf_name, ensemble) = pipeline.steps
+    start = time.perf_counter()
+    # Cached in the pipeline's memory (the feature store's) under its own key: reruns on the same
+    # training set reuse the fitted TF-IDF and its matrix
+    Xt, preprocessor = check_memory(pipeline.memory).cache(_fit_preprocessor)(clone(preprocessor), X, y)
+    print(f"⏱️ Preprocessor fitted in {time.perf_counter() - start:.2f}s")
+
+    # Members are fitted on encoded labels, as VotingClassifier.fit does
+    le = LabelEncoder().fit(y)
+    y_enc = le.transform(y)
+    cores = (os.cpu_count() or 1) if n_jobs in (None, -1) else n_jobs
+    member_jobs = max(1, cores - len(ensemble.estimators) + 1)  # spare cores go to the forest's trees
+    ctx = multiprocessing.get_context('spawn')
+    running, deadlines, fitted, report, stopped = {}, {}, {}, {}, []
+    for name, estimator in ensemble.estimators:
+        estimator = clone(estimator)
+        if 'n_jobs' in estimator.get_params():
+            estimator.set_params(n_jobs=member_jobs)  # restored below: serving sizes its own threads
+        receiver, sender = ctx.Pipe(duplex=False)
+        process = ctx.Process(target=_fit_member, args=(sender, estimator, Xt, y_enc), daemon=True)
+        process.start()
+        sender.close()
+        running[receiver] = (name, process)
+
+    try:
+        while running:
+            # The budget counts from the start of each member's fit (child's wall clock), not from process startup
+            now = time.time()
+            for receiver in [r for r in running if r in deadlines and deadlines[r] <= now]:
+                name, process = running.pop(receiver)
+                process.terminate()
+                process.join()
+                receiver.close()
+                stopped.append(name)
+            if not running:
+                break
+            timeout = min((deadlines[r] - now for r in running if r in deadlines), default=None)
+            for receiver in wait(list(running), timeout):
+                name, process = running[receiver]
+                try:
+                    message = receiver.recv()
+                except EOFError:  # the child died without reporting (OOM kill, segfault)
+                    del running[receiver]
+                    process.join()
+                    receiver.close()
+                    raise RuntimeError(f"Ensemble member {name!r} exited without a result "
+                                       f"(exit code {process.exitcode}; negative = killed by that signal)")
+                if message[0] == 'started':
+                    if budget:
+                        deadlines[receiver] = message[1] + budget
+                    continue
+                del running[receiver]
+                process.join()
+                if message[0] == 'failed':
+                    raise RuntimeError(f"Fitting ensemble member {name!r} failed: {message[1]}")
+                _, fitted[name], seconds, peak_bytes, growth_bytes = message
+                if 'n_jobs' in fitted[name].get_params():
+                    fitted[name].set_params(n_jobs=ensemble.named_estimators[name].n_jobs)
+                report[name] = {'seconds': round(seconds, 3), 'peak_rss_mb': round(peak_bytes / 2 ** 20, 1),
+                                'fit_rss_growth_mb': round(growth_bytes / 2 ** 20, 1)}
+                print(f"🧩 {name}: fitted in {seconds:.2f}s, peak RSS {peak_bytes / 2 ** 20:.0f} MB "
+                      f"(+{growth_bytes / 2 ** 20:.0f} MB during the fit)")
+    finally:
+        for receiver, (name, process) in running.items():  # only left when a member failed or died
+            process.terminate()
+            process.join()
+            receiver.close()
+
+    for name in stopped:
+        substitute = substitute_member(name)
+        rows = np.arange(len(y_enc))
+        if len(rows) > SUBSTITUTE_MAX_ROWS:
+            rows = resample(rows, n_samples=SUBSTITUTE_MAX_ROWS, replace=False, stratify=y_enc, random_state=42)
+        start = time.perf_counter()
+        fitted[name] = substitute.fit(Xt[rows], y_enc[rows])
+        seconds = time.perf_counter() - start
+        description = type(substitute).__name__ + (f"({type(substitute.estimator).__name__})" if name == 'svm' else "")
+        report[name] = {'seconds': round(seconds, 3), 'budget_exceeded': True, 'substitute': description,
+                        'substitute_rows': int(len(rows))}
+        print(f"⏰ {name}: over the {budget:g}s budget; replaced by {description} on {len(rows)} rows ({seconds:.2f}s)")
+
+    # Leave the ensemble exactly as VotingClassifier.fit would (substitutes also replace the unfitted spec)
+    ensemble = clone(ensemble).set_params(**{name: clone(fitted[name]) for name in stopped})
+    ensemble.le_ = le
+    ensemble.classes_ = le.classes_
+    ensemble.estimators_ = [fitted[name] for name, _ in ensemble.estimators]
+    ensemble.named_estimators_ = Bunch(**{name: fitted[name] for name, _ in ensemble.estimators})
+    return Pipeline([(pre_name, preprocessor), (clf_name, ensemble)]), report
 
 # ---------------------------
 # Train Model
 # ---------------------------
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Train the resume -> internship ensemble")
+    parser.add_argument('--fast-model', choices=['linear', 'distilled'],
+                        help=f"also train a fast serving model and save it to {FAST_ARTIFACT_PATH}")
+    parser.add_argument('--balance', choices=['oversample', 'weight'],
+                        help="oversample minority classes, or keep the data as is and rely on class_weight='balanced' "
+                             "(default: oversample, or weight with --search)")
+    parser.add_argument('--no-activate', action='store_true',
+                        help="register the new model in the registry without making it the served version")
+    parser.add_argument('--search', action='store_true',
+                        help="tune RF/LR/SVC parameters and voting weights with cross-validation (implies --balance weight)")
+    parser.add_argument('--n-iter', type=int, default=20, help="search candidates")
+    parser.add_argument('--cv', type=int, default=5, help="search folds")
+    parser.add_argument('--n-jobs', type=int, default=-1, help="parallel search fits (-1 = all cores)")
+    parser.add_argument('--search-results', default=SEARCH_RESULTS_PATH, help="CSV results table")
+    parser.add_argument('--dedupe-threshold', type=float, default=NEAR_DUPLICATE_THRESHOLD,
+                        help="drop resumes whose estimated Jaccard similarity to an earlier one is at least this (0 = keep all)")
+    parser.add_argument('--parallel-fit', action='store_true',
+                        help="fit the ensemble members concurrently in separate processes (uses --n-jobs cores), logging each one's time and memory")
+    parser.add_argument('--member-budget', type=float,
+                        help="with --parallel-fit: seconds a member may take before it is replaced by a cheaper substitute")
+    parser.add_argument('--feature-store', default=FEATURE_STORE_DIR,
+                        help="directory of cached cleaned text / features / TF-IDF fits, reused across runs")
+    parser.add_argument('--no-feature-store', action='store_true', help="clean and extract every row from scratch")
+    args = parser.parse_args()
+    if args.member_budget and not args.parallel_fit:
+        parser.error("--member-budget needs --parallel-fit")
+    if args.search and args.parallel_fit:
+        parser.error("--search fits its own candidates; drop --parallel-fit")
+    if args.search and args.balance == 'oversample':
+        # Copies of a row would land in both the training and validation folds and inflate every CV score
+        parser.error("--search cross-validates on the training rows; use --balance weight, not oversample")
+    if args.balance is None:
+        args.balance = 'weight' if args.search else 'oversample'
+
     print("🚀 Training started...")
-    df = load_data()
+    start = time.perf_counter()
+    store = None if args.no_feature_store else FeatureStore(args.feature_store)
+    df = load_data(store=store)
+    print(f"⏱️ Data loaded and cleaned in {time.perf_counter() - start:.2f}s")
+    if store is not None:
+        print(f"🗄️ Feature store {store.version}: {store.last_stats['computed']} of {store.last_stats['rows']} rows "
+              f"computed, the rest loaded ({store.last_stats['segments']} segments)")
 
-    # Extract features
-    feat_list = [extract_features(t) for t in df['resume_text']]
-    feat_df = pd.DataFrame(feat_list)
-    df = pd.concat([df, feat_df], axis=1)
-    df['academic_background'] = 'Computer Science'
+    # Near-duplicate removal (before balancing and the split)
+    start = time.perf_counter()
+    rows_before = len(df)
+    df = drop_near_duplicates(df, args.dedupe_threshold)
+    duplicates_removed = rows_before - len(df)
+    print(f"✅ Removed {duplicates_removed} near-duplicate resumes in {time.perf_counter() - start:.2f}s ({len(df)} left)")
 
-    # Prepare
-    X = df.drop(columns=['internship_type'])
+    # Extract features (shared schema with app.py)
+    start = time.perf_counter()
+    X = df[INPUT_COLUMNS] if store is not None else build_model_input(df['resume_text'])
     y = df['internship_type']
-    global feature_cols
-    feature_cols = list(X.columns)
+    feature_cols = INPUT_COLUMNS
+    print(f"⏱️ Features built in {time.perf_counter() - start:.2f}s")
 
-    # Balance
-    X_bal, y_bal = balance_classes(X, y)
-    print(f"✅ Classes balanced: {Counter(y_bal)}")
+    # Train/test split, before any balancing: oversampled copies must never reach the test set
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, stratify=y, random_state=42)
 
-    # Train/test split
-    X_train, X_test, y_train, y_test = train_test_split(X_bal, y_bal, test_size=0.2, stratify=y_bal, random_state=42)
+    # Balance (training fold only)
+    if args.balance == 'oversample':
+        start = time.perf_counter()
+        X_train, y_train = balance_classes(X_train, y_train)
+        print(f"✅ Training classes balanced in {time.perf_counter() - start:.2f}s: {Counter(y_train)}")
+    else:
+        # Every ensemble member is fitted with class_weight='balanced', so no rows are duplicated
+        print(f"✅ Class weighting (no oversampling): {Counter(y_train)}")
 
     # Pipeline
-    pipeline = create_pipeline()
-    pipeline.fit(X_train, y_train)
+    start = time.perf_counter()
+    cache_dir = store.pipeline_cache_dir if store is not None else None
+    member_report = None
+    if args.search:
+        pipeline = search_hyperparameters(X_train, y_train, n_iter=args.n_iter, cv=args.cv, n_jobs=args.n_jobs,
+                                          results_path=args.search_results, cache_dir=cache_dir)
+    elif args.parallel_fit:
+        pipeline, member_report = fit_ensemble_parallel(create_pipeline(memory=cache_dir), X_train, y_train,
+                                                        budget=args.member_budget, n_jobs=args.n_jobs)
+    else:
+        # With the store, an unchanged training set reuses the fitted TF-IDF and its matrix
+        pipeline = create_pipeline(memory=cache_dir)
+        pipeline.fit(X_train, y_train)
+        pipeline.set_params(memory=None)
+    if store is not None:
+        store.trim_pipeline_cache()
+    print(f"⏱️ Model trained in {time.perf_counter() - start:.2f}s")
 
     # Eval
-    y_pred = pipeline.predict(X_test)
+    metrics, y_pred = evaluate(pipeline, X_test, y_test)
     print("📋 Report:\n", classification_report(y_test, y_pred))
 
     # Save
@@ -171,13 +429,37 @@ if __name__ == "__main__":
         'model': pipeline,
         'feature_columns': feature_cols,
         'class_names': sorted(y.unique()),
-        'model_type': 'enhanced_ensemble'
+        'model_type': 'enhanced_ensemble',
+        'feature_schema_version': FEATURE_SCHEMA_VERSION,
+        'metrics': {**metrics, 'near_duplicates_removed': duplicates_removed,
+                    **({'members': member_report} if member_report else {})},
+        # New on every retrain; app.py keys its result cache on it
+        'model_version': datetime.now(timezone.utc).strftime('%Y%m%d%H%M%S')
     }
     with open("advanced_model.pkl", "wb") as f:
         pickle.dump(model_data, f)
+    save_artifact(model_data, ARTIFACT_PATH)
     with open("model.pkl", "wb") as f:
         pickle.dump(pipeline, f)
     with open("feature_info.pkl", "wb") as f:
-        pickle.dump({"all_columns": feature_cols}, f)
+        pickle.dump({"all_columns": feature_cols, "feature_schema_version": FEATURE_SCHEMA_VERSION}, f)
+
+    print(f"💾 Models saved: {ARTIFACT_PATH}, advanced_model.pkl, model.pkl, feature_info.pkl")
+    version = model_registry.register(model_data, kind='full', activate=not args.no_activate)
+    print(f"📚 Registered {version} in {model_registry.MODEL_REGISTRY_DIR}{'' if args.no_activate else ' (active)'}")
 
-    print("💾 Models saved: advanced_model.pkl, model.pkl, feature_info.pkl")
+    if args.fast_model:
+        fast_model = create_fast_model(pipeline, X_train, y_train, kind=args.fast_model)
+        fast_metrics, fast_pred = evaluate(fast_model, X_test, y_test)
+        print_comparison(metrics, fast_metrics, float(np.mean(fast_pred == y_pred)))
+        fast_data = {
+            **model_data,
+            'model': fast_model,
+            'model_type': f'fast_{args.fast_model}',
+            'metrics': {**fast_metrics, 'ensemble': metrics},
+            # Distinct version so cached ensemble responses are never served for the fast model
+            'model_version': f"{model_data['model_version']}-fast-{args.fast_model}"
+        }
+        save_artifact(fast_data, FAST_ARTIFACT_PATH)
+        model_registry.register(fast_data, kind='fast', activate=not args.no_activate)
+        print(f"💾 Fast model saved: {FAST_ARTIFACT_PATH} (registered as {fast_data['model_version']})")
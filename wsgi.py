@@ -0,0 +1,15 @@
+"""
+Production entry point.
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+With preload_app the model and companies are loaded here, once, in the gunicorn master before
+it forks; every worker then shares those pages copy-on-write instead of loading its own copy.
+"""
+from app import app, load_model, load_companies, load_similar_index
+
+load_model()
+load_companies()
+load_similar_index()
+
+__all__ = ['app']